@@ -0,0 +1 @@
+"""Benchmarks and protocol simulators for the amt_alarms integration."""
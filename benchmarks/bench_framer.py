@@ -0,0 +1,57 @@
+"""Microbenchmark for the IsecNet V1 ``FrameParser``.
+
+Measures frames per second through the ``BufferedProtocol`` path for
+~54-byte status frames, one frame per read and coalesced into 4 KiB
+reads.  The parser's correctness is covered by ``tests/test_framer.py``.
+
+``isecnet.py`` has no Home Assistant dependency and is loaded with the
+tests' helper, so this runs without Home Assistant installed:
+
+    python -m benchmarks.bench_framer --frames 200000
+"""
+import argparse
+import time
+
+from tests.conftest import load_integration_module
+
+isecnet = load_integration_module("isecnet")
+
+STATUS_PAYLOAD_LENGTH = 54
+
+
+def bench(frames, reads_per_frame):
+    """Return frames per second parsing status frames."""
+    frame = isecnet.build_frame(isecnet.CMD_ISEC_MOBILE, bytes(STATUS_PAYLOAD_LENGTH))
+    parser = isecnet.FrameParser()
+    if reads_per_frame:
+        start = time.perf_counter()
+        for _ in range(frames):
+            buffer = parser.get_buffer(-1)
+            buffer[:len(frame)] = frame
+            for _command, _payload in parser.buffer_updated(len(frame)):
+                pass
+        return frames / (time.perf_counter() - start)
+    per_read = 4096 // len(frame)
+    block = frame * per_read
+    start = time.perf_counter()
+    for _ in range(frames // per_read):
+        buffer = parser.get_buffer(-1)
+        buffer[:len(block)] = block
+        for _command, _payload in parser.buffer_updated(len(block)):
+            pass
+    return (frames // per_read) * per_read / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200000)
+    args = parser.parse_args()
+
+    for label, reads_per_frame in (("one frame per read", True), ("coalesced 4 KiB reads", False)):
+        rate = bench(args.frames, reads_per_frame)
+        print(f"{label:>24}: {rate:12,.0f} frames/s  {1e6 / rate:6.2f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""End-to-end benchmark of AlarmHub against simulated panels.
+
+Starts a Home Assistant core, one shared ``PanelListener`` and one
+``AlarmHub`` per simulated panel, and points ``benchmarks.simulator``
+panels (in a separate process, so their CPU is not billed to the hub) at
+it over loopback TCP.  Every hub gets the same listeners the real
+platforms register (48 zones, 4 partitions, the panel), each writing to
+the HA state machine when notified.  For 1, 10 and 100 panels it reports:
+
+- latency from a status frame reaching the hub to the state write,
+- status frames per second per hub,
+- hub CPU time per panel,
+- memory allocated per panel (hub, listener routes and connection).
+
+Needs Home Assistant and the integration requirements installed:
+
+    python -m benchmarks.bench_hub --panels 1 10 100 --duration 10
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.amt_alarms import (
+    KEY_PARTITION,
+    KEY_PARTITIONS,
+    KEY_ZONE,
+    AlarmHub,
+)
+from custom_components.amt_alarms.isecnet import CMD_ISEC_MOBILE
+from custom_components.amt_alarms.listener import async_get_listener
+
+from .simulator import panel_mac
+
+
+class Probe:
+    """Stand-in entity: recomputes its state and writes it when notified."""
+
+    def __init__(self, hass, hub, clock, entity_id, read):
+        """Initialize."""
+        self.hass = hass
+        self.hub = hub
+        self.clock = clock
+        self.entity_id = entity_id
+        self.read = read
+
+    def alarm_update(self):
+        """Handle a hub notification like the real entities do."""
+        self.async_write_ha_state()
+
+    def async_write_ha_state(self):
+        """Write the state and record the latency since the frame arrived."""
+        self.hass.states.async_set(self.entity_id, str(self.read()))
+        if self.clock.frame_time is not None:
+            self.clock.latencies.append(time.perf_counter() - self.clock.frame_time)
+
+
+class FrameClock:
+    """Timestamps status frames as they reach a hub's panel."""
+
+    def __init__(self, panel):
+        """Wrap the panel's frame handler."""
+        self.frame_time = None
+        self.status_frames = 0
+        self.latencies = []
+        received = panel.frame_received
+
+        def frame_received(command, payload):
+            if command == CMD_ISEC_MOBILE:
+                self.status_frames += 1
+                self.frame_time = time.perf_counter()
+            received(command, payload)
+            self.frame_time = None
+
+        panel.frame_received = frame_received
+
+
+def add_probes(hass, hub, clock, index):
+    """Register the listeners the real platforms would register."""
+    prefix = f"bench_{index}"
+    for zone in range(hub.max_sensors):
+        probe = Probe(hass, hub, clock, f"binary_sensor.{prefix}_zone_{zone}",
+                      lambda zone=zone: hub.is_zone_open(zone))
+        hub.listen_event(probe, (KEY_ZONE, zone))
+    for partition in range(hub.max_partitions):
+        probe = Probe(hass, hub, clock, f"alarm_control_panel.{prefix}_p{partition}",
+                      lambda p=partition: hub.is_partition_armed(p))
+        hub.listen_event(probe, (KEY_PARTITION, partition))
+    probe = Probe(hass, hub, clock, f"alarm_control_panel.{prefix}",
+                  lambda: hub.armed_partitions_bitmap)
+    hub.listen_event(probe, KEY_PARTITIONS)
+
+
+def percentile(values, fraction):
+    """Return the given percentile of values."""
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_scenario(hass, panels, args):
+    """Benchmark one panel count and return its results."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    listener = await async_get_listener(hass, args.port)
+    hubs = []
+    clocks = []
+    for i in range(panels):
+        hub = AlarmHub(
+            hass, None, args.port, default_password="1234",
+            fast_poll_interval=args.poll_interval, fast_poll_window=86400,
+            max_poll_interval=args.poll_interval,
+            listener=listener, mac_address=panel_mac(i),
+        )
+        clock = FrameClock(hub.alarm)
+        add_probes(hass, hub, clock, i)
+        hubs.append(hub)
+        clocks.append(clock)
+
+    simulator = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.simulator", "--port", str(args.port),
+        "--panels", str(panels), "--change-rate", str(args.change_rate),
+        stdout=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(hub.wait_connection() for hub in hubs)), 60
+        )
+        for hub in hubs:
+            hub.start_polling()
+        await asyncio.sleep(args.warmup)
+
+        after = tracemalloc.take_snapshot()
+        memory = sum(s.size_diff for s in after.compare_to(before, "filename"))
+        tracemalloc.stop()
+
+        for clock in clocks:
+            clock.latencies.clear()
+            clock.status_frames = 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+    finally:
+        for hub in hubs:
+            hub.close()
+        simulator.terminate()
+        await simulator.wait()
+
+    latencies = [value for clock in clocks for value in clock.latencies]
+    frames = sum(clock.status_frames for clock in clocks)
+    return {
+        "panels": panels,
+        "frames_per_s_per_hub": frames / wall / panels,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "latency_mean_ms": (statistics.fmean(latencies) * 1000) if latencies else float("nan"),
+        "cpu_ms_per_s_per_panel": cpu / wall / panels * 1000,
+        "memory_kib_per_panel": memory / panels / 1024,
+    }
+
+
+async def main_async(args):
+    """Run every scenario on one Home Assistant instance."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        results = []
+        for panels in args.panels:
+            results.append(await run_scenario(hass, panels, args))
+        await hass.async_stop(force=True)
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--panels", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--port", type=int, default=19009)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--poll-interval", type=float, default=0.05,
+                        help="status poll interval per panel, seconds")
+    parser.add_argument("--change-rate", type=float, default=0.2,
+                        help="probability that a status reply flips a zone")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    columns = list(results[0])
+    print(" ".join(f"{c:>24}" for c in columns))
+    for row in results:
+        print(" ".join(f"{row[c]:>24.3f}" if isinstance(row[c], float) else f"{row[c]:>24}"
+                       for c in columns))
+
+
+if __name__ == "__main__":
+    main()
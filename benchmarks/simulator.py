@@ -0,0 +1,439 @@
+"""Simulated Intelbras AMT panel speaking IsecNet V1 over TCP.
+
+Each simulated panel dials into the integration like a real one: 0x94 and
+0x95 handshake, periodic 0xF7 heartbeats, ISEC Mobile (0xE9) status
+replies and command acknowledgements, Contact ID events (0xB0/0xB4)
+on demand and 0x80 date/time requests.  ``SimulatedReceptor`` stands in for a Receptor IP: it accepts
+the integration's outbound link and relays 0xE9 requests to simulated
+panels by account, and ``SimulatedAmt8000`` serves IsecNet V2 app
+sessions.  The framing is implemented here independently of the
+integration so the simulator also checks the integration's encoder.
+
+Run standalone to point panels at a running Home Assistant:
+
+    python -m benchmarks.simulator --port 9009 --panels 10
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import random
+
+ACK = 0xFE
+STATUS_LENGTH = 54
+
+
+def checksum(data):
+    """Return the IsecNet V1 checksum of data."""
+    xor = 0
+    for byte in data:
+        xor ^= byte
+    return xor ^ 0xFF
+
+
+def frame(command, data=b""):
+    """Build a [NumBytes][Command][Data][CheckSum] frame."""
+    raw = bytes((len(data) + 3, command)) + bytes(data)
+    return raw + bytes((checksum(raw),))
+
+
+def contact_id_digits(account, qualifier, code, partition, zone):
+    """Encode a Contact ID event one digit per byte, 0 sent as 0x0A."""
+    digits = f"{account:04d}18{qualifier:01d}{code:03d}{partition:02d}{zone:03d}"
+    return bytes(int(d) or 0x0A for d in digits)
+
+
+def bcd(value):
+    """Encode a two-digit value as BCD."""
+    return ((value // 10) << 4) | (value % 10)
+
+
+class SimulatedPanel:
+    """One simulated panel connection."""
+
+    def __init__(self, host, port, mac: bytes, model=0x41, account=1234,
+                 heartbeat_interval=30.0, change_rate=0.1, zones=48, seed=None,
+                 clock_offset=0.0):
+        """Initialize."""
+        self.host = host
+        self.port = port
+        self.mac = mac
+        self.model = model
+        self.account = account
+        self.heartbeat_interval = heartbeat_interval
+        self.change_rate = change_rate
+        self.zones = zones
+        self.random = random.Random(seed)
+
+        self.open_zones = 0
+        self.bypassed_zones = 0
+        self.armed_partitions = 0
+        self.triggered_partitions = 0
+        self.pgms = 0
+        self.zone_names = [f"Zone {i + 1}" for i in range(zones)]
+        self.partition_names = [f"Area {i + 1}" for i in range(4)]
+        # Seconds the panel's clock is ahead of the host's, until set.
+        self.clock_offset = clock_offset
+        self.clock_set = asyncio.Event()
+
+        self.status_replies = 0
+        self.name_requests = 0
+        self.commands = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.connected = asyncio.Event()
+        self._reader = None
+        self._writer = None
+        self._tasks = []
+
+    def _write(self, data):
+        self.bytes_out += len(data)
+        self._writer.write(data)
+
+    async def _read_frame(self):
+        """Return (command, payload), or (ACK, b"") for a bare acknowledgement."""
+        first = (await self._reader.readexactly(1))[0]
+        self.bytes_in += 1
+        if first == ACK:
+            return ACK, b""
+        rest = await self._reader.readexactly(first - 1)
+        self.bytes_in += len(rest)
+        raw = bytes((first,)) + rest
+        if checksum(raw) != 0:
+            raise ValueError(f"bad checksum in {raw.hex()}")
+        return raw[1], raw[2:-1]
+
+    async def connect(self):
+        """Connect and perform the 0x94/0x95 handshake."""
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._write(frame(0x94, bytes((0x01,))))
+        await self._expect_ack()
+        self._write(frame(0x95, self.mac + bytes((self.model, 0x01, 0x00))))
+        await self._expect_ack()
+        self.connected.set()
+        self._tasks = [
+            asyncio.ensure_future(self._heartbeat_loop()),
+            asyncio.ensure_future(self._serve()),
+        ]
+
+    async def _expect_ack(self):
+        command, _ = await self._read_frame()
+        if command != ACK:
+            raise ValueError(f"expected ACK, got 0x{command:02x}")
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self._write(frame(0xF7))
+
+    async def _serve(self):
+        try:
+            while True:
+                command, payload = await self._read_frame()
+                if command == 0xE9:
+                    self._write(frame(0xE9, self.isec_mobile_reply(payload)))
+                elif command in (0xD1, 0xD3):
+                    names = self.zone_names if command == 0xD1 else self.partition_names
+                    self._write(frame(command, self.names_reply(names, payload[0])))
+                elif command == 0x80:
+                    self.set_clock(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connected.clear()
+
+    def isec_mobile_reply(self, payload):
+        """Apply an ISEC Mobile request and return the reply payload."""
+        # 0x21 [password digits] command [data] 0x21
+        body = payload[1:-1]
+        i = 0
+        while i < len(body) and 0x30 <= body[i] <= 0x39:
+            i += 1
+        command, data = body[i], body[i + 1:]
+        if command == 0x5B:
+            self._maybe_change()
+            self.status_replies += 1
+            return self.status_payload()
+        self.commands += 1
+        if command in (0x41, 0x44):
+            partitions = (1 << (data[0] - 0x41)) if data else 0x0F
+            if command == 0x41:
+                self.armed_partitions |= partitions
+            else:
+                self.armed_partitions &= ~partitions
+                self.triggered_partitions &= ~partitions
+        elif command == 0x42:
+            self.bypassed_zones = int.from_bytes(data[:8], "little")
+        elif command == 0x50:
+            # PGM number (1-based), then 1 = on / 0 = off.
+            bit = 1 << (data[0] - 1)
+            self.pgms = self.pgms | bit if data[1] else self.pgms & ~bit
+        return bytes((ACK,))
+
+    def names_reply(self, names, first):
+        """Return a 0xD1/0xD3 reply: first index, then 14-byte names."""
+        self.name_requests += 1
+        chunk = names[first:first + 17]
+        return bytes((first,)) + b"".join(
+            name.encode("latin-1")[:14].ljust(14) for name in chunk)
+
+    def _maybe_change(self):
+        if self.random.random() < self.change_rate:
+            self.open_zones ^= 1 << self.random.randrange(self.zones)
+
+    def status_payload(self):
+        """Return an ISEC Mobile status reply laid out as in DESIGN.md."""
+        payload = bytearray(STATUS_LENGTH)
+        payload[0] = self.model
+        payload[1:7] = self.open_zones.to_bytes(6, "little")
+        payload[17:23] = self.bypassed_zones.to_bytes(6, "little")
+        payload[28] = self.armed_partitions
+        payload[29] = self.triggered_partitions
+        return bytes(payload)
+
+    def panel_time(self):
+        """Return the panel's local time, offset included."""
+        return datetime.now() + timedelta(seconds=self.clock_offset)
+
+    def request_datetime(self):
+        """Ask the integration for the date and time (0x80)."""
+        self.clock_set.clear()
+        self._write(frame(0x80))
+
+    def set_clock(self, payload):
+        """Set the clock from a 0x80 reply: YY MM DD HH MM SS in BCD."""
+        year, month, day, hour, minute, second = (
+            (b >> 4) * 10 + (b & 0x0F) for b in payload[:6])
+        when = datetime(2000 + year, month, day, hour, minute, second)
+        self.clock_offset = (when - datetime.now()).total_seconds()
+        self.clock_set.set()
+
+    def send_contact_id(self, qualifier, code, partition=1, zone=0, timestamp=None):
+        """Send a Contact ID event, with a 0xB4 timestamp if one is given."""
+        digits = contact_id_digits(self.account, qualifier, code, partition, zone)
+        if timestamp is None:
+            self._write(frame(0xB0, digits))
+        else:
+            stamp = bytes(bcd(v) for v in (
+                timestamp.year % 100, timestamp.month, timestamp.day,
+                timestamp.hour, timestamp.minute, timestamp.second))
+            self._write(frame(0xB4, stamp + digits))
+
+    async def close(self):
+        """Close the connection."""
+        for task in self._tasks:
+            task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class SimulatedReceptor:
+    """Stand-in Receptor IP serving simulated panels by account.
+
+    Answers 0xE0, 0xE3 and 0xE4 with a frame echoing the command and a
+    status byte (0 = ok, 1 = unknown account), then relays 0xE9 requests
+    to the linked account's panel.  ``delays`` maps an account to seconds
+    added before each of its replies, to simulate a slow panel; a reply
+    still pending when the link is switched, even to the same account, is
+    discarded.
+    """
+
+    def __init__(self, panels, delays=None):
+        """Initialize with a list of SimulatedPanel, keyed by their account."""
+        self.panels = {panel.account: panel for panel in panels}
+        self.delays = dict(delays or {})
+        self.links = 0
+        self.relayed = {account: 0 for account in self.panels}
+        self._server = None
+        self._writers = []
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Listen and return the bound port."""
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def _serve(self, reader, writer):
+        self._writers.append(writer)
+        linked = None
+        generation = 0
+        try:
+            while True:
+                first = (await reader.readexactly(1))[0]
+                if first == ACK:
+                    continue
+                raw = bytes((first,)) + await reader.readexactly(first - 1)
+                if checksum(raw) != 0:
+                    raise ValueError(f"bad checksum in {raw.hex()}")
+                command, payload = raw[1], raw[2:-1]
+                if command == 0xE0:
+                    writer.write(frame(0xE0, b"\x00"))
+                elif command in (0xE3, 0xE4):
+                    account = int("".join(str(d % 10) for d in payload))
+                    known = account in self.panels
+                    if command == 0xE4 and known:
+                        linked = account
+                        generation += 1
+                        self.links += 1
+                    writer.write(frame(command, b"\x00" if known else b"\x01"))
+                elif command == 0xE9 and linked is not None:
+                    asyncio.ensure_future(
+                        self._relay(writer, linked, payload, lambda g=generation: g == generation))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    async def _relay(self, writer, account, payload, still_linked):
+        await asyncio.sleep(self.delays.get(account, 0))
+        if still_linked() and not writer.is_closing():
+            self.relayed[account] += 1
+            writer.write(frame(0xE9, self.panels[account].isec_mobile_reply(payload)))
+
+    async def close(self):
+        """Stop listening and drop the links."""
+        for writer in self._writers:
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+
+
+def crc16(data):
+    """Return the CRC-16 (polynomial 0x8005, reflected) of data."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def frame_v2(command, data=b"", dst=0x8FFF, src=0x0000):
+    """Build an IsecNet V2 frame with a total-length prefix and CRC-16."""
+    raw = ((len(data) + 10).to_bytes(2, "big") + dst.to_bytes(2, "big")
+           + src.to_bytes(2, "big") + command.to_bytes(2, "big") + bytes(data))
+    return raw + crc16(raw).to_bytes(2, "big")
+
+
+class SimulatedAmt8000:
+    """Stand-in AMT 8000 accepting IsecNet V2 app sessions.
+
+    Sessions must authenticate with 0xF0F0 before any other command.
+    ``delays`` maps a command code to seconds added before its reply, so
+    replies to pipelined requests come back out of order across commands.
+    """
+
+    def __init__(self, password="1234", zones=64, change_rate=0.1, delays=None, seed=None):
+        """Initialize."""
+        self.password = password
+        self.zones = zones
+        self.change_rate = change_rate
+        self.delays = dict(delays or {})
+        self.random = random.Random(seed)
+        self.open_zones = 0
+        self.bypassed_zones = 0
+        self.armed_partitions = 0
+        self.triggered_partitions = 0
+        self.auths = 0
+        self.requests = {}
+        self._server = None
+        self._writers = []
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Listen and return the bound port."""
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def _serve(self, reader, writer):
+        self._writers.append(writer)
+        authenticated = False
+        try:
+            while True:
+                raw = await reader.readexactly(2)
+                raw += await reader.readexactly(int.from_bytes(raw, "big") - 2)
+                if crc16(raw[:-2]) != int.from_bytes(raw[-2:], "big"):
+                    raise ValueError(f"bad CRC in {raw.hex()}")
+                command, data = int.from_bytes(raw[6:8], "big"), raw[8:-2]
+                self.requests[command] = self.requests.get(command, 0) + 1
+                if command == 0xF0F0:
+                    authenticated = data.decode() == self.password
+                    self.auths += 1
+                    reply = b"\x00" if authenticated else b"\xe1"
+                elif not authenticated:
+                    reply = b"\xe1"
+                else:
+                    reply = self._command(command, data)
+                asyncio.ensure_future(self._reply(writer, command, reply))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    async def _reply(self, writer, command, reply):
+        await asyncio.sleep(self.delays.get(command, 0))
+        if not writer.is_closing():
+            writer.write(frame_v2(command, reply))
+
+    def _command(self, command, data):
+        if command == 0x0B4A:
+            if self.random.random() < self.change_rate:
+                self.open_zones ^= 1 << self.random.randrange(self.zones)
+            return self.status_payload()
+        if command == 0x401E:
+            partitions = 0xFFFF if data[0] == 0 else 1 << (data[0] - 1)
+            if data[1]:
+                self.armed_partitions |= partitions
+            else:
+                self.armed_partitions &= ~partitions
+                self.triggered_partitions &= ~partitions
+        elif command == 0x401F:
+            self.bypassed_zones = int.from_bytes(data[:8], "little")
+        return b"\x00"
+
+    def status_payload(self):
+        """Return a 0x0B4A status reply as laid out in isecnet_v2.py."""
+        return (bytes((0x01,)) + self.open_zones.to_bytes(8, "little") + bytes(8)
+                + self.bypassed_zones.to_bytes(8, "little")
+                + self.armed_partitions.to_bytes(2, "little")
+                + self.triggered_partitions.to_bytes(2, "little"))
+
+    async def close(self):
+        """Stop listening and drop the sessions."""
+        for writer in self._writers:
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+
+
+def panel_mac(index):
+    """Return a deterministic MAC for simulated panel index."""
+    return bytes((0x02, 0xA3, 0x00)) + index.to_bytes(3, "big")
+
+
+async def run_panels(host, port, count, **kwargs):
+    """Connect count simulated panels and return them."""
+    panels = [SimulatedPanel(host, port, panel_mac(i), seed=i, **kwargs) for i in range(count)]
+    await asyncio.gather(*(panel.connect() for panel in panels))
+    return panels
+
+
+def main():
+    """Run simulated panels until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9009)
+    parser.add_argument("--panels", type=int, default=1)
+    parser.add_argument("--heartbeat", type=float, default=30.0)
+    parser.add_argument("--change-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    async def run():
+        panels = await run_panels(args.host, args.port, args.panels,
+                                  heartbeat_interval=args.heartbeat,
+                                  change_rate=args.change_rate)
+        for panel in panels:
+            print(f"panel {panel.mac.hex()} connected")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
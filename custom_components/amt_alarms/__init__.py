@@ -1,5 +1,8 @@
 """The Intelbras AMT Alarms integration."""
 import asyncio
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
 import socket
 import time
 from typing import Union
@@ -9,40 +12,103 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import (
     config_validation as cv,
     device_registry as dr,
     discovery_flow
 )
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelEntity,
     AlarmControlPanelEntityFeature,
 )
 
+from .bitmap import changed_bits, iter_bits, pack_bits, test_bit
+from .clock import PanelClock
 from .const import (
+    CONF_ACCOUNT,
     CONF_AWAY_MODE_ENABLED,
     CONF_AWAY_PARTITION_1,
     CONF_AWAY_PARTITION_2,
     CONF_AWAY_PARTITION_3,
     CONF_AWAY_PARTITION_4,
+    CONF_BYPASS_PRESETS,
+    CONF_CONFIGURED_ZONES,
     CONF_AWAY_PARTITION_LIST,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_FAST_POLL_WINDOW,
     CONF_HOME_MODE_ENABLED,
     CONF_HOME_PARTITION_1,
     CONF_HOME_PARTITION_2,
     CONF_HOME_PARTITION_3,
     CONF_HOME_PARTITION_4,
     CONF_HOME_PARTITION_LIST,
+    CONF_ISECPROGRAM_POLL_INTERVAL,
+    CONF_MAC_ADDRESS,
+    CONF_MAX_POLL_INTERVAL,
     CONF_NIGHT_PARTITION_1,
     CONF_NIGHT_PARTITION_2,
     CONF_NIGHT_PARTITION_3,
     CONF_NIGHT_PARTITION_4,
     CONF_NIGHT_PARTITION_LIST,
+    CONF_PANEL_HOST,
+    CONF_PARTITION_COUNT,
     CONF_PASSWORD,
+    CONF_PGM_COUNT,
     CONF_PORT,
+    CONF_RECEPTOR_HOST,
+    CONF_SHARED_LISTENER,
+    CONF_SYSTEM_PASSWORD,
+    CONF_WRITE_BATCH_WINDOW,
+    CONF_ZONE_PROFILES,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_FAST_POLL_WINDOW,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_PARTITION_COUNT,
+    DEFAULT_PGM_COUNT,
+    DEFAULT_WRITE_BATCH_WINDOW,
     DOMAIN,
+    EVENT_BUFFER_SIZE,
+    EVENT_CONTACT_ID,
     LOGGER,
+    SIGNAL_ZONES_CHANGED,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .isecnet import (
+    CODE_PGM,
+    CODE_PROGRAMMING_CHANGED,
+    ContactIdEvent,
+    IsecNetError,
+    parse_mac,
+)
+from .listener import PanelListener, async_get_listener
+from .panel import IsecNetPanel
+from .isecnet_v2 import MAX_ZONES as V2_MAX_ZONES
+from .panel_v2 import IsecNetV2Panel
+from .receptor import ReceptorLink, ReceptorPanel, async_get_receptor
+from .poller import AdaptivePoller
+from .scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_MAINTENANCE,
+    PRIORITY_POLL,
+    PRIORITY_URGENT,
+    CommandScheduler,
+)
+from .stats import HubStats
+from .supervisor import LinkSupervisor
+from .zonefilter import ZoneFilter
+from .zones import (
+    compile_zone_profiles,
+    parse_bypass_presets,
+    parse_zone_profiles,
+    parse_zones,
+    resolve_zones,
 )
 
 from .schema import (
@@ -66,7 +132,39 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
-PLATFORMS: list[Platform] = [Platform.ALARM_CONTROL_PANEL, Platform.BINARY_SENSOR, Platform.SENSOR]
+PLATFORMS: list[Platform] = [
+    Platform.ALARM_CONTROL_PANEL, Platform.BINARY_SENSOR, Platform.SENSOR, Platform.SWITCH,
+]
+
+# Keys entities subscribe to with AlarmHub.listen_event.  Zones and
+# partitions are keyed per index: ("zone", i) and ("partition", i).
+KEY_ALL = "all"
+KEY_PARTITIONS = "partitions"
+KEY_BYPASS = "bypass"
+KEY_STATUS = "status"
+KEY_ZONE = "zone"
+KEY_PARTITION = "partition"
+KEY_PGM = "pgm"
+# Listeners of KEY_NAMES are called with names_updated() instead.
+KEY_NAMES = "names"
+
+# The link is declared down after this many maximum poll intervals of
+# silence, even if the connection was never seen to drop.
+LINK_STALE_POLLS = 3
+
+# Entry settings the hub is built from: changing one reloads the entry.
+RELOAD_SETTINGS = (
+    CONF_PORT, CONF_PASSWORD, CONF_SYSTEM_PASSWORD, CONF_SHARED_LISTENER,
+    CONF_MAC_ADDRESS, CONF_PANEL_HOST, CONF_RECEPTOR_HOST, CONF_ACCOUNT,
+    CONF_PGM_COUNT, CONF_ISECPROGRAM_POLL_INTERVAL,
+)
+
+# An AMT 8000 is sized from these at setup, so they reload it too.
+V2_RELOAD_SETTINGS = (CONF_CONFIGURED_ZONES, CONF_PARTITION_COUNT)
+
+# Backlog events are held until none has arrived for this many seconds,
+# then recorded and fired in the order they happened.
+REORDER_WINDOW = 2
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -79,12 +177,59 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored panel snapshot of a deleted entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
+@dataclass(frozen=True)
+class PanelIdentity:
+    """Identity of the panel, computed once the panel has identified itself.
+
+    Entities derive their unique ids, names and device info from it at
+    construction instead of rebuilding them from the panel on every read.
+    """
+
+    model: str
+    mac: str
+
+    @property
+    def panel_id(self):
+        """Return the id shared by every entity of the panel."""
+        return f"{self.model}_{self.mac}"
+
+    @property
+    def panel_unique_id(self):
+        """Return the unique id of the panel entity and device."""
+        return self.unique_id("alarm_panel")
+
+    def unique_id(self, suffix):
+        """Return the unique id of a panel entity."""
+        return f"{self.panel_id}_{suffix}"
+
+
 class AlarmHub:
-    """Placeholder class to make tests pass."""
+    """One config entry's connection to its panel, shared by its entities.
+
+    The hub owns the panel backend (``amtalarm``, the shared listener, a
+    Receptor IP account or an AMT 8000 session) and is its only listener.
+    It keeps the panel state as bitmaps, notifies each entity only of the
+    slice it displays, sends every command through one priority
+    scheduler, polls the status and persists a snapshot so entities can
+    be set up before the panel reconnects.
+    """
 
     def __init__(
         self, hass: HomeAssistant, config_entry: ConfigEntry, port, default_password=None,
-        system_password=None, isecprogram_poll_interval=1800
+        system_password=None, isecprogram_poll_interval=1800,
+        fast_poll_interval=DEFAULT_FAST_POLL_INTERVAL,
+        fast_poll_window=DEFAULT_FAST_POLL_WINDOW,
+        max_poll_interval=DEFAULT_MAX_POLL_INTERVAL,
+        listener: PanelListener | None = None, mac_address: bytes | None = None,
+        write_batch_window=DEFAULT_WRITE_BATCH_WINDOW,
+        receptor: ReceptorLink | None = None, account: int | None = None,
+        panel_host: str | None = None, pgm_count=DEFAULT_PGM_COUNT,
+        partition_count=DEFAULT_PARTITION_COUNT,
     ) -> None:
         """Initialize."""
 
@@ -97,10 +242,129 @@ class AlarmHub:
 
         self.hass = hass
         self.config_entry = config_entry
+        data = config_entry.data if config_entry is not None else {}
+        self.settings = {key: data.get(key) for key in RELOAD_SETTINGS + V2_RELOAD_SETTINGS}
+        # The hub is the only listener registered with the panel; entities
+        # subscribe to the hub and only hear about the slice they display.
+        self._listeners: dict = {}
+        self.compile_modes()
+        # Debounce and flap state of every zone, driven by one timer.
+        self._zone_filter = ZoneFilter()
+        self._zone_filter_timer = None
+        self.compile_zone_profiles()
+        self.compile_bypass_presets()
+
+        # In shared listener mode the panel's connection is accepted by a
+        # PanelListener serving many hubs and routed here by MAC address.
+        self.stats = HubStats()
+        # Every command to the panel waits its turn here, by priority.
+        self.scheduler = CommandScheduler(self.stats)
+        self._listener = listener
+        self._receptor = receptor
+        if receptor is not None:
+            # Through a Receptor IP the panel is one account on a link
+            # shared with every entry configured for the same receptor.
+            self.alarm = ReceptorPanel(
+                account, default_password=self.default_password, logger=LOGGER,
+                stats=self.stats,
+            )
+            receptor.register(self.alarm)
+        elif panel_host is not None:
+            # An AMT 8000 is connected to, over one IsecNet V2 session.
+            LOGGER.warning("the AMT 8000 backend is experimental: its payload "
+                           "layouts are unverified")
+            self.alarm = IsecNetV2Panel(
+                hass, panel_host, port, default_password=self.default_password,
+                logger=LOGGER, stats=self.stats,
+                zone_count=max(self._configured_zone_list(V2_MAX_ZONES), default=0) + 1,
+                partition_count=partition_count,
+            )
+            self.alarm.start()
+        elif listener is not None:
+            self.alarm = IsecNetPanel(
+                mac_address, default_password=self.default_password, logger=LOGGER,
+                stats=self.stats,
+            )
+            listener.register(self.alarm)
+        else:
+            self.alarm = AMTAlarm(
+                port, default_password=default_password, system_password=system_password,
+                isecprogram_poll_interval=isecprogram_poll_interval, logger=LOGGER,
+            )
+        self.compile_configured_zones()
+
+        self._has_snapshot = False
+
+        # PGM outputs (0-based), None while unknown: the status reply does
+        # not carry them, so they are assumed from our commands and PGM
+        # events, never read back.
+        # Switching goes through one coalescing queue, see async_set_pgm.
+        self.pgm_count = 0
+        if getattr(self.alarm, "pgm_supported", False):
+            self.pgm_count = min(pgm_count, self.alarm.max_pgms)
+        self.pgm_states: list = [None] * self.pgm_count
+        self._pgm_wanted: dict[int, bool] = {}
+        self._pgm_task = None
+
+        # With a batching window (ms), listeners notified during the window
+        # are called once when it closes and write their final state.
+        self.write_batch_window = write_batch_window
+        self._batched: dict = {}
+        self._batch_timer = None
+        self.identity: PanelIdentity | None = None
 
-        self.alarm = AMTAlarm(
-            port, default_password=default_password, system_password=system_password,
-            isecprogram_poll_interval=isecprogram_poll_interval, logger=LOGGER,
+        # Last known identity, configuration and general status, persisted
+        # so entities can be set up before the panel reconnects.  While a
+        # restored snapshot is in use, configuration queries answer from it.
+        self._store = None
+        if config_entry is not None:
+            self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}")
+        self._snapshot: dict | None = None
+        self._general_status = None
+
+        # Zones the binary_sensor platform has entities for, re-read every
+        # isecprogram poll so zones enabled or disabled on the panel are
+        # added or removed without reloading the entry.
+        self.isecprogram_poll_interval = isecprogram_poll_interval
+        self.configured_zones: frozenset | None = None
+        self._zone_check_unsub = None
+
+        # Zone and partition names (0-based index -> name), read in bulk
+        # once and kept in the snapshot.  They are read again only after a
+        # programming-changed event or on the isecprogram poll.
+        self.zone_names: dict[int, str] = {}
+        self.partition_names: dict[int, str] = {}
+        # Casefolded zone name -> index, for the bypass service.
+        self.zone_name_index: dict[str, int] = {}
+        self._names_read = False
+        self._names_task = None
+
+        # Panel state as int bitmaps (bit i = zone/partition i), None while
+        # unknown.  See bitmap.py.
+        self.open_zones_bitmap = None
+        self.bypassed_zones_bitmap = None
+        self.bypassed_zone_list: list[int] = []
+        self.armed_partitions_bitmap = None
+        self.triggered_partitions_bitmap = None
+
+        # Last Contact ID events as (received, ContactIdEvent, occurred),
+        # oldest occurred first.  occurred is the event's panel timestamp
+        # corrected by the clock estimate, or received without one.
+        self.events: deque = deque(maxlen=EVENT_BUFFER_SIZE)
+        self.clock = PanelClock()
+        self._backlog: list = []
+        self._backlog_timer = None
+        self.alarm.listen_event(self)
+
+        self._status_requested = None
+        self._poller = AdaptivePoller(
+            hass, self._async_request_status, fast_poll_interval,
+            fast_poll_window, max_poll_interval,
+        )
+        # One grace timer for the whole hub decides when the link is down;
+        # entities only ever see the resulting state.
+        self._link = LinkSupervisor(
+            hass, self._link_down, stale_after=LINK_STALE_POLLS * max_poll_interval
         )
 
     @property
@@ -108,59 +372,625 @@ class AlarmHub:
         """Return unique name from device."""
         return "AMTAlarm"
 
+    def start_polling(self):
+        """Start the adaptive status poller and the configured-zone check.
+
+        ``amtalarm`` requests the status every second on its own and has no
+        way to turn that off, so the adaptive poller only drives the
+        integration's own transports.
+        """
+        if isinstance(self.alarm, IsecNetPanel):
+            self._poller.start()
+        if self._zone_check_unsub is None:
+            self._zone_check_unsub = async_track_time_interval(
+                self.hass, self._isecprogram_poll,
+                timedelta(seconds=self.isecprogram_poll_interval),
+            )
+
+    @callback
+    def _isecprogram_poll(self, _now):
+        self.check_configured_zones()
+        self.refresh_names()
+
+    @callback
+    def refresh_names(self):
+        """Read zone and partition names in the background, once at a time."""
+        if not getattr(self.alarm, "names_supported", False) or self._names_task is not None:
+            return
+        self._names_task = self.hass.async_create_background_task(
+            self._async_read_names(), f"{DOMAIN} names"
+        )
+
+    async def _async_read_names(self):
+        try:
+            zones, partitions = await self.scheduler.run(
+                PRIORITY_MAINTENANCE, self.alarm.async_read_names,
+                self.max_sensors, self.max_partitions,
+            )
+        except (OSError, asyncio.TimeoutError, IsecNetError, ValueError) as err:
+            LOGGER.warning("cannot read zone and partition names: %s", err)
+            return
+        finally:
+            self._names_task = None
+        self._names_read = True
+        if zones == self.zone_names and partitions == self.partition_names:
+            return
+        self.zone_names, self.partition_names = zones, partitions
+        self._index_zone_names()
+        LOGGER.debug("read %d zone and %d partition names", len(zones), len(partitions))
+        self._schedule_snapshot_save()
+        for listener in list(self._listeners.get(KEY_NAMES, ())):
+            listener.names_updated()
+
+    @callback
+    def check_configured_zones(self, _now=None):
+        """Signal the zones enabled or disabled since the last check."""
+        zones = frozenset(i for i in range(self.max_sensors) if self.is_sensor_configured(i))
+        previous, self.configured_zones = self.configured_zones, zones
+        if previous is None or zones == previous:
+            return
+        added, removed = sorted(zones - previous), sorted(previous - zones)
+        LOGGER.info("configured zones changed: added %s, removed %s",
+                    [i + 1 for i in added], [i + 1 for i in removed])
+        async_dispatcher_send(
+            self.hass, SIGNAL_ZONES_CHANGED.format(self.config_entry.entry_id), added, removed
+        )
+        self._schedule_snapshot_save()
+
+    @property
+    def poll_interval(self):
+        """Return the current status poll interval in seconds.
+
+        None when the status is not polled by the hub (``amtalarm``).
+        """
+        return self._poller.interval if self._poller.running else None
+
+    def configure_polling(self, fast_interval, fast_window, max_interval):
+        """Apply new status poll settings to the running poller."""
+        self._poller.configure(fast_interval, fast_window, max_interval)
+        self._link.stale_after = max(LINK_STALE_POLLS * max_interval, self._link.grace)
+
+    async def _async_request_status(self):
+        """Poll the panel status when no user command is waiting."""
+        await self.scheduler.run(PRIORITY_POLL, self._async_send_status_request)
+
+    async def _async_send_status_request(self):
+        """Request the status, timing the round trip to the update."""
+        self._status_requested = time.perf_counter()
+        await self.alarm.send_request_zones()
+
+    @callback
+    def alarm_heartbeat(self):
+        """Receive a heartbeat (0xF7) from the panel."""
+        self._poller.note_alive()
+        self._link.alive()
+
+    @callback
+    def alarm_datetime_request(self):
+        """Answer the panel's date/time request (0x80) from our clock."""
+        now = dt_util.now()
+        self.alarm.send_datetime(now)
+        self.clock.synced(now.timestamp())
+        self._schedule_snapshot_save()
+        LOGGER.debug("panel clock set to %s", now)
+
+    def _schedule_snapshot_save(self):
+        """Save the snapshot, debounced, once the live panel is known.
+
+        Nothing is saved while entities still run from a restored
+        snapshot: ``async_connect`` saves once the panel is back.
+        """
+        if self._store is not None and self._snapshot is None and self.identity is not None:
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def alarm_event(self, event: ContactIdEvent):
+        """Receive a Contact ID event from the panel.
+
+        The event is kept in the ring buffer, fired on the event bus as
+        ``amt_alarms_event`` and, since it usually means the panel state
+        changed, triggers a status poll.
+
+        Timestamped events (0xB4) feed the panel clock estimate.  Those
+        that happened well before they arrived are backlog the panel held
+        during an outage: they are collected until the burst is over and
+        then recorded in the order they happened.
+        """
+        received = time.time()
+        occurred = received
+        LOGGER.debug("contact id event %s", event)
+        if event.timestamp is not None:
+            panel_time = event.timestamp.replace(
+                tzinfo=dt_util.get_default_time_zone()
+            ).timestamp()
+            if self.clock.observe(panel_time, received):
+                self._schedule_snapshot_save()
+            occurred = self.clock.to_local(panel_time, received)
+            if self.clock.is_backlog(panel_time, received):
+                self._backlog.append((received, event, occurred))
+                if self._backlog_timer is not None:
+                    self._backlog_timer.cancel()
+                self._backlog_timer = self.hass.loop.call_later(
+                    REORDER_WINDOW, self._flush_backlog
+                )
+                return
+        self.events.append((received, event, occurred))
+        self.hass.bus.async_fire(
+            EVENT_CONTACT_ID, self.event_data(received, event, occurred)
+        )
+        self._poller.kick()
+        if event.code == CODE_PROGRAMMING_CHANGED:
+            self.refresh_names()
+        elif event.code == CODE_PGM and 1 <= event.zone <= self.pgm_count:
+            self._pgm_changed(event.zone - 1, not event.restore)
+
+    @callback
+    def _flush_backlog(self):
+        """Record and fire the held backlog, oldest first."""
+        self._backlog_timer = None
+        backlog, self._backlog = sorted(self._backlog, key=lambda item: item[2]), []
+        LOGGER.debug("flushing %d backlog events", len(backlog))
+        # Live events recorded meanwhile may be newer than the backlog.
+        self.events = deque(
+            sorted((*self.events, *backlog), key=lambda item: item[2]),
+            maxlen=EVENT_BUFFER_SIZE,
+        )
+        for received, event, occurred in backlog:
+            data = self.event_data(received, event, occurred)
+            data["backlog"] = True
+            self.hass.bus.async_fire(EVENT_CONTACT_ID, data)
+        self._poller.kick()
+        if any(event.code == CODE_PROGRAMMING_CHANGED for _, event, _ in backlog):
+            self.refresh_names()
+
+    def event_data(self, received, event: ContactIdEvent, occurred=None):
+        """Return the event bus / service representation of an event."""
+        return {
+            "entry_id": self.config_entry.entry_id if self.config_entry else None,
+            "account": event.account,
+            "qualifier": event.qualifier,
+            "restore": event.restore,
+            "code": event.code,
+            "description": event.description,
+            "partition": event.partition,
+            "zone": event.zone,
+            "timestamp": event.timestamp.isoformat() if event.timestamp else None,
+            "received": dt_util.utc_from_timestamp(received).isoformat(),
+            "occurred": dt_util.utc_from_timestamp(
+                received if occurred is None else occurred
+            ).isoformat(),
+        }
+
+    def get_events(self, limit=None, partition=None):
+        """Return the most recent buffered events, newest last.
+
+        With partition (1-based, as reported by Contact ID) only events of
+        that partition and system events (partition 0) are returned.
+        """
+        events = self.events
+        if partition is not None:
+            events = [item for item in events if item[1].partition in (0, partition)]
+        events = list(events)
+        if limit is not None:
+            events = events[-limit:] if limit > 0 else []
+        return [self.event_data(*item) for item in events]
+
+    async def _async_partition_burst(self, priority, send, partitions, code=None):
+        """Send one command per partition in a single pipelined burst.
+
+        All frames are written before any acknowledgement is awaited, as
+        far as the scheduler lets them in flight at once.  Returns a dict
+        mapping each partition to None on success or to the exception it
+        failed with.
+        """
+        results = await asyncio.gather(
+            *(self.scheduler.run(priority, send, i, code) for i in partitions),
+            return_exceptions=True,
+        )
+        return {
+            i: result if isinstance(result, BaseException) else None
+            for i, result in zip(partitions, results)
+        }
+
+    async def _async_all_partitions(self, priority, send, code=None):
+        """Send one command addressing every partition at once."""
+        error = None
+        try:
+            await self.scheduler.run(priority, send, code)
+        except Exception as err:  # pylint: disable=broad-except
+            error = err
+        return dict.fromkeys(range(self.max_partitions), error)
+
+    def _log_failures(self, action, results):
+        for i, error in results.items():
+            if error is not None:
+                LOGGER.warning("%s of partition %d failed: %s", action, i + 1, error)
+        return results
+
     async def async_alarm_disarm(self, code=None):
-        """Send disarm command."""
-        for i in range(self.max_partitions):
-            await self.alarm.send_disarm_partition(i)
-
-
-    async def async_alarm_arm_mode(self, mode_list, code=None):
-        """Send arm command with specific mode list"""
-        LOGGER.debug(f"config_entry {self.config_entry.data}")
-        partitions = [*range(self.max_partitions)]
-        for i in range(self.max_partitions):
-            LOGGER.debug(f"mode_list[i] not in self.config_entry.data: {mode_list[i] not in self.config_entry.data}")
-            if mode_list[i] in self.config_entry.data:
-                LOGGER.debug(f"self.config_entry.data[mode_list[i]] != partition_on: {self.config_entry.data[mode_list[i]] != partition_on}")
+        """Disarm every partition, returning per-partition results.
+
+        The integration's own transports disarm every partition with one
+        frame; ``amtalarm`` keeps its per-partition disarm.
+        """
+        try:
+            if isinstance(self.alarm, IsecNetPanel):
+                results = await self._async_all_partitions(
+                    PRIORITY_URGENT, self.alarm.send_disarm, code
+                )
             else:
-                LOGGER.debug(f"mode_list[i] not in self.config_entry.data[]")
-            LOGGER.debug(f"i {i} mode_list[i] {mode_list[i]}")
-            if (mode_list[i] not in self.config_entry.data or
-                self.config_entry.data[mode_list[i]] != partition_on):
-                partitions.remove(i)
-        LOGGER.debug(f"len(partitions) {len(partitions)} self.max_partitions {self.max_partitions}")
-        if len(partitions) == self.max_partitions:
-            await self.alarm.send_arm(code)
-        else:
-            for i in partitions:
-                await self.alarm.send_arm_partition(i, code)
-        
+                results = await self._async_partition_burst(
+                    PRIORITY_URGENT, self.alarm.send_disarm_partition,
+                    range(self.max_partitions), code,
+                )
+        finally:
+            self._poller.kick()
+        return self._log_failures("disarm", results)
+
+    def compile_modes(self):
+        """Compile the night/away/home partition settings into bitmasks.
+
+        Called at setup and whenever the entry is updated, so mode
+        detection and arming never look at config_entry.data again.
+        """
+        data = self.config_entry.data if self.config_entry is not None else {}
+
+        def mask(keys):
+            return sum(1 << i for i, key in enumerate(keys) if data.get(key) == partition_on)
+
+        self.night_mask = mask(CONF_NIGHT_PARTITION_LIST)
+        self.away_mask = mask(CONF_AWAY_PARTITION_LIST)
+        self.home_mask = mask(CONF_HOME_PARTITION_LIST)
+        self.away_enabled = bool(data.get(CONF_AWAY_MODE_ENABLED, False))
+        self.home_enabled = bool(data.get(CONF_HOME_MODE_ENABLED, False))
+        LOGGER.debug("mode masks night %#x away %#x home %#x",
+                     self.night_mask, self.away_mask, self.home_mask)
+
+    def compile_zone_profiles(self):
+        """Compile the zone profile table into per-zone lookup arrays.
+
+        Zone sensors read their device class by index, inverted zones are
+        flipped with one XOR and the zone filter gets its debounce and
+        flap tables, so the table is parsed only here, at setup and when
+        the entry is updated.  Held and flapping zones are released.
+        """
+        data = self.config_entry.data if self.config_entry is not None else {}
+        try:
+            profiles = parse_zone_profiles(data.get(CONF_ZONE_PROFILES))
+        except ValueError as err:
+            LOGGER.warning("ignoring zone profiles: %s", err)
+            profiles = {}
+        tables = compile_zone_profiles(profiles)
+        self.zone_device_classes = tables.device_classes
+        self.zone_inverted_mask = tables.inverted_mask
+        self._zone_filter.configure(tables.debounce, tables.frames, tables.flap)
+        self.open_zones_bitmap = self._zone_filter.reported
+        self._schedule_zone_filter()
+        for key, listeners in list(self._listeners.items()):
+            if isinstance(key, tuple) and key[0] == KEY_ZONE:
+                for listener in list(listeners):
+                    listener.profile_updated()
+
+    def compile_bypass_presets(self):
+        """Compile the bypass presets into zone bitmaps.
+
+        Called at setup and whenever the entry is updated, so a preset
+        costs one dict lookup when the bypass service is called.
+        """
+        data = self.config_entry.data if self.config_entry is not None else {}
+        try:
+            self.bypass_presets = parse_bypass_presets(data.get(CONF_BYPASS_PRESETS))
+        except ValueError as err:
+            LOGGER.warning("ignoring bypass presets: %s", err)
+            self.bypass_presets = {}
+
+    def _configured_zone_list(self, max_zones):
+        data = self.config_entry.data if self.config_entry is not None else {}
+        text = (data.get(CONF_CONFIGURED_ZONES) or "").strip()
+        try:
+            return parse_zones(text, max_zones) if text else []
+        except ValueError as err:
+            LOGGER.warning("ignoring configured zones: %s", err)
+            return []
+
+    def compile_configured_zones(self):
+        """Give the integration's own transports the zones in use.
+
+        They cannot read the zone programming, so the entry lists the
+        zones; without the list no zone is reported.  ``amtalarm`` reads
+        the programming itself.  Called at setup and on entry updates.
+        """
+        if not isinstance(self.alarm, IsecNetPanel):
+            return
+        zones = self._configured_zone_list(self.alarm.max_sensors)
+        if not zones:
+            LOGGER.warning("no configured zones: set them in the entry's options")
+        self.alarm.configured_zone_mask = pack_bits(
+            i in zones for i in range(self.alarm.max_sensors)
+        )
+
+    def _index_zone_names(self):
+        # The lowest zone wins when names repeat.
+        self.zone_name_index = {
+            name.strip().casefold(): i for i, name in sorted(self.zone_names.items(), reverse=True)
+        }
+
+    def resolve_bypass_zones(self, entries):
+        """Resolve bypass service entries into a bitmap of configured zones.
+
+        See ``zones.resolve_zones`` for what an entry may be.  Raises
+        ``ValueError`` for anything unknown, out of range or for a zone
+        that is not configured, so nothing the panel would reject is sent.
+        """
+        mask = resolve_zones(
+            entries, self.zone_name_index, self.bypass_presets, self.max_sensors
+        )
+        if mask >> self.max_sensors:
+            raise ValueError(f"the panel has {self.max_sensors} zones")
+        unconfigured = [i + 1 for i in iter_bits(mask) if not self.is_sensor_configured(i)]
+        if unconfigured:
+            raise ValueError(f"zones {unconfigured} are not configured")
+        return mask
+
+    async def async_alarm_arm_mode(self, mask, code=None):
+        """Arm the partitions in mask, returning per-partition results."""
+        if not mask:
+            return {}
+        try:
+            if mask == (1 << self.max_partitions) - 1:
+                results = await self._async_all_partitions(
+                    PRIORITY_COMMAND, self.alarm.send_arm, code
+                )
+            else:
+                results = await self._async_partition_burst(
+                    PRIORITY_COMMAND, self.alarm.send_arm_partition,
+                    list(iter_bits(mask)), code,
+                )
+        finally:
+            self._poller.kick()
+        return self._log_failures("arm", results)
 
     async def async_alarm_arm_night(self, code=None):
         """Send arm night command."""
-        await self.async_alarm_arm_mode(CONF_NIGHT_PARTITION_LIST, code)
+        return await self.async_alarm_arm_mode(self.night_mask, code)
 
     async def async_alarm_arm_away(self, code=None):
         """Send arm await command."""
-        if self.config_entry.data[CONF_AWAY_MODE_ENABLED]:
-            await self.async_alarm_arm_mode(CONF_AWAY_PARTITION_LIST, code)
+        if self.away_enabled:
+            return await self.async_alarm_arm_mode(self.away_mask, code)
+        return {}
 
     async def async_alarm_arm_home(self, code=None):
         """Send arm await command."""
-        if self.config_entry.data[CONF_HOME_MODE_ENABLED]:
-            await self.async_alarm_arm_mode(CONF_HOME_PARTITION_LIST, code)
+        if self.home_enabled:
+            return await self.async_alarm_arm_mode(self.home_mask, code)
+        return {}
+
+    async def _async_command(self, priority, send, *args):
+        """Send a user command and poll fast to pick up its effect."""
+        try:
+            return await self.scheduler.run(priority, send, *args)
+        finally:
+            self._poller.kick()
+
+    async def async_alarm_arm_partition(self, index, code=None):
+        """Send arm partition command."""
+        await self._async_command(PRIORITY_COMMAND, self.alarm.send_arm_partition, index, code)
+
+    async def async_alarm_disarm_partition(self, index, code=None):
+        """Send disarm partition command."""
+        await self._async_command(PRIORITY_URGENT, self.alarm.send_disarm_partition, index, code)
+
+    async def async_alarm_bypass(self, mask, code=None):
+        """Bypass the zones of a bitmap in one frame, clearing the others.
+
+        The integration's own transports take the bitmap as is;
+        ``amtalarm`` takes the list of zones.
+        """
+        if isinstance(self.alarm, IsecNetPanel):
+            await self._async_command(
+                PRIORITY_COMMAND, self.alarm.send_bypass_bitmap, mask, code
+            )
+        else:
+            await self._async_command(
+                PRIORITY_COMMAND, self.alarm.send_bypass, list(iter_bits(mask)), code
+            )
+
+    async def async_alarm_silent_trigger(self, code=None):
+        """Send silent panic command."""
+        await self._async_command(PRIORITY_URGENT, self.alarm.send_silent_trigger, code)
+
+    async def async_alarm_audible_trigger(self, code=None):
+        """Send audible panic command."""
+        await self._async_command(PRIORITY_URGENT, self.alarm.send_audible_trigger, code)
+
+    async def async_alarm_medical_trigger(self, code=None):
+        """Send medical emergency command."""
+        await self._async_command(PRIORITY_URGENT, self.alarm.send_medical_trigger, code)
+
+    async def async_alarm_fire_trigger(self, code=None):
+        """Send fire alarm command."""
+        await self._async_command(PRIORITY_URGENT, self.alarm.send_fire_trigger, code)
+
+    async def async_set_pgm(self, index, on):
+        """Switch a 0-based PGM output, coalescing with queued requests.
+
+        Only the last state asked for each output is kept, and the queue
+        sends one command at a time in the ISEC Mobile stream shared with
+        every other command: toggling a relay ten times while a command is
+        in flight sends at most one more.  Returns None once the panel took
+        the command, or the exception it failed with; the output itself is
+        not read back, so its state stays assumed.
+        """
+        if index in self._pgm_wanted:
+            self.stats.pgm_coalesced += 1
+        self._pgm_wanted[index] = on
+        self._notify([(KEY_PGM, index)])
+        if self._pgm_task is None:
+            self._pgm_task = self.hass.async_create_background_task(
+                self._async_drain_pgm(), f"{DOMAIN} pgm"
+            )
+        results = await asyncio.shield(self._pgm_task)
+        return results.get(index)
+
+    async def _async_drain_pgm(self):
+        results = {}
+        try:
+            while self._pgm_wanted:
+                index, on = next(iter(self._pgm_wanted.items()))
+                # Sent even when it matches the assumed state, which may
+                # be stale: the output is never read back.
+                self.stats.pgm_commands += 1
+                try:
+                    await self.scheduler.run(
+                        PRIORITY_COMMAND, self.alarm.send_pgm, index, on
+                    )
+                except (OSError, asyncio.TimeoutError, IsecNetError) as err:
+                    LOGGER.warning("switching PGM %d failed: %s", index + 1, err)
+                    results[index] = err
+                else:
+                    self.pgm_states[index] = on
+                    results[index] = None
+                if self._pgm_wanted.get(index) == on:
+                    del self._pgm_wanted[index]
+                    self._notify([(KEY_PGM, index)])
+        finally:
+            self._pgm_task = None
+        return results
+
+    def pgm_state(self, index):
+        """Return the assumed state of a PGM output, or the one asked for."""
+        return self._pgm_wanted.get(index, self.pgm_states[index])
+
+    def _pgm_changed(self, index, on):
+        """Record a PGM switched by the panel itself or another client."""
+        if self.pgm_states[index] != on:
+            self.pgm_states[index] = on
+            self._notify([(KEY_PGM, index)])
 
     def close(self):
         """Close and free resources."""
+        self._poller.stop()
+        self.scheduler.close()
+        self._link.stop()
+        if self._zone_check_unsub is not None:
+            self._zone_check_unsub()
+            self._zone_check_unsub = None
+        if self._names_task is not None:
+            self._names_task.cancel()
+            self._names_task = None
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        self._batched.clear()
+        if self._zone_filter_timer is not None:
+            self._zone_filter_timer.cancel()
+            self._zone_filter_timer = None
+        if self._backlog_timer is not None:
+            self._backlog_timer.cancel()
+            self._backlog_timer = None
+        self._backlog.clear()
+        if self._pgm_task is not None:
+            self._pgm_task.cancel()
+            self._pgm_task = None
+        self._pgm_wanted.clear()
+        self.alarm.remove_listen_event(self)
+        self._listeners.clear()
         self.alarm.close()
+        if self._listener is not None:
+            self._listener.unregister(self.alarm)
+        if self._receptor is not None:
+            self._receptor.unregister(self.alarm)
+
+    def _panel_identity(self):
+        """Return the identity the panel announced in the 0x95 handshake."""
+        alarm = self.alarm
+        if isinstance(alarm, IsecNetPanel):
+            mac = alarm.mac_address
+        else:
+            mac = alarm._mac_address  # pylint: disable=protected-access
+        return PanelIdentity(alarm.model, mac.hex())
 
     async def wait_connection_and_update(self):
         """Call asynchronously wait_connection and then after a update."""
-        return await self.alarm.wait_connection_and_update()
+        result = await self.alarm.wait_connection_and_update()
+        if self.identity is None:
+            self.identity = self._panel_identity()
+        return result
 
     async def wait_connection(self):
         """Call asynchronously wait_connection and then after a update."""
-        return await self.alarm.wait_connection()
+        result = await self.alarm.wait_connection()
+        if self.identity is None:
+            self.identity = self._panel_identity()
+        return result
+
+    async def async_restore_snapshot(self):
+        """Seed the hub from the stored snapshot; return whether there was one."""
+        if self._store is None:
+            return False
+        data = await self._store.async_load()
+        if not data:
+            return False
+        self.identity = PanelIdentity(data["model"], data["mac"])
+        self._snapshot = {
+            **data,
+            "zones": frozenset(data["zones"]),
+            "partitions": frozenset(data["partitions"]),
+        }
+        status = data.get("general_status")
+        self._general_status = tuple(status) if status else None
+        self.configured_zones = self._snapshot["zones"]
+        self.clock.restore(data.get("clock"))
+        if "zone_names" in data:
+            self.zone_names = {int(i): name for i, name in data["zone_names"].items()}
+            self._index_zone_names()
+            self.partition_names = {
+                int(i): name for i, name in data["partition_names"].items()
+            }
+            self._names_read = True
+        LOGGER.debug("restored snapshot of %s", self.identity.panel_id)
+        return True
+
+    def _data_to_save(self):
+        data = {
+            "model": self.identity.model,
+            "mac": self.identity.mac,
+            "max_sensors": self.max_sensors,
+            "max_partitions": self.max_partitions,
+            "zones": [i for i in range(self.max_sensors) if self.is_sensor_configured(i)],
+            "partitions": [
+                i for i in range(self.max_partitions) if self.is_partition_configured(i)
+            ],
+            "general_status": self._general_status,
+            "clock": self.clock.as_state(),
+        }
+        if self._names_read:
+            data["zone_names"] = self.zone_names
+            data["partition_names"] = self.partition_names
+        return data
+
+    async def async_connect(self):
+        """Wait for the panel, then start polling and refresh the snapshot.
+
+        If the panel that connected is not the one entities were restored
+        for, the entry is reloaded to set them up again.
+        """
+        await self.wait_connection_and_update()
+        live = self._panel_identity()
+        restored = self.identity
+        self.identity = live
+        self._snapshot = None
+        self.check_configured_zones()
+        self.start_polling()
+        if not self._names_read:
+            self.refresh_names()
+        if self._store is not None:
+            await self._store.async_save(self._data_to_save())
+        if restored != live:
+            LOGGER.warning("panel %s connected where %s was expected, reloading",
+                           live.panel_id, restored.panel_id)
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
 
     def get_partitions(self):
         """Return partitions array."""
@@ -174,30 +1004,243 @@ class AlarmHub:
         """Return motion sensors states."""
         return self.alarm.open_sensors
 
-    def listen_event(self, listener):
-        """Add object as listener."""
-        self.alarm.listen_event(listener)
+    def is_zone_open(self, index):
+        """Return whether the zone is open, or None if unknown.
+
+        Zones profiled as inverted report the opposite of the panel.
+        """
+        if self.open_zones_bitmap is None:
+            return None
+        return test_bit(self.open_zones_bitmap ^ self.zone_inverted_mask, index)
+
+    def is_zone_flapping(self, index):
+        """Return whether the zone's state is frozen for flapping."""
+        return bool((self._zone_filter.flapping >> index) & 1)
+
+    def is_partition_armed(self, index):
+        """Return whether the partition is armed, or None if unknown."""
+        return test_bit(self.armed_partitions_bitmap, index)
+
+    def is_partition_triggered(self, index):
+        """Return whether the partition is triggered, or None if unknown."""
+        return test_bit(self.triggered_partitions_bitmap, index)
+
+    def listen_event(self, listener, key=KEY_ALL):
+        """Add object as listener for the state slice identified by key."""
+        self._listeners.setdefault(key, []).append(listener)
 
     def remove_listen_event(self, listener):
-        """Add object as listener."""
-        self.alarm.remove_listen_event(listener)
+        """Remove object from every slice it listens to."""
+        self._batched.pop(listener, None)
+        for key in list(self._listeners):
+            listeners = self._listeners[key]
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                del self._listeners[key]
+
+    def _changed_keys(self, old_open, old_flapping, old_parts, old_trig, old_bypass,
+                      old_status):
+        keys = [KEY_ALL]
+        zones = changed_bits(old_open, self.open_zones_bitmap, self.max_sensors)
+        zones |= old_flapping ^ self._zone_filter.flapping
+        keys += [(KEY_ZONE, i) for i in iter_bits(zones)]
+        partitions = (
+            changed_bits(old_parts, self.armed_partitions_bitmap, self.max_partitions)
+            | changed_bits(old_trig, self.triggered_partitions_bitmap, self.max_partitions)
+        )
+        if partitions:
+            keys.append(KEY_PARTITIONS)
+            keys += [(KEY_PARTITION, i) for i in iter_bits(partitions)]
+        if old_bypass != self.bypassed_zones_bitmap:
+            keys.append(KEY_BYPASS)
+        if old_status != self._general_status:
+            keys.append(KEY_STATUS)
+        return keys
+
+    @callback
+    def alarm_update(self):
+        """Receive an update from AMTAlarm and dispatch only what changed."""
+        started = time.perf_counter()
+        stats = self.stats
+        if self._status_requested is not None:
+            stats.status_rtt.record(started - self._status_requested)
+            self._status_requested = None
+        alarm = self.alarm
+        if isinstance(alarm, IsecNetPanel):
+            # Our own transport keeps the status frame's bitmaps as is.
+            status = alarm.status
+            if status is None:
+                open_zones = armed = triggered = bypassed = None
+            else:
+                open_zones = status.open_zones
+                armed = status.armed_partitions
+                triggered = status.triggered_partitions
+                bypassed = status.bypassed_zones
+        else:
+            open_zones = pack_bits(alarm.open_sensors)
+            armed = pack_bits(alarm.partitions)
+            triggered = pack_bits(alarm.triggered_partitions)
+            bypassed = pack_bits(alarm.bypassed_sensors)
+        if armed is None:
+            if self._link.lost():
+                # Within the grace period the last known state stays up.
+                return
+        else:
+            self._link.alive()
+
+        old = (self.open_zones_bitmap, self._zone_filter.flapping,
+               self.armed_partitions_bitmap, self.triggered_partitions_bitmap,
+               self.bypassed_zones_bitmap, self._general_status)
+        first = not self._has_snapshot
+        self._has_snapshot = True
+        self.armed_partitions_bitmap = armed
+        self.triggered_partitions_bitmap = triggered
+        if bypassed != self.bypassed_zones_bitmap:
+            self.bypassed_zones_bitmap = bypassed
+            self.bypassed_zone_list = list(iter_bits(bypassed or 0))
+        status = alarm.general_status
+        self._general_status = (
+            None if status is None else (status.source_voltage, status.battery_voltage)
+        )
+        zone_filter = self._zone_filter
+        if open_zones is not None and zone_filter.raw is not None:
+            stats.zone_toggles += (open_zones ^ zone_filter.raw).bit_count()
+        zone_filter.update(open_zones, self.hass.loop.time())
+        self.open_zones_bitmap = zone_filter.reported
+        self._schedule_zone_filter()
+
+        keys = list(self._listeners) if first else self._changed_keys(*old)
+        if KEY_STATUS in keys and self._general_status is not None:
+            self._schedule_snapshot_save()
+        if first or all(key in (KEY_ALL, KEY_STATUS) for key in keys):
+            # Voltages drift from reply to reply: only zones, partitions and
+            # bypasses count as activity.
+            self._poller.note_alive()
+        else:
+            self._poller.note_changed()
+
+        if self.open_zones_bitmap is not None:
+            stats.status_received()
+            if old[0] is not None:
+                stats.zone_changes += (old[0] ^ self.open_zones_bitmap).bit_count()
+        stats.decode.record(time.perf_counter() - started)
+        self._notify(keys)
+
+    @callback
+    def _link_down(self):
+        """Show every slice as unknown, once, after the link went down."""
+        old = (self.open_zones_bitmap, self._zone_filter.flapping,
+               self.armed_partitions_bitmap, self.triggered_partitions_bitmap,
+               self.bypassed_zones_bitmap, self._general_status)
+        self._zone_filter.update(None, self.hass.loop.time())
+        self.open_zones_bitmap = None
+        self.armed_partitions_bitmap = None
+        self.triggered_partitions_bitmap = None
+        self.bypassed_zones_bitmap = None
+        self.bypassed_zone_list = []
+        self._general_status = None
+        self._schedule_zone_filter()
+        keys = self._changed_keys(*old)
+        pgms = [i for i, state in enumerate(self.pgm_states) if state is not None]
+        self.pgm_states = [None] * self.pgm_count
+        self._notify([*keys, *((KEY_PGM, i) for i in pgms)])
+
+    @property
+    def link_up(self):
+        """Return whether the panel link is considered up."""
+        return self._link.up
+
+    def _notify(self, keys):
+        """Call alarm_update() on the listeners of keys, or batch them."""
+        started = time.perf_counter()
+        # An entity listening to several changed slices is notified once.
+        notified = self._batched if self.write_batch_window else {}
+        for key in keys:
+            for listener in self._listeners.get(key, ()):
+                notified[listener] = None
+        if not self.write_batch_window:
+            for listener in notified:
+                listener.alarm_update()
+            self.stats.dispatch.record(time.perf_counter() - started)
+        elif notified and self._batch_timer is None:
+            self._batch_timer = self.hass.loop.call_later(
+                self.write_batch_window / 1000, self._flush_batch
+            )
+
+    def _schedule_zone_filter(self):
+        """Point the one zone filter timer at the filter's next deadline."""
+        deadline = self._zone_filter.next_deadline()
+        timer = self._zone_filter_timer
+        if timer is not None and timer.when() == deadline:
+            return
+        if timer is not None:
+            timer.cancel()
+            self._zone_filter_timer = None
+        if deadline is not None:
+            self._zone_filter_timer = self.hass.loop.call_at(
+                deadline, self._zone_filter_expired
+            )
+
+    @callback
+    def _zone_filter_expired(self):
+        """Report the held changes and flapping zones released on time."""
+        self._zone_filter_timer = None
+        old_open, old_flapping = self.open_zones_bitmap, self._zone_filter.flapping
+        self._zone_filter.expire(self.hass.loop.time())
+        self.open_zones_bitmap = self._zone_filter.reported
+        self._schedule_zone_filter()
+        zones = changed_bits(old_open, self.open_zones_bitmap, self.max_sensors)
+        if old_open is not None and self.open_zones_bitmap is not None:
+            self.stats.zone_changes += (old_open ^ self.open_zones_bitmap).bit_count()
+        zones |= old_flapping ^ self._zone_filter.flapping
+        if zones:
+            self._notify([KEY_ALL] + [(KEY_ZONE, i) for i in iter_bits(zones)])
+
+    @callback
+    def _flush_batch(self):
+        """Notify every listener batched during the window, once."""
+        self._batch_timer = None
+        batched, self._batched = self._batched, {}
+        started = time.perf_counter()
+        for listener in batched:
+            listener.alarm_update()
+        self.stats.dispatch.record(time.perf_counter() - started)
+
+    @property
+    def source_voltage(self):
+        """Return the mains voltage, or None if unknown."""
+        return None if self._general_status is None else self._general_status[0]
+
+    @property
+    def battery_voltage(self):
+        """Return the battery voltage, or None if unknown."""
+        return None if self._general_status is None else self._general_status[1]
 
     @property
     def max_sensors(self):
         """Return the maximum number of sensors the platform may have."""
+        if self._snapshot is not None:
+            return self._snapshot["max_sensors"]
         return self.alarm.max_sensors
 
     def is_sensor_configured(self, index):
         """Check if the numbered sensor is configured."""
+        if self._snapshot is not None:
+            return index in self._snapshot["zones"]
         return self.alarm.is_sensor_configured(index)
 
     @property
     def max_partitions(self):
         """Return the maximum number of partitions the platform may have."""
+        if self._snapshot is not None:
+            return self._snapshot["max_partitions"]
         return self.alarm.max_partitions
 
     def is_partition_configured(self, index):
         """Check if the numbered partition is configured."""
+        if self._snapshot is not None:
+            return index in self._snapshot["partitions"]
         return self.alarm.is_partition_configured(index)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -207,20 +1250,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
        password=entry.data["password"]
     system_password = entry.data.get("system_password")
     poll_interval = entry.data.get("isecprogram_poll_interval", 1800)
+    listener = None
+    mac_address = None
+    receptor = None
+    if entry.data.get(CONF_RECEPTOR_HOST):
+        receptor = async_get_receptor(hass, entry.data[CONF_RECEPTOR_HOST], entry.data["port"])
+    elif entry.data.get(CONF_SHARED_LISTENER, False):
+        mac_address = parse_mac(entry.data[CONF_MAC_ADDRESS])
+        listener = await async_get_listener(hass, entry.data["port"])
     LOGGER.debug("instantiating AlarmHub entry")
-    alarm = AlarmHub(hass, entry, entry.data["port"], default_password=password,
-                     system_password=system_password, isecprogram_poll_interval=poll_interval)
+    alarm = AlarmHub(
+        hass, entry, entry.data["port"], default_password=password,
+        system_password=system_password, isecprogram_poll_interval=poll_interval,
+        fast_poll_interval=entry.data.get(CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL),
+        fast_poll_window=entry.data.get(CONF_FAST_POLL_WINDOW, DEFAULT_FAST_POLL_WINDOW),
+        max_poll_interval=entry.data.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+        listener=listener, mac_address=mac_address,
+        write_batch_window=entry.data.get(CONF_WRITE_BATCH_WINDOW, DEFAULT_WRITE_BATCH_WINDOW),
+        receptor=receptor, account=entry.data.get(CONF_ACCOUNT),
+        panel_host=entry.data.get(CONF_PANEL_HOST) or None,
+        pgm_count=entry.data.get(CONF_PGM_COUNT, DEFAULT_PGM_COUNT),
+        partition_count=entry.data.get(CONF_PARTITION_COUNT) or DEFAULT_PARTITION_COUNT,
+    )
     entry.runtime_data = alarm
+    entry.async_on_unload(entry.add_update_listener(async_update_listener))
 
     try:
-        await alarm.wait_connection_and_update()
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        if await alarm.async_restore_snapshot():
+            # Entities come up from the stored snapshot right away and
+            # reconcile once the panel dials in.
+            await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+            entry.async_create_background_task(
+                hass, alarm.async_connect(), f"{DOMAIN} connect {entry.entry_id}"
+            )
+        else:
+            await alarm.async_connect()
+            await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     except Exception:
         alarm.close()
         raise
 
     return True
 
+async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply updated entry data to the running hub."""
+    hub = entry.runtime_data
+    hub.compile_modes()
+    hub.compile_zone_profiles()
+    hub.compile_bypass_presets()
+    hub.compile_configured_zones()
+    hub.check_configured_zones()
+    hub.write_batch_window = entry.data.get(CONF_WRITE_BATCH_WINDOW, DEFAULT_WRITE_BATCH_WINDOW)
+    hub.configure_polling(
+        entry.data.get(CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL),
+        entry.data.get(CONF_FAST_POLL_WINDOW, DEFAULT_FAST_POLL_WINDOW),
+        entry.data.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+    )
+    keys = RELOAD_SETTINGS + (V2_RELOAD_SETTINGS if hub.settings[CONF_PANEL_HOST] else ())
+    changed = [key for key in keys if entry.data.get(key) != hub.settings[key]]
+    if changed:
+        # The panel client, poller and switch entities are built at setup.
+        LOGGER.debug("reloading after %s changed", ", ".join(changed))
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
 def setup_platform(hass, config, add_entities, discovery_info=None):
     """Set up the alarm platform."""
     LOGGER.debug("setup_platform")
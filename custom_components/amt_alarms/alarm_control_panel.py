@@ -6,10 +6,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     STATE_UNAVAILABLE,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelEntity,
@@ -20,20 +20,15 @@ from homeassistant.components.alarm_control_panel import (
 
 import voluptuous as vol
 
-from . import AlarmHub
+from . import KEY_BYPASS, KEY_NAMES, KEY_PARTITION, KEY_PARTITIONS, AlarmHub
 from .const import (
     CONF_AWAY_MODE_ENABLED,
-    CONF_AWAY_PARTITION_LIST,
     CONF_HOME_MODE_ENABLED,
-    CONF_HOME_PARTITION_LIST,
-    CONF_NIGHT_PARTITION_LIST,
     DOMAIN,
     LOGGER,
 )
 
-from .schema import partition_none, partition_on
-
-UNAVAILABLE_GRACE_SECONDS = 30
+from .schema import partition_none
 
 SERVICE_BYPASS_ZONE = "bypass_zone"
 ATTR_ZONES = "zones"
@@ -42,6 +37,17 @@ SERVICE_SILENT_TRIGGER = "alarm_silent_trigger"
 SERVICE_AUDIBLE_TRIGGER = "alarm_audible_trigger"
 SERVICE_MEDICAL_TRIGGER = "alarm_medical_trigger"
 SERVICE_FIRE_TRIGGER = "alarm_fire_trigger"
+SERVICE_GET_EVENTS = "get_events"
+ATTR_LIMIT = "limit"
+
+def _raise_on_failures(action, results):
+    """Raise if the hub reported a failure for any partition."""
+    failed = {i: error for i, error in results.items() if error is not None}
+    if failed:
+        raise HomeAssistantError(
+            f"Failed to {action} partition(s) "
+            + ", ".join(f"{i + 1} ({error})" for i, error in sorted(failed.items()))
+        )
 
 def setup_platform(hass, config, add_entities, discovery_info=None):
     """Set up the alarm platform."""
@@ -90,6 +96,12 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
         {vol.Optional(ATTR_CODE): cv.string},
         SERVICE_FIRE_TRIGGER,
     )
+    platform.async_register_entity_service(
+        SERVICE_GET_EVENTS,
+        {vol.Optional(ATTR_LIMIT): cv.positive_int},
+        "get_events",
+        supports_response=SupportsResponse.ONLY,
+    )
 
     hass.helpers.discovery.load_platform('binary_sensor', DOMAIN, {}, config)
 
@@ -136,6 +148,12 @@ async def async_setup_entry(
         {vol.Optional(ATTR_CODE): cv.string},
         SERVICE_FIRE_TRIGGER,
     )
+    platform.async_register_entity_service(
+        SERVICE_GET_EVENTS,
+        {vol.Optional(ATTR_LIMIT): cv.positive_int},
+        "get_events",
+        supports_response=SupportsResponse.ONLY,
+    )
 
     return True
 
@@ -153,9 +171,19 @@ class AlarmPanel(AlarmControlPanelEntity):
         """Initialize the alarm."""
         LOGGER.debug("AlarmPanel instantiation")
         self._internal_state = STATE_UNAVAILABLE
-        self._unavailable_unsub = None
+        self._bypassed = None
         self._by = "Felipe"
         self.hub = hub
+        identity = hub.identity
+        self._attr_unique_id = identity.panel_unique_id
+        self._attr_name = identity.model
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._attr_unique_id)},
+            "name": self._attr_name,
+            "manufacturer": "Intelbras",
+            "model": identity.model + " control panel",
+            "sw_version": "Unknown",
+        }
         supported_features = AlarmControlPanelEntityFeature(0)
         if self.hub.config_entry.data[CONF_HOME_MODE_ENABLED]:
             supported_features = (supported_features | AlarmControlPanelEntityFeature.ARM_HOME)
@@ -176,47 +204,48 @@ class AlarmPanel(AlarmControlPanelEntity):
 
     async def async_alarm_arm_night(self, code=None):
         """Send arm night command."""
-        await self.hub.async_alarm_arm_night(code)
+        _raise_on_failures("arm", await self.hub.async_alarm_arm_night(code))
 
     async def async_alarm_arm_home(self, code=None):
         """Send arm home command."""
-        await self.hub.async_alarm_arm_home(code)
+        _raise_on_failures("arm", await self.hub.async_alarm_arm_home(code))
 
     async def async_alarm_arm_away(self, code=None):
         """Send arm away command."""
-        await self.hub.async_alarm_arm_away(code)
+        _raise_on_failures("arm", await self.hub.async_alarm_arm_away(code))
 
     async def async_alarm_trigger(self, code=None):
         """Send arm away command."""
-        await self.hub.alarm.send_audible_trigger(code)
+        await self.hub.async_alarm_audible_trigger(code)
 
     async def async_added_to_hass(self):
         """Entity was added to Home Assistant."""
-        self.hub.listen_event(self)
+        self.hub.listen_event(self, KEY_PARTITIONS)
+        # The bypassed_zones attribute follows the bypass bitmap.
+        self.hub.listen_event(self, KEY_BYPASS)
 
     async def async_will_remove_from_hass(self):
         """Entity was added to Home Assistant."""
-        self._cancel_unavailable_timer()
         self.hub.remove_listen_event(self)
 
     async def alarm_silent_trigger(self, code: None | str = None):
         """Silent trigger alarm in the alarm system."""
-        await self.hub.alarm.send_silent_trigger(code)
+        await self.hub.async_alarm_silent_trigger(code)
         return True
 
     async def alarm_audible_trigger(self, code: None | str = None):
         """Audible trigger alarm in the alarm system."""
-        await self.hub.alarm.send_audible_trigger(code)
+        await self.hub.async_alarm_audible_trigger(code)
         return True
 
     async def alarm_medical_trigger(self, code: None | str = None):
         """Audible trigger alarm in the alarm system."""
-        await self.hub.alarm.send_medical_trigger(code)
+        await self.hub.async_alarm_medical_trigger(code)
         return True
 
     async def alarm_fire_trigger(self, code: None | str = None):
         """Audible trigger alarm in the alarm system."""
-        await self.hub.alarm.send_fire_trigger(code)
+        await self.hub.async_alarm_fire_trigger(code)
         return True
 
     async def alarm_bypass(self, code: None | str = None, zones = None):
@@ -224,10 +253,17 @@ class AlarmPanel(AlarmControlPanelEntity):
         if zones is None:
             LOGGER.warning("No zones specified for bypass")
             return False
-        
-        await self.hub.alarm.send_bypass(zones, code)
+        try:
+            mask = self.hub.resolve_bypass_zones(zones)
+        except ValueError as err:
+            raise HomeAssistantError(f"Invalid bypass zones: {err}") from err
+        await self.hub.async_alarm_bypass(mask, code)
         return True
 
+    async def get_events(self, limit=None):
+        """Return the panel's recent Contact ID events."""
+        return {"events": self.hub.get_events(limit)}
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
@@ -235,47 +271,21 @@ class AlarmPanel(AlarmControlPanelEntity):
         if attributes is None:
             attributes = {}
         
-        bypassed_zones = []
-        for i in range(self.hub.alarm.max_sensors):
-            if self.hub.alarm.bypassed_sensors[i]:
-                bypassed_zones += [i]
-
         attributes.update({
-            "bypassed_zones": bypassed_zones,
+            "bypassed_zones": self.hub.bypassed_zone_list,
         })
         return attributes
 
     @property
     def available_zones(self):
         """Return a list of available zones."""
-        return list(range(self.hub.alarm.max_sensors))
-
-    @property
-    def unique_id(self):
-        """Return the unique id for the sync module."""
-        return self.hub.alarm.model + "_" + self.hub.alarm._mac_address.hex() + "_alarm_panel"
-
-    @property
-    def name(self):
-        """Return the name of the panel."""
-        return self.hub.alarm.model
+        return list(range(self.hub.max_sensors))
 
     @property
     def changed_by(self):
         """Last change triggered by."""
         return self._by
 
-    @property
-    def device_info(self):
-        """Return device information for this Entity."""
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
-            "manufacturer": "Intelbras",
-            "model": self.hub.alarm.model + " control panel",
-            "sw_version": "Unknown",
-        }
-
     @property
     def device_state_attributes(self):
         """Return the state attributes."""
@@ -285,70 +295,46 @@ class AlarmPanel(AlarmControlPanelEntity):
     def alarm_state(self) -> AlarmControlPanelState | None:
         return self._internal_state
 
-    def _is_armed_mode(self, partitions, mode_list):
-        has_any_partition = False
-        for i in range(self.hub.max_partitions):
-            if mode_list[i] in self.hub.config_entry.data:
-                value = self.hub.config_entry.data[mode_list[i]]
-                if value == partition_on:
-                    has_any_partition = True
-                    if not partitions[i]:
-                        return False
-        return has_any_partition
+    @staticmethod
+    def _is_armed_mode(partitions, mask):
+        return mask != 0 and partitions & mask == mask
 
     def _compute_raw_state(self):
-        partitions = self.hub.get_partitions()
-        triggered_partitions = self.hub.get_triggered_partitions()
-        if None in partitions:
+        partitions = self.hub.armed_partitions_bitmap
+        if partitions is None:
             return STATE_UNAVAILABLE
-        if True in triggered_partitions:
+        if self.hub.triggered_partitions_bitmap:
             return AlarmControlPanelState.TRIGGERED
-        if not any(partitions):
+        if not partitions:
             return AlarmControlPanelState.DISARMED
-        if self._is_armed_mode(partitions, CONF_NIGHT_PARTITION_LIST):
+        if self._is_armed_mode(partitions, self.hub.night_mask):
             return AlarmControlPanelState.ARMED_NIGHT
-        if self._is_armed_mode(partitions, CONF_AWAY_PARTITION_LIST):
+        if self._is_armed_mode(partitions, self.hub.away_mask):
             return AlarmControlPanelState.ARMED_AWAY
-        if self._is_armed_mode(partitions, CONF_HOME_PARTITION_LIST):
+        if self._is_armed_mode(partitions, self.hub.home_mask):
             return AlarmControlPanelState.ARMED_HOME
         return self._internal_state
 
     def update_state(self):
-        """Update synchronously to current state (used at setup)."""
-        old_state = self._internal_state
+        """Update synchronously to current state."""
+        old = (self._internal_state, self._bypassed)
         self._internal_state = self._compute_raw_state()
-        return self._internal_state != old_state
-
-    def _cancel_unavailable_timer(self):
-        if self._unavailable_unsub is not None:
-            self._unavailable_unsub()
-            self._unavailable_unsub = None
-
-    @callback
-    def _async_apply_unavailable(self, _now):
-        self._unavailable_unsub = None
-        if None in self.hub.get_partitions() and self._internal_state != STATE_UNAVAILABLE:
-            self._internal_state = STATE_UNAVAILABLE
-            self.async_write_ha_state()
+        self._bypassed = self.hub.bypassed_zones_bitmap
+        return (self._internal_state, self._bypassed) != old
 
     @callback
     def alarm_update(self):
-        """Receive callback to update state from Hub, debouncing unavailable."""
-        raw_state = self._compute_raw_state()
-        if raw_state == STATE_UNAVAILABLE and self._internal_state != STATE_UNAVAILABLE:
-            if self._unavailable_unsub is None:
-                self._unavailable_unsub = async_call_later(
-                    self.hass, UNAVAILABLE_GRACE_SECONDS, self._async_apply_unavailable
-                )
-            return
-        self._cancel_unavailable_timer()
-        if raw_state != self._internal_state:
-            self._internal_state = raw_state
+        """Receive callback to update state from Hub.
+
+        The hub keeps the last known state through brief link losses, so
+        unavailable is written as soon as it is reported.
+        """
+        if self.update_state():
             self.async_write_ha_state()
 
     async def async_alarm_disarm(self, code=None):
         """Send disarm command."""
-        await self.hub.async_alarm_disarm(code)
+        _raise_on_failures("disarm", await self.hub.async_alarm_disarm(code))
 
 
 class PartitionAlarmPanel(AlarmControlPanelEntity):
@@ -360,9 +346,20 @@ class PartitionAlarmPanel(AlarmControlPanelEntity):
         """Initialize the alarm."""
         self.index = index
         self._internal_state = STATE_UNAVAILABLE
-        self._unavailable_unsub = None
         self._by = "Felipe"
         self.hub = hub
+        identity = hub.identity
+        self.panel_unique_id = identity.panel_unique_id
+        self._attr_unique_id = identity.unique_id(f"partition_{index + 1}_alarm_panel")
+        self._attr_name = self._partition_label()
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._attr_unique_id)},
+            "name": self._attr_name,
+            "manufacturer": "Intelbras",
+            "model": identity.model + " partition control panel",
+            "sw_version": "Unknown",
+            "via_device": (DOMAIN, self.panel_unique_id),
+        }
         supported_features = AlarmControlPanelEntityFeature(0)
         if self.hub.config_entry.data[CONF_HOME_MODE_ENABLED]:
             supported_features = (supported_features | AlarmControlPanelEntityFeature.ARM_HOME)
@@ -382,57 +379,49 @@ class PartitionAlarmPanel(AlarmControlPanelEntity):
 
     async def async_alarm_arm_night(self, code=None):
         """Send arm partition command."""
-        await self.hub.alarm.send_arm_partition(self.index, code)
+        await self.hub.async_alarm_arm_partition(self.index, code)
 
     async def async_alarm_arm_away(self, code=None):
         """Send arm partition command."""
-        await self.hub.alarm.send_arm_partition(self.index, code)
+        await self.hub.async_alarm_arm_partition(self.index, code)
 
     async def async_alarm_arm_home(self, code=None):
         """Send arm partition command."""
-        await self.hub.alarm.send_arm_partition(self.index, code)
+        await self.hub.async_alarm_arm_partition(self.index, code)
 
     async def async_added_to_hass(self):
         """Entity was added to Home Assistant."""
-        self.hub.listen_event(self)
+        self.hub.listen_event(self, (KEY_PARTITION, self.index))
+        self.hub.listen_event(self, KEY_NAMES)
 
     async def async_will_remove_from_hass(self):
         """Entity was added to Home Assistant."""
-        self._cancel_unavailable_timer()
         self.hub.remove_listen_event(self)
 
-    @property
-    def panel_unique_id(self):
-        """Return the unique id for the sync module."""
-        return self.hub.alarm.model + "_" + self.hub.alarm._mac_address.hex() + "_alarm_panel"
+    def _partition_label(self):
+        model = self.hub.identity.model
+        name = self.hub.partition_names.get(self.index)
+        if name:
+            return f"{model} {name}"
+        return f"{model} Partition {self.index + 1}"
 
-    @property
-    def unique_id(self):
-        """Return the unique id for the sync module."""
-        return self.hub.alarm.model + "_" + self.hub.alarm._mac_address.hex() + "_partition_" + str(self.index+1) + "_alarm_panel"
+    @callback
+    def names_updated(self):
+        """Rename the entity after the hub read the partition names again."""
+        name = self._partition_label()
+        if name != self._attr_name:
+            self._attr_name = name
+            self.async_write_ha_state()
 
-    @property
-    def name(self):
-        """Return the name of the panel."""
-        return self.hub.alarm.model + " Partition " + str(self.index+1)
+    async def get_events(self, limit=None):
+        """Return the recent Contact ID events of this partition."""
+        return {"events": self.hub.get_events(limit, partition=self.index + 1)}
 
     @property
     def changed_by(self):
         """Last change triggered by."""
         return self._by
 
-    @property
-    def device_info(self):
-        """Return device information for this Entity."""
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
-            "manufacturer": "Intelbras",
-            "model": self.hub.alarm.model + " partition control panel",
-            "sw_version": "Unknown",
-            "via_device": (DOMAIN, self.panel_unique_id),
-        }
-
     @property
     def device_state_attributes(self):
         """Return the state attributes."""
@@ -443,49 +432,30 @@ class PartitionAlarmPanel(AlarmControlPanelEntity):
         return self._internal_state
 
     def _compute_raw_state(self):
-        partitions = self.hub.get_partitions()
-        triggered_partitions = self.hub.get_triggered_partitions()
-        if None in partitions:
+        if self.hub.armed_partitions_bitmap is None:
             return STATE_UNAVAILABLE
-        if triggered_partitions[self.index]:
+        if self.hub.is_partition_triggered(self.index):
             return AlarmControlPanelState.TRIGGERED
-        if partitions[self.index]:
+        if self.hub.is_partition_armed(self.index):
             return AlarmControlPanelState.ARMED_NIGHT
         return AlarmControlPanelState.DISARMED
 
     def update_state(self):
-        """Update synchronously to current state (used at setup)."""
+        """Update synchronously to current state."""
         old_state = self._internal_state
         self._internal_state = self._compute_raw_state()
         return self._internal_state != old_state
 
-    def _cancel_unavailable_timer(self):
-        if self._unavailable_unsub is not None:
-            self._unavailable_unsub()
-            self._unavailable_unsub = None
-
-    @callback
-    def _async_apply_unavailable(self, _now):
-        self._unavailable_unsub = None
-        if None in self.hub.get_partitions() and self._internal_state != STATE_UNAVAILABLE:
-            self._internal_state = STATE_UNAVAILABLE
-            self.async_write_ha_state()
-
     @callback
     def alarm_update(self):
-        """Receive callback to update state from Hub, debouncing unavailable."""
-        raw_state = self._compute_raw_state()
-        if raw_state == STATE_UNAVAILABLE and self._internal_state != STATE_UNAVAILABLE:
-            if self._unavailable_unsub is None:
-                self._unavailable_unsub = async_call_later(
-                    self.hass, UNAVAILABLE_GRACE_SECONDS, self._async_apply_unavailable
-                )
-            return
-        self._cancel_unavailable_timer()
-        if raw_state != self._internal_state:
-            self._internal_state = raw_state
+        """Receive callback to update state from Hub.
+
+        The hub keeps the last known state through brief link losses, so
+        unavailable is written as soon as it is reported.
+        """
+        if self.update_state():
             self.async_write_ha_state()
 
     async def async_alarm_disarm(self, code=None):
         """Send disarm command."""
-        await self.hub.alarm.send_disarm_partition(self.index, code)
+        await self.hub.async_alarm_disarm_partition(self.index, code)
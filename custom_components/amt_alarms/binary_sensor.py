@@ -7,10 +7,14 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
+from . import KEY_NAMES, KEY_STATUS, KEY_ZONE
 from .const import (
     DOMAIN,
     LOGGER,
+    SIGNAL_ZONES_CHANGED,
 )
 
 def setup_platform(hass, config, add_entities, discovery_info=None):
@@ -33,10 +37,10 @@ async def async_setup_entry(
     """Set up Intelbras AMT Alarm sensors from a config entry."""
     hub = entry.runtime_data
 
-    sensors = []
-    for i in range(hub.max_sensors):
-        if hub.is_sensor_configured(i):
-            sensors += [AlarmSensor(i, hub)]
+    zones = {
+        i: AlarmSensor(i, hub) for i in range(hub.max_sensors) if hub.is_sensor_configured(i)
+    }
+    sensors = list(zones.values())
 
     if hub.alarm.system_password is not None:
         sensors += [AlarmACPowerSensor(hub)]
@@ -47,13 +51,43 @@ async def async_setup_entry(
 
     async_add_entities(sensors)
 
+    @callback
+    def zones_changed(added, removed):
+        """Add and remove only the zone sensors that changed on the panel."""
+        new = []
+        for i in added:
+            if i not in zones:
+                zones[i] = AlarmSensor(i, hub)
+                zones[i].update_state()
+                new.append(zones[i])
+        if new:
+            async_add_entities(new)
+        registry = er.async_get(hass)
+        for i in removed:
+            sensor = zones.pop(i, None)
+            if sensor is None:
+                continue
+            if sensor.registry_entry is not None:
+                registry.async_remove(sensor.entity_id)
+            else:
+                hass.async_create_task(sensor.async_remove())
+
+    entry.async_on_unload(async_dispatcher_connect(
+        hass, SIGNAL_ZONES_CHANGED.format(entry.entry_id), zones_changed
+    ))
+
     # try:
     # except
     return True
 
 
 class AlarmSensor(BinarySensorEntity):
-    """Representation of a infra-red motion sensor."""
+    """Representation of a zone, presented as its zone profile says.
+
+    The device class and inversion come from the hub's compiled zone
+    profiles, and changes arrive already debounced by the hub's zone
+    filter; without a profile the zone is a motion sensor.
+    """
 
     def __init__(self, index, hub):
         """Initialize motion sensor entity representation."""
@@ -61,25 +95,29 @@ class AlarmSensor(BinarySensorEntity):
         #print("AlarmSensor instantiation")
         self.__index = index
         self.hub = hub
-        self._name = self.hub.alarm.model + " Motion Sensor " + str(self.__index+1)
-        self._unique_id = self.hub.alarm.model + "_" + self.hub.alarm._mac_address.hex() + "_motion_" + str(self.__index+1)
-        self._state = STATE_UNAVAILABLE
-
-    @property
-    def device_info(self):
-        """Return device information for this Entity."""
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
+        identity = hub.identity
+        self.panel_unique_id = identity.panel_unique_id
+        self._attr_name = self._zone_label()
+        self._attr_unique_id = identity.unique_id(f"motion_{index + 1}")
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._attr_unique_id)},
+            "name": self._attr_name,
             "sw_version": "Unknown",
             "via_device": (DOMAIN, self.panel_unique_id),
         }
+        self._state = STATE_UNAVAILABLE
+        self._flapping = False
 
     @property
     def device_state_attributes(self):
         """Return the state attributes."""
         return {"device_id": self.unique_id}
 
+    @property
+    def extra_state_attributes(self):
+        """Return whether the zone's state is frozen for flapping."""
+        return {"flapping": self._flapping}
+
     @property
     def should_poll(self):
         """Declare this Entity as Push."""
@@ -88,27 +126,28 @@ class AlarmSensor(BinarySensorEntity):
     async def async_added_to_hass(self):
         """Entity was added to Home Assistant."""
         # print ("Binary Sensor is calling listen event (not async)", file=sys.stderr)
-        self.hub.listen_event(self)
+        self.hub.listen_event(self, (KEY_ZONE, self.__index))
+        self.hub.listen_event(self, KEY_NAMES)
 
     async def async_will_remove_from_hass(self):
         """Entity was added to Home Assistant."""
         # print ("Binary Sensor is calling REMOVE listen event", file=sys.stderr)
         self.hub.remove_listen_event(self)
 
-    @property
-    def name(self):
-        """Return the name of the binary sensor, if any."""
-        return self._name
-
-    @property
-    def panel_unique_id(self):
-        """Return the unique id for the sync module."""
-        return self.hub.alarm.model + "_" + self.hub.alarm._mac_address.hex() + "_alarm_panel"
+    def _zone_label(self):
+        model = self.hub.identity.model
+        name = self.hub.zone_names.get(self.__index)
+        if name:
+            return f"{model} {name}"
+        return f"{model} Motion Sensor {self.__index + 1}"
 
-    @property
-    def unique_id(self):
-        """Return the unique id for the sync module."""
-        return self._unique_id
+    @callback
+    def names_updated(self):
+        """Rename the entity after the hub read the zone names again."""
+        name = self._zone_label()
+        if name != self._attr_name:
+            self._attr_name = name
+            self.async_write_ha_state()
 
     @property
     def is_on(self):
@@ -123,9 +162,9 @@ class AlarmSensor(BinarySensorEntity):
     def update_state(self):
         """Update synchronously to current state."""
         old_state = self._state
-        open_sensors = self.hub.get_open_sensors()
-        st = open_sensors[self.__index]
-        # print ("Binary sensor data is ", open_sensors, " and st is ", st, file=sys.stderr)
+        old_flapping = self._flapping
+        self._flapping = self.hub.is_zone_flapping(self.__index)
+        st = self.hub.is_zone_open(self.__index)
         if st is None:
             self._state = STATE_UNAVAILABLE
         elif st is True:
@@ -133,7 +172,7 @@ class AlarmSensor(BinarySensorEntity):
         else:
             self._state = STATE_OFF
         # print ("Binary Sensor state is ", self._state, file=sys.stderr)
-        return self._state != old_state
+        return self._state != old_state or self._flapping != old_flapping
 
     @callback
     def alarm_update(self):
@@ -142,10 +181,16 @@ class AlarmSensor(BinarySensorEntity):
         if self.update_state():
             self.async_write_ha_state()
 
+    @callback
+    def profile_updated(self):
+        """Apply the zone profile after the entry was updated."""
+        self.update_state()
+        self.async_write_ha_state()
+
     @property
     def device_class(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return BinarySensorDeviceClass.MOTION
+        """Return the class of this device, from the zone profile."""
+        return self.hub.zone_device_classes[self.__index]
 
 
 class AlarmACPowerSensor(BinarySensorEntity):
@@ -156,33 +201,19 @@ class AlarmACPowerSensor(BinarySensorEntity):
 
     def __init__(self, hub):
         self.hub = hub
-        self._name = self.hub.alarm.model + " Rede AC"
-        self._unique_id = (self.hub.alarm.model + "_"
-                           + self.hub.alarm._mac_address.hex() + "_ac_power")
-        self._state = STATE_UNAVAILABLE
-
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def unique_id(self):
-        return self._unique_id
-
-    @property
-    def panel_unique_id(self):
-        return self.hub.alarm.model + "_" + self.hub.alarm._mac_address.hex() + "_alarm_panel"
-
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
+        identity = hub.identity
+        self.panel_unique_id = identity.panel_unique_id
+        self._attr_name = identity.model + " Rede AC"
+        self._attr_unique_id = identity.unique_id("ac_power")
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._attr_unique_id)},
+            "name": self._attr_name,
             "via_device": (DOMAIN, self.panel_unique_id),
         }
+        self._state = STATE_UNAVAILABLE
 
     async def async_added_to_hass(self):
-        self.hub.listen_event(self)
+        self.hub.listen_event(self, KEY_STATUS)
 
     async def async_will_remove_from_hass(self):
         self.hub.remove_listen_event(self)
@@ -197,10 +228,10 @@ class AlarmACPowerSensor(BinarySensorEntity):
 
     def update_state(self):
         old_state = self._state
-        gs = self.hub.alarm.general_status
-        if gs is None:
+        voltage = self.hub.source_voltage
+        if voltage is None:
             self._state = STATE_UNAVAILABLE
-        elif gs.source_voltage > 5.0:
+        elif voltage > 5.0:
             self._state = STATE_ON
         else:
             self._state = STATE_OFF
@@ -0,0 +1,51 @@
+"""Integer bitmaps for AMT zone and partition state.
+
+The ISEC Mobile status response carries zones and partitions as bit
+fields (bit 0 = zone/partition 1).  Keeping them as Python ints lets the
+hub detect changes with a single XOR and answer per-zone queries with a
+shift instead of walking lists.  ``None`` stands for "unknown", which is
+what the panel reports while it is disconnected.
+"""
+
+
+def pack_bits(values):
+    """Pack a sequence of True/False/None into an int bitmap.
+
+    Returns None if any value is unknown.
+    """
+    mask = 0
+    bit = 1
+    for value in values:
+        if value is None:
+            return None
+        if value:
+            mask |= bit
+        bit <<= 1
+    return mask
+
+
+def test_bit(mask, index):
+    """Return whether bit index is set, or None if the bitmap is unknown."""
+    if mask is None:
+        return None
+    return bool((mask >> index) & 1)
+
+
+def iter_bits(mask):
+    """Yield the index of every set bit, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def changed_bits(old, new, width):
+    """Return the bits that differ between two bitmaps of width bits.
+
+    A transition from or to unknown marks every bit as changed.
+    """
+    if old == new:
+        return 0
+    if old is None or new is None:
+        return (1 << width) - 1
+    return old ^ new
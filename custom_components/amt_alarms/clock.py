@@ -0,0 +1,122 @@
+"""Panel clock tracking from timestamped Contact ID events.
+
+The panel stamps 0xB4 events with its own clock.  An event can only be
+received after it happened, so ``received - panel time`` is at least
+minus the panel's offset, and the smallest such lag in a period is the
+best estimate of the offset: events delivered promptly pin it, events
+that waited in the panel's buffer only add to it.  The minimum is kept
+per hour, and the drift is the least-squares slope of the hourly
+offsets.
+
+Nothing is learned until a date/time exchange has set the panel's clock,
+or the estimate was restored from storage: before that the first event
+could be backlog, and its lag would be taken for the offset.  Hours are
+keyed by our clock, so panel timestamps are converted in two steps.
+
+Times are POSIX timestamps.  No Home Assistant imports.
+"""
+from collections import deque
+
+BUCKET_SECONDS = 3600
+MAX_BUCKETS = 48
+# An event whose corrected time is this much older than its arrival
+# was held back by the panel, typically during a link outage.
+BACKLOG_LAG = 30
+
+
+class PanelClock:
+    """Offset and drift of one panel's clock against Home Assistant's."""
+
+    def __init__(self):
+        """Initialize with nothing known."""
+        self.synced_at = None
+        # [bucket start, smallest lag seen in the bucket]
+        self._buckets: deque = deque(maxlen=MAX_BUCKETS)
+
+    def synced(self, now):
+        """Record that the panel's clock was just set to ours."""
+        self.synced_at = now
+        self._buckets.clear()
+        self._buckets.append([now, 0.0])
+
+    def observe(self, panel_time, received):
+        """Record one timestamped event; return whether an hour was opened.
+
+        Events that are obviously backlog do not open a new bucket, so an
+        hour without live events cannot skew the estimate.
+        """
+        if self.synced_at is None:
+            return False
+        lag = received - panel_time
+        last = self._buckets[-1]
+        if received - last[0] < BUCKET_SECONDS:
+            last[1] = min(last[1], lag)
+            return False
+        if (lag + self.offset_at(received) > BACKLOG_LAG
+                and received - last[0] < 2 * BUCKET_SECONDS):
+            # Backlog, unless nothing else came for a whole hour:
+            # then the panel's clock was set back.
+            return False
+        self._buckets.append([received, lag])
+        return True
+
+    @property
+    def offset(self):
+        """Return how far the panel's clock is ahead of ours, or None."""
+        if not self._buckets:
+            return None
+        return -self._buckets[-1][1]
+
+    @property
+    def drift(self):
+        """Return the drift in seconds per day, or None with under 2 hours known."""
+        if len(self._buckets) < 2:
+            return None
+        count = len(self._buckets)
+        mean_t = sum(start for start, _ in self._buckets) / count
+        mean_o = sum(-lag for _, lag in self._buckets) / count
+        num = sum((start - mean_t) * (-lag - mean_o) for start, lag in self._buckets)
+        den = sum((start - mean_t) ** 2 for start, _ in self._buckets)
+        return num / den * 86400 if den else None
+
+    def offset_at(self, when):
+        """Return the estimated offset at when, our time; 0 if nothing is known."""
+        if not self._buckets:
+            return 0.0
+        for start, lag in reversed(self._buckets):
+            if start <= when:
+                break
+        drift = self.drift
+        return -lag + (drift / 86400 * (when - start) if drift else 0.0)
+
+    def to_local(self, panel_time, received):
+        """Return the Home Assistant time of a panel timestamp received at received."""
+        # Start from the offset on arrival, then take the one for the hour
+        # the event happened in.
+        approx = panel_time - self.offset_at(received)
+        return panel_time - self.offset_at(approx)
+
+    def is_backlog(self, panel_time, received):
+        """Return whether an event reached us long after it happened."""
+        return received - self.to_local(panel_time, received) > BACKLOG_LAG
+
+    def as_state(self):
+        """Return the estimate for storage."""
+        return {"synced_at": self.synced_at, "buckets": [list(b) for b in self._buckets]}
+
+    def restore(self, state):
+        """Continue from an estimate returned by as_state."""
+        if not state or state.get("synced_at") is None or not state.get("buckets"):
+            return
+        self.synced_at = state["synced_at"]
+        self._buckets.clear()
+        self._buckets.extend([start, lag] for start, lag in state["buckets"])
+
+    def as_dict(self):
+        """Return a JSON-serialisable summary."""
+        return {
+            "offset_s": self.offset,
+            "drift_s_per_day": self.drift,
+            "synced_at": self.synced_at,
+            "hours_observed": len(self._buckets),
+        }
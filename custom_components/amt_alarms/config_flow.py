@@ -1,4 +1,5 @@
 """Config flow for Intelbras AMT Alarms integration."""
+import asyncio
 import logging
 
 import voluptuous as vol
@@ -6,30 +7,54 @@ import voluptuous as vol
 from homeassistant import config_entries, core, exceptions
 from homeassistant.helpers import config_validation as cv
 
-from . import AlarmHub
 from .const import (
+    CONF_ACCOUNT,
     CONF_AWAY_MODE_ENABLED,
     CONF_AWAY_PARTITION_1,
     CONF_AWAY_PARTITION_2,
     CONF_AWAY_PARTITION_3,
     CONF_AWAY_PARTITION_4,
+    CONF_BYPASS_PRESETS,
+    CONF_CONFIGURED_ZONES,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_FAST_POLL_WINDOW,
     CONF_HOME_MODE_ENABLED,
     CONF_HOME_PARTITION_1,
     CONF_HOME_PARTITION_2,
     CONF_HOME_PARTITION_3,
     CONF_HOME_PARTITION_4,
     CONF_ISECPROGRAM_POLL_INTERVAL,
+    CONF_MAC_ADDRESS,
+    CONF_MAX_POLL_INTERVAL,
     CONF_NIGHT_PARTITION_1,
     CONF_NIGHT_PARTITION_2,
     CONF_NIGHT_PARTITION_3,
     CONF_NIGHT_PARTITION_4,
+    CONF_PANEL_HOST,
+    CONF_PARTITION_COUNT,
     CONF_PASSWORD,
+    CONF_PGM_COUNT,
     CONF_PORT,
+    CONF_PROBE_TIMEOUT,
+    CONF_RECEPTOR_HOST,
+    CONF_SHARED_LISTENER,
     CONF_SYSTEM_PASSWORD,
+    CONF_WRITE_BATCH_WINDOW,
+    CONF_ZONE_PROFILES,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_FAST_POLL_WINDOW,
     DEFAULT_ISECPROGRAM_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_PGM_COUNT,
+    DEFAULT_PROBE_TIMEOUT,
+    DEFAULT_WRITE_BATCH_WINDOW,
     DOMAIN,  # PARTITION_LIST,; pylint:disable=unused-import
 )
-
+from .isecnet import MAX_ZONES, IsecNetError, parse_mac
+from .isecnet_v2 import MAX_ZONES as V2_MAX_ZONES
+from .listener import async_probe_panel
+from .panel_v2 import async_probe_v2_panel
+from .zones import parse_bypass_presets, parse_zone_profiles, parse_zones
 from .schema import (
     user_schema, night_partition_schema,
     away_mode_partition_schema,
@@ -46,10 +71,91 @@ DATA_SCHEMA = vol.All(
 )
 
 
-async def validate_user_input(hass: core.HomeAssistant, data):
+def user_config(user_input):
+    """Return the user step settings stored in the config entry."""
+    return {
+        CONF_PORT: user_input[CONF_PORT],
+        CONF_PASSWORD: user_input[CONF_PASSWORD],
+        CONF_SYSTEM_PASSWORD: user_input.get(CONF_SYSTEM_PASSWORD),
+        CONF_ISECPROGRAM_POLL_INTERVAL: user_input.get(
+            CONF_ISECPROGRAM_POLL_INTERVAL, DEFAULT_ISECPROGRAM_POLL_INTERVAL),
+        CONF_FAST_POLL_INTERVAL: user_input.get(
+            CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL),
+        CONF_FAST_POLL_WINDOW: user_input.get(
+            CONF_FAST_POLL_WINDOW, DEFAULT_FAST_POLL_WINDOW),
+        CONF_MAX_POLL_INTERVAL: user_input.get(
+            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+        CONF_SHARED_LISTENER: user_input.get(CONF_SHARED_LISTENER, False),
+        CONF_MAC_ADDRESS: user_input.get(CONF_MAC_ADDRESS),
+        CONF_PROBE_TIMEOUT: user_input.get(CONF_PROBE_TIMEOUT, DEFAULT_PROBE_TIMEOUT),
+        CONF_PANEL_HOST: user_input.get(CONF_PANEL_HOST),
+        CONF_PARTITION_COUNT: user_input.get(CONF_PARTITION_COUNT),
+        CONF_RECEPTOR_HOST: user_input.get(CONF_RECEPTOR_HOST),
+        CONF_ACCOUNT: user_input.get(CONF_ACCOUNT),
+        CONF_WRITE_BATCH_WINDOW: user_input.get(
+            CONF_WRITE_BATCH_WINDOW, DEFAULT_WRITE_BATCH_WINDOW),
+        CONF_ZONE_PROFILES: user_input.get(CONF_ZONE_PROFILES, ""),
+        CONF_PGM_COUNT: user_input.get(CONF_PGM_COUNT, DEFAULT_PGM_COUNT),
+        CONF_BYPASS_PRESETS: user_input.get(CONF_BYPASS_PRESETS, ""),
+        CONF_CONFIGURED_ZONES: user_input.get(CONF_CONFIGURED_ZONES, ""),
+    }
+
+
+def validate_zone_profiles(data):
+    """Check the zone profile table parses."""
+    try:
+        parse_zone_profiles(data.get(CONF_ZONE_PROFILES))
+    except ValueError as err:
+        _LOGGER.warning("invalid zone profiles: %s", err)
+        raise InvalidZoneProfiles from err
+
+
+def validate_bypass_presets(data):
+    """Check the bypass preset table parses."""
+    try:
+        parse_bypass_presets(data.get(CONF_BYPASS_PRESETS))
+    except ValueError as err:
+        _LOGGER.warning("invalid bypass presets: %s", err)
+        raise InvalidBypassPresets from err
+
+
+def validate_configured_zones(data):
+    """Check the configured zones parse, and are given where they are needed.
+
+    The integration's own transports cannot read the zone programming, so
+    they need the zones in use; ``amtalarm`` reads it from the panel.
+    """
+    text = (data.get(CONF_CONFIGURED_ZONES) or "").strip()
+    own_transport = (data.get(CONF_PANEL_HOST) or data.get(CONF_RECEPTOR_HOST)
+                     or data.get(CONF_SHARED_LISTENER))
+    if not text:
+        if own_transport:
+            raise InvalidConfiguredZones
+        return
+    try:
+        parse_zones(text, V2_MAX_ZONES if data.get(CONF_PANEL_HOST) else MAX_ZONES)
+    except ValueError as err:
+        _LOGGER.warning("invalid configured zones: %s", err)
+        raise InvalidConfiguredZones from err
+
+
+# Settings that decide how the panel is reached; the options flow probes
+# again only when one of them changed.
+PROBE_SETTINGS = (CONF_PORT, CONF_PASSWORD, CONF_PANEL_HOST, CONF_RECEPTOR_HOST,
+                  CONF_SHARED_LISTENER)
+
+# AMT 8000 settings: the IsecNet V2 backend is experimental, its payload
+# layouts unverified, so the forms do not offer it.  Entries that already
+# have them keep them through the options flow.
+EXPERIMENTAL_SETTINGS = (CONF_PANEL_HOST, CONF_PARTITION_COUNT)
+
+
+async def validate_user_input(hass: core.HomeAssistant, data, probe=True):
     """Validate the network input allows us to connect.
 
     Data has the keys from DATA_SCHEMA with values provided by the user.
+    Without probe the panel is not contacted: the options flow skips it
+    while the running hub holds the port or session it would need.
     """
 
     # If your PyPI package is not built with async, pass your methods
@@ -59,26 +165,58 @@ async def validate_user_input(hass: core.HomeAssistant, data):
     # )
 
     # print("port value is", data["port"], file=sys.stderr)
-    password=None
-    if "password" in data:
-        password=data["password"]
-    hub = AlarmHub(
-        hass=hass, config_entry=None, port=data["port"], default_password=password
-    )
-
-    if not await hub.wait_connection():
-        hub.close()
-        raise InvalidAuth
-
-    hub.close()
-
-    # If you cannot connect:
-    # throw CannotConnect
-    # If the authentication is wrong:
-    # InvalidAuth
+    validate_zone_profiles(data)
+    validate_bypass_presets(data)
+    validate_configured_zones(data)
+    if data.get(CONF_PANEL_HOST):
+        # An AMT 8000 is connected to: open and authenticate one session.
+        timeout = data.get(CONF_PROBE_TIMEOUT, DEFAULT_PROBE_TIMEOUT)
+        try:
+            if probe:
+                await async_probe_v2_panel(hass, data[CONF_PANEL_HOST], data[CONF_PORT],
+                                           data.get(CONF_PASSWORD), timeout)
+        except IsecNetError as err:
+            raise InvalidAuth from err
+        except asyncio.TimeoutError as err:
+            raise ProbeTimeout from err
+        except OSError as err:
+            _LOGGER.warning("cannot reach %s:%s: %s", data[CONF_PANEL_HOST], data[CONF_PORT], err)
+            raise CannotConnect from err
+        return {"title": f"AMT 8000 {data[CONF_PANEL_HOST]}"}
+
+    if data.get(CONF_RECEPTOR_HOST):
+        # The port is the receptor's; the panel is reached by its account
+        # once the shared receptor link is up.
+        if not data.get(CONF_ACCOUNT):
+            raise InvalidAccount
+        return {"title": f"AMT {data[CONF_ACCOUNT]:04d} via {data[CONF_RECEPTOR_HOST]}"}
+
+    if data.get(CONF_SHARED_LISTENER):
+        # The port may already be served by the shared listener of another
+        # entry; the panel is identified by its MAC once it dials in.
+        try:
+            mac = parse_mac(data.get(CONF_MAC_ADDRESS, ""))
+        except ValueError as err:
+            raise InvalidMac from err
+        # Titled as a probed panel would be, before its model is known.
+        return {"title": f"AMT {mac.hex()}"}
+
+    if not probe:
+        return {"title": None}
+
+    # Only the handshake is run: the panel announces its model and MAC and
+    # is hung up on, to redial the runtime connection once the entry exists.
+    timeout = data.get(CONF_PROBE_TIMEOUT, DEFAULT_PROBE_TIMEOUT)
+    try:
+        identity = await async_probe_panel(hass, data[CONF_PORT], timeout)
+    except asyncio.TimeoutError as err:
+        raise ProbeTimeout from err
+    except OSError as err:
+        _LOGGER.warning("cannot probe port %s: %s", data[CONF_PORT], err)
+        raise CannotConnect from err
 
     # Return info that you want to store in the config entry.
-    return {"title": "Name of the device"}
+    return {"title": f"{identity.model} {identity.mac.hex()}"}
 
 
 async def validate_night_mode_input(hass: core.HomeAssistant, data):
@@ -131,11 +269,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 #merge.update(home_mode_input)
                 #config = convert_input(merge)
                 device_config = {
-                    CONF_PORT: self.user_input[CONF_PORT],
-                    CONF_PASSWORD: self.user_input[CONF_PASSWORD],
-                    CONF_SYSTEM_PASSWORD: self.user_input.get(CONF_SYSTEM_PASSWORD),
-                    CONF_ISECPROGRAM_POLL_INTERVAL: self.user_input.get(
-                        CONF_ISECPROGRAM_POLL_INTERVAL, DEFAULT_ISECPROGRAM_POLL_INTERVAL),
+                    **user_config(self.user_input),
                     CONF_AWAY_MODE_ENABLED: self.away_mode_input[CONF_AWAY_MODE_ENABLED],
                     CONF_AWAY_PARTITION_1: self.away_mode_input[CONF_AWAY_PARTITION_1],
                     CONF_AWAY_PARTITION_2: self.away_mode_input[CONF_AWAY_PARTITION_2],
@@ -165,7 +299,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         try:
             r = self.async_show_form(
                 step_id="home_mode",
-                data_schema=vol.Schema(home_mode_partition_schema),
+                data_schema=self.add_suggested_values_to_schema(
+                    vol.Schema(home_mode_partition_schema), self.config_entry.data),
                 errors=errors,
             )
         except Exception:  # pylint: disable=broad-except
@@ -193,7 +328,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         try:
             r = self.async_show_form(
                 step_id="away_mode",
-                data_schema=vol.Schema(away_mode_partition_schema),
+                data_schema=self.add_suggested_values_to_schema(
+                    vol.Schema(away_mode_partition_schema), self.config_entry.data),
                 errors=errors,
             )
         except Exception:  # pylint: disable=broad-except
@@ -220,7 +356,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         try:
             r = self.async_show_form(
                 step_id="night_mode",
-                data_schema=vol.Schema(night_partition_schema),
+                data_schema=self.add_suggested_values_to_schema(
+                    vol.Schema(night_partition_schema), self.config_entry.data),
                 errors=errors,
             )
         except Exception:  # pylint: disable=broad-except
@@ -233,19 +370,41 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         """Handle the initial step."""
         errors = {}
         if user_input is not None:
+            data = self.config_entry.data
+            user_input = {
+                **{key: data.get(key) for key in EXPERIMENTAL_SETTINGS}, **user_input
+            }
+            probe = any((user_input.get(key) or None) != (data.get(key) or None)
+                        for key in PROBE_SETTINGS)
             try:
+                await validate_user_input(self.hass, user_input, probe=probe)
                 self.user_input = user_input
                 return await self.async_step_night_mode()
             except CannotConnect:
                 errors["base"] = "cannot_connect"
+            except ProbeTimeout:
+                errors["base"] = "timeout_connect"
             except InvalidAuth:
                 errors["base"] = "invalid_auth"
+            except InvalidMac:
+                errors["base"] = "invalid_mac"
+            except InvalidAccount:
+                errors["base"] = "invalid_account"
+            except InvalidZoneProfiles:
+                errors["base"] = "invalid_zone_profiles"
+            except InvalidBypassPresets:
+                errors["base"] = "invalid_bypass_presets"
+            except InvalidConfiguredZones:
+                errors["base"] = "invalid_configured_zones"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
         try:
             r = self.async_show_form(
-                step_id="init", data_schema=vol.Schema(user_schema), errors=errors
+                step_id="init",
+                data_schema=self.add_suggested_values_to_schema(
+                    vol.Schema(user_schema), user_input or self.config_entry.data),
+                errors=errors,
             )
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception("Unexpected exception")
@@ -264,6 +423,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.away_mode_input = {}
         self.night_mode_input = {}
         self.user_input = {}
+        self.title = "Name of the device"
 
     # async def async_step_init(self, user_input=None):
     #     errors = {}
@@ -286,11 +446,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 info = await validate_home_mode_input(self.hass, home_mode_input)
 
                 device_config = {
-                    CONF_PORT: self.user_input[CONF_PORT],
-                    CONF_PASSWORD: self.user_input[CONF_PASSWORD],
-                    CONF_SYSTEM_PASSWORD: self.user_input.get(CONF_SYSTEM_PASSWORD),
-                    CONF_ISECPROGRAM_POLL_INTERVAL: self.user_input.get(
-                        CONF_ISECPROGRAM_POLL_INTERVAL, DEFAULT_ISECPROGRAM_POLL_INTERVAL),
+                    **user_config(self.user_input),
                     CONF_AWAY_MODE_ENABLED: self.away_mode_input[CONF_AWAY_MODE_ENABLED],
                     CONF_AWAY_PARTITION_1: self.away_mode_input[CONF_AWAY_PARTITION_1],
                     CONF_AWAY_PARTITION_2: self.away_mode_input[CONF_AWAY_PARTITION_2],
@@ -309,8 +465,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
                 _LOGGER.debug(f"device_config {device_config}")
 
-                return self.async_create_entry(title=info["title"],
-                                               data=device_config)
+                return self.async_create_entry(title=self.title, data=device_config)
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -389,7 +544,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # print("async_step_init", user_input)
         if user_input is not None:
             try:
-                await validate_user_input(self.hass, user_input)
+                info = await validate_user_input(self.hass, user_input)
+                self.title = info["title"]
                 # print("user_input", user_input)
                 # print("new user_input", config)
 
@@ -399,8 +555,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return await self.async_step_night_mode()
             except CannotConnect:
                 errors["base"] = "cannot_connect"
+            except ProbeTimeout:
+                errors["base"] = "timeout_connect"
             except InvalidAuth:
                 errors["base"] = "invalid_auth"
+            except InvalidMac:
+                errors["base"] = "invalid_mac"
+            except InvalidAccount:
+                errors["base"] = "invalid_account"
+            except InvalidZoneProfiles:
+                errors["base"] = "invalid_zone_profiles"
+            except InvalidBypassPresets:
+                errors["base"] = "invalid_bypass_presets"
+            except InvalidConfiguredZones:
+                errors["base"] = "invalid_configured_zones"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -422,3 +590,27 @@ class CannotConnect(exceptions.HomeAssistantError):
 
 class InvalidAuth(exceptions.HomeAssistantError):
     """Error to indicate there is invalid auth."""
+
+
+class InvalidMac(exceptions.HomeAssistantError):
+    """Error to indicate the panel MAC address is missing or malformed."""
+
+
+class ProbeTimeout(exceptions.HomeAssistantError):
+    """Error to indicate no panel identified itself within the timeout."""
+
+
+class InvalidAccount(exceptions.HomeAssistantError):
+    """Error to indicate the receptor account number is missing."""
+
+
+class InvalidZoneProfiles(exceptions.HomeAssistantError):
+    """Error to indicate the zone profile table does not parse."""
+
+
+class InvalidBypassPresets(exceptions.HomeAssistantError):
+    """Error to indicate the bypass preset table does not parse."""
+
+
+class InvalidConfiguredZones(exceptions.HomeAssistantError):
+    """Error to indicate the configured zones are missing or do not parse."""
@@ -2,91 +2,6 @@
 
 import logging
 
-from amtalarm.events import (
-    AMT_COMMAND_CODE_CONECTAR,
-    AMT_COMMAND_CODE_HEARTBEAT,
-    AMT_COMMAND_CODE_CONECTA_E_COMPLEMENTAR,
-    AMT_COMMAND_CODE_EVENT_CONTACT_ID,
-    AMT_COMMAND_CODE_EVENT_DATA_HORA,
-    AMT_COMMAND_CODE_EVENT_FOTO_ASSOCIADA,
-    AMT_COMMAND_CODE_SOLICITA_DATA_HORA,
-    AMT_REQ_CODE_VERSAO_FIRMWARE,
-    AMT_REQ_CODE_MODELO,
-    AMT_REQ_CODE_MAC,
-    AMT_REQ_CODE_IMEI,
-    AMT_REQ_CODE_ICCD_CHIP,
-    AMT_REQ_CODE_NIVEL_SINAL_GPRS3G4G,
-    AMT_REQ_CODE_PRESENCA_MODULO_GPRS3G4G,
-    AMT_PROTOCOL_ISEC_MOBILE,
-    AMT_EVENT_CODE_EMERGENCIA_MEDICA,
-    AMT_EVENT_CODE_DISPARO_OU_PANICO_DE_INCENDIO,
-    AMT_EVENT_CODE_PANICO_AUDIVEL_OU_SILENCIOSO,
-    AMT_EVENT_CODE_SENHA_DE_COACAO,
-    AMT_EVENT_CODE_PANICO_SILENCIOSO,
-    AMT_EVENT_CODE_DISPARO_DE_ZONA,
-    AMT_EVENT_CODE_DISPARO_DE_CERCA_ELETRICA,
-    AMT_EVENT_CODE_DISPARO_DE_ZONA_24H,
-    AMT_EVENT_CODE_TAMPER_DO_TECLADO,
-    AMT_EVENT_CODE_DISPARO_SILENCIOSO,
-    AMT_EVENT_CODE_FALHA_DA_SUPERVISAO_SMART,
-    AMT_EVENT_CODE_SOBRECARGA_NA_SAIDA_AUXILIAR,
-    AMT_EVENT_CODE_FALHA_NA_REDE_ELETRICA,
-    AMT_EVENT_CODE_BATERIA_PRINCIPAL_BAIXA_OU_EM_CURTO_CIRCUITO,
-    AMT_EVENT_CODE_RESET_PELO_MODO_DE_PROGRAMACAO,
-    AMT_EVENT_CODE_ALTERACAO_DA_PROGRAMACAO_DO_PAINEL,
-    AMT_EVENT_CODE_BATERIA_PRINCIPAL_AUSENTE_OU_INVERTIDA,
-    AMT_EVENT_CODE_CORTE_OU_CURTO_CIRCUITO_NA_SIRENE,
-    AMT_EVENT_CODE_TOQUE_DE_PORTEIRO,
-    AMT_EVENT_CODE_PROBLEMA_EM_TECLADO_OU_RECEPTOR,
-    AMT_EVENT_CODE_FALHA_NA_LINHA_TELEFONICA,
-    AMT_EVENT_CODE_FALHA_AO_COMUNICAR_EVENTO,
-    AMT_EVENT_CODE_CORTE_DA_FIACAO_DOS_SENSORES,
-    AMT_EVENT_CODE_CURTO_CIRCUITO_NA_FIACAO_DOS_SENSORES,
-    AMT_EVENT_CODE_TAMPER_DO_SENSOR,
-    AMT_EVENT_CODE_BATERIA_BAIXA_DE_SENSOR_SEM_FIO,
-    AMT_EVENT_CODE_DESATIVACAO_PELO_USUARIO,
-    AMT_EVENT_CODE_AUTO_DESATIVACAO,
-    AMT_EVENT_CODE_DESATIVACAO_VIA_COMPUTADOR_OU_TELEFONE,
-    AMT_EVENT_CODE_ACESSO_REMOTO_PELO_SOFTWARE_DE_DOWNLOAD_UPLOAD,
-    AMT_EVENT_CODE_FALHA_NO_DOWNLOAD,
-    AMT_EVENT_CODE_ACIONAMENTO_DE_PGM,
-    AMT_EVENT_CODE_SENHA_INCORRETA,
-    AMT_EVENT_CODE_ANULACAO_TEMPORARIA_DE_ZONA,
-    AMT_EVENT_CODE_ANULACAO_POR_DISPARO,
-    AMT_EVENT_CODE_TESTE_MANUAL,
-    AMT_EVENT_CODE_TESTE_PERIODICO,
-    AMT_EVENT_CODE_SOLICITACAO_DE_MANUTENCAO,
-    AMT_EVENT_CODE_RESET_DO_BUFFER_DE_EVENTOS,
-    AMT_EVENT_CODE_LOG_DE_EVENTOS_CHEIO,
-    AMT_EVENT_CODE_DATA_E_HORA_FORAM_REINICIADAS,
-    AMT_EVENT_CODE_RESTAURACAO_DE_INCENDIO,
-    AMT_EVENT_CODE_RESTAURACAO_DISPARO_DE_ZONA,
-    AMT_EVENT_CODE_RESTAURACAO_DE_DISPARO_DE_CERCA_ELETRICA,
-    AMT_EVENT_CODE_RESTARAUCAO_DISPARO_DE_ZONA_24H,
-    AMT_EVENT_CODE_RESTARAUCAO_TAMPER_DO_TECLADO,
-    AMT_EVENT_CODE_RESTARAUCAO_DISPARO_SILENCIOSO,
-    AMT_EVENT_CODE_RESTARAUCAO_DA_SUPERVISAO_SMART,
-    AMT_EVENT_CODE_RESTARAUCAO_SOBRECARGA_NA_SAIDA_AUXILIAR,
-    AMT_EVENT_CODE_RESTARAUCAO_FALHA_NA_REDE_ELETRICA,
-    AMT_EVENT_CODE_RESTARAUCAO_BAT_PRINC_BAIXA_OU_EM_CURTO_CIRCUITO,
-    AMT_EVENT_CODE_RESTARAUCAO_BAT_PRINC_AUSENTE_OU_INVERTIDA,
-    AMT_EVENT_CODE_RESTARAUCAO_CORTE_OU_CURTO_CIRCUITO_NA_SIRENE,
-    AMT_EVENT_CODE_RESTARAUCAO_PROBLEMA_EM_TECLADO_OU_RECEPTOR,
-    AMT_EVENT_CODE_RESTARAUCAO_LINHA_TELEFONICA,
-    AMT_EVENT_CODE_RESTARAUCAO_CORTE_DA_FIACAO_DOS_SENSORES,
-    AMT_EVENT_CODE_RESTARAUCAO_CURTO_CIRCUITO_NA_FIACAO_DOS_SENSORES,
-    AMT_EVENT_CODE_RESTARAUCAO_TAMPER_DO_SENSOR,
-    AMT_EVENT_CODE_RESTARAUCAO_BATERIA_BAIXA_DE_SENSOR_SEM_FIO,
-    AMT_EVENT_CODE_ATIVACAO_PELO_USUARIO,
-    AMT_EVENT_CODE_AUTO_ATIVACAO,
-    AMT_EVENT_CODE_ATIVACAO_VIA_COMPUTADOR_OU_TELEFONE,
-    AMT_EVENT_CODE_ATIVACAO_POR_UMA_TECLA,
-    AMT_EVENT_CODE_DESACIONAMENTO_DE_PGM,
-    AMT_EVENT_CODE_ATIVACAO_PARCIAL,
-    AMT_EVENT_CODE_KEEP_ALIVE,
-    AMT_EVENT_MESSAGES,
-)
-
 LOGGER = logging.getLogger(__package__)
 
 DOMAIN = "amt_alarms"
@@ -97,6 +12,33 @@ CONF_PASSWORD = "password"
 CONF_SYSTEM_PASSWORD = "system_password"
 CONF_ISECPROGRAM_POLL_INTERVAL = "isecprogram_poll_interval"
 DEFAULT_ISECPROGRAM_POLL_INTERVAL = 1800
+CONF_FAST_POLL_INTERVAL = "fast_poll_interval"
+DEFAULT_FAST_POLL_INTERVAL = 1
+CONF_FAST_POLL_WINDOW = "fast_poll_window"
+DEFAULT_FAST_POLL_WINDOW = 30
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MAX_POLL_INTERVAL = 60
+CONF_SHARED_LISTENER = "shared_listener"
+CONF_MAC_ADDRESS = "mac_address"
+CONF_PROBE_TIMEOUT = "probe_timeout"
+CONF_RECEPTOR_HOST = "receptor_host"
+CONF_ACCOUNT = "account"
+CONF_PANEL_HOST = "panel_host"
+CONF_WRITE_BATCH_WINDOW = "write_batch_window"
+CONF_ZONE_PROFILES = "zone_profiles"
+CONF_PGM_COUNT = "pgm_count"
+CONF_BYPASS_PRESETS = "bypass_presets"
+CONF_CONFIGURED_ZONES = "configured_zones"
+CONF_PARTITION_COUNT = "partition_count"
+DEFAULT_WRITE_BATCH_WINDOW = 0
+DEFAULT_PGM_COUNT = 0
+DEFAULT_PARTITION_COUNT = 1
+DEFAULT_PROBE_TIMEOUT = 60
+EVENT_CONTACT_ID = "amt_alarms_event"
+EVENT_BUFFER_SIZE = 200
+SIGNAL_ZONES_CHANGED = "amt_alarms_zones_changed_{}"
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
 CONF_NIGHT_PARTITION_1 = "night_partition_1"
 CONF_NIGHT_PARTITION_2 = "night_partition_2"
 CONF_NIGHT_PARTITION_3 = "night_partition_3"
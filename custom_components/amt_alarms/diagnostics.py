@@ -0,0 +1,41 @@
+"""Diagnostics support for Intelbras AMT Alarms."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_ACCOUNT, CONF_MAC_ADDRESS, CONF_PASSWORD, CONF_SYSTEM_PASSWORD
+
+TO_REDACT = {CONF_PASSWORD, CONF_SYSTEM_PASSWORD, CONF_MAC_ADDRESS, CONF_ACCOUNT, "mac"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    hub = entry.runtime_data
+    identity = hub.identity
+    return async_redact_data(
+        {
+            "entry": dict(entry.data),
+            "panel": {
+                "backend": type(hub.alarm).__name__,
+                "model": identity.model if identity else None,
+                "mac": identity.mac if identity else None,
+                "max_sensors": hub.max_sensors,
+                "max_partitions": hub.max_partitions,
+            },
+            "state": {
+                "open_zones": hub.open_zones_bitmap,
+                "bypassed_zones": hub.bypassed_zones_bitmap,
+                "armed_partitions": hub.armed_partitions_bitmap,
+                "triggered_partitions": hub.triggered_partitions_bitmap,
+                "source_voltage": hub.source_voltage,
+                "battery_voltage": hub.battery_voltage,
+            },
+            "link_up": hub.link_up,
+            "poll_interval": hub.poll_interval,
+            "events_buffered": len(hub.events),
+            "clock": hub.clock.as_dict(),
+            "scheduler": hub.scheduler.as_dict(),
+            "stats": hub.stats.as_dict(),
+        },
+        TO_REDACT,
+    )
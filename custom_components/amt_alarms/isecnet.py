@@ -0,0 +1,497 @@
+"""IsecNet V1 framing and ISEC Mobile encoding.
+
+Pure protocol helpers with no Home Assistant dependency, shared by the
+integration's own panel transports.  See DESIGN.md for the frame layout.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+ACK = 0xFE
+
+CMD_CONNECT = 0x94
+CMD_EXTENDED_CONNECT = 0x95
+CMD_HEARTBEAT = 0xF7
+CMD_DATETIME_REQUEST = 0x80
+CMD_ZONE_NAMES = 0xD1
+CMD_PARTITION_NAMES = 0xD3
+CMD_CONTACT_ID = 0xB0
+CMD_CONTACT_ID_DATETIME = 0xB4
+CMD_CONTACT_ID_PHOTO = 0xB5
+CMD_ISEC_PROGRAM = 0xE7
+CMD_ISEC_MOBILE = 0xE9
+CMD_RECEPTOR_INIT = 0xE0
+CMD_RECEPTOR_ACCOUNT = 0xE3
+CMD_RECEPTOR_LINK = 0xE4
+
+ISEC_MOBILE_DELIMITER = 0x21
+ISEC_ARM = 0x41
+ISEC_BYPASS = 0x42
+ISEC_DISARM = 0x44
+ISEC_PANIC = 0x45
+ISEC_PGM = 0x50
+ISEC_STATUS = 0x5B
+
+PANIC_SILENT = 0x00
+PANIC_AUDIBLE = 0x01
+PANIC_MEDICAL = 0x02
+PANIC_FIRE = 0x03
+PGM_OFF = 0x00
+PGM_ON = 0x01
+
+MAX_ZONES = 48
+MAX_PARTITIONS = 4
+# PGM 1-4 on the board plus the expander outputs of the larger panels.
+MAX_PGMS = 19
+BYPASS_BITMAP_LENGTH = 8
+STATUS_MIN_LENGTH = 30
+
+MODELS = {
+    0x1E: "AMT 2018 E/EG",
+    0x34: "AMT 2018 E Smart",
+    0x36: "AMT 1000 Smart",
+    0x41: "AMT 4010 Smart",
+    0x61: "AMT 1016 NET",
+    0x29: "XEG 4000 Smart",
+}
+
+CONTACT_ID_LENGTH = 15
+QUALIFIER_EVENT = 1
+QUALIFIER_RESTORE = 3
+CODE_PROGRAMMING_CHANGED = 306
+# Zone field = PGM number; restore = PGM off.
+CODE_PGM = 422
+
+# Zone and partition names are fixed-width, space padded.
+NAME_LENGTH = 14
+
+# Contact ID event codes: (event, restore) descriptions.
+CONTACT_ID_CODES = {
+    100: ("Medical alarm", "Medical restore"),
+    110: ("Fire alarm", "Fire restore"),
+    120: ("Panic alarm", "Panic restore"),
+    121: ("Duress", None),
+    122: ("Silent panic", "Silent panic restore"),
+    130: ("Burglar alarm", "Burglar restore"),
+    131: ("Perimeter alarm", "Perimeter restore"),
+    132: ("Interior alarm", "Interior restore"),
+    133: ("24 hour zone alarm", "24 hour zone restore"),
+    137: ("Tamper", "Tamper restore"),
+    145: ("Keypad tamper", "Keypad tamper restore"),
+    300: ("System trouble", "System restore"),
+    301: ("AC power loss", "AC power restore"),
+    302: ("Low battery", "Battery restore"),
+    305: ("System reset", None),
+    306: ("Programming changed", None),
+    311: ("Battery missing", "Battery present"),
+    321: ("Siren trouble", "Siren restore"),
+    350: ("Communication trouble", "Communication restore"),
+    383: ("Sensor tamper", "Sensor tamper restore"),
+    384: ("Wireless sensor low battery", "Wireless sensor battery restore"),
+    400: ("Disarm", "Arm"),
+    401: ("Disarm by user", "Arm by user"),
+    403: ("Auto disarm", "Auto arm"),
+    407: ("Remote disarm", "Remote arm"),
+    408: (None, "Quick arm"),
+    409: ("Keyswitch disarm", "Keyswitch arm"),
+    422: ("PGM on", "PGM off"),
+    456: (None, "Partial arm"),
+    461: ("Wrong password", None),
+    570: ("Zone bypass", "Zone unbypass"),
+    601: ("Manual test", None),
+    602: ("Periodic test", None),
+    616: ("Service request", None),
+    621: ("Event log reset", None),
+    625: ("Date/time set", None),
+}
+
+ISEC_MOBILE_ERRORS = {
+    0xE0: "invalid packet",
+    0xE1: "wrong password",
+    0xE2: "invalid command",
+    0xE3: "panel is not partitioned",
+    0xE4: "open zones",
+    0xE5: "command discontinued",
+    0xE6: "user not allowed to bypass",
+    0xE7: "user not allowed to disarm",
+    0xE8: "bypass not allowed while armed",
+}
+
+
+class IsecNetError(Exception):
+    """Error reported by the panel for an ISEC Mobile command."""
+
+    def __init__(self, code):
+        """Initialize."""
+        super().__init__(ISEC_MOBILE_ERRORS.get(code, f"error 0x{code:02x}"))
+        self.code = code
+
+
+# Folding widths, in bits, for frames of up to 255 bytes.
+_FOLDS = tuple((bits, (1 << bits) - 1) for bits in (1024, 512, 256, 128, 64, 32, 16, 8))
+
+
+def checksum(data):
+    """Return the IsecNet V1 checksum: XOR of all bytes, XOR 0xFF.
+
+    The bytes are read as one integer and folded in halves, so the XOR
+    takes a few big-integer operations instead of a Python loop per byte,
+    and works on a memoryview without copying it.
+    """
+    value = int.from_bytes(data, "little")
+    bits = len(data) * 8
+    while bits > 2048:
+        # Longer than any frame: halve down to the precomputed widths.
+        width = (bits // 16 + 1) * 8
+        value = (value >> width) ^ (value & ((1 << width) - 1))
+        bits = width
+    for width, mask in _FOLDS:
+        if bits > width:
+            value = (value >> width) ^ (value & mask)
+            bits = width
+    return value ^ 0xFF
+
+
+def _crc16_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data):
+    """Return the CRC-16 (polynomial 0x8005, reflected) used by 0xE7 frames."""
+    crc = 0
+    for byte in data:
+        crc = (crc >> 8) ^ _CRC16_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def build_frame(command, data=b""):
+    """Build a [NumBytes][Command][Data][CheckSum] frame."""
+    frame = bytearray((len(data) + 3, command))
+    frame += data
+    frame.append(checksum(frame))
+    return bytes(frame)
+
+
+def build_isec_mobile(password, command, data=b""):
+    """Build an ISEC Mobile (0xE9) frame carrying command and data."""
+    payload = bytearray((ISEC_MOBILE_DELIMITER,))
+    if password:
+        payload += str(password).encode("ascii")
+    payload.append(command)
+    payload += data
+    payload.append(ISEC_MOBILE_DELIMITER)
+    return build_frame(CMD_ISEC_MOBILE, payload)
+
+
+def account_digits(account):
+    """Encode a 4-digit account number one digit per byte, 0 sent as 0x0A."""
+    return bytes(int(digit) or 0x0A for digit in f"{account:04d}")
+
+
+def partition_byte(index):
+    """Encode a 0-based partition index for arm/disarm commands."""
+    return 0x40 + index + 1
+
+
+def pgm_data(index, on):
+    """Encode the data of a PGM command for a 0-based PGM index."""
+    return bytes((index + 1, PGM_ON if on else PGM_OFF))
+
+
+def parse_names(payload):
+    """Parse a 0xD1/0xD3 reply into (first index, list of names).
+
+    The request carries the 0-based index of the first name wanted; the
+    reply repeats it and packs as many ``NAME_LENGTH`` names as fit in the
+    frame.  This layout is assumed, not taken from a capture, so a reply
+    that is not a whole number of names raises ``ValueError``, and names
+    that are blank or hold anything but printable ASCII, which the keypad
+    cannot enter, are returned as None.
+    """
+    if not payload or (len(payload) - 1) % NAME_LENGTH:
+        raise ValueError(f"names reply of {len(payload)} bytes is not an index "
+                         f"and {NAME_LENGTH}-byte names")
+    first = payload[0]
+    names = []
+    for start in range(1, len(payload), NAME_LENGTH):
+        name = bytes(payload[start:start + NAME_LENGTH]).rstrip(b" \x00").strip(b" ")
+        valid = name and all(0x20 <= byte < 0x7F for byte in name)
+        names.append(name.decode("ascii") if valid else None)
+    return first, names
+
+
+class FrameParser:
+    """Split a TCP byte stream into verified IsecNet V1 frames.
+
+    Incremental and copy-free: the transport receives straight into a
+    preallocated buffer (``get_buffer``/``buffer_updated``, the
+    ``asyncio.BufferedProtocol`` interface), frames are verified in place
+    and their payloads are returned as memoryview slices of that buffer.
+    A payload is only valid until the next ``get_buffer`` call; copy it to
+    keep it.  Partial frames stay in the buffer until completed, and bytes
+    that cannot start a frame are skipped to resynchronise.
+
+    Until the first valid frame, the stream may begin with junk whose
+    bytes read as frame lengths, such as the tail of a frame cut by a
+    reconnection.  Stray ACKs (0xFE) are skipped rather than taken for a
+    254-byte frame, and a frame that does not verify only skips its first
+    byte; neither counts as a checksum error.  Past such a frame, the next
+    one that verifies is held until the frame after it verifies too.
+    """
+
+    # A frame is at most 255 bytes long (one length byte), so this much
+    # free space always fits the next read of a pending frame.
+    MIN_FREE = 256
+
+    def __init__(self, size=4096):
+        """Initialize."""
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._synced = False
+        self._misaligned = False
+        self.checksum_errors = 0
+
+    def get_buffer(self, sizehint=-1):
+        """Return the writable free tail of the buffer."""
+        start, end = self._start, self._end
+        if start == end:
+            self._start = self._end = 0
+        elif len(self._buffer) - end < self.MIN_FREE:
+            # Move the pending partial frame to the front.
+            self._view[:end - start] = self._view[start:end]
+            self._start, self._end = 0, end - start
+        return self._view[self._end:]
+
+    def buffer_updated(self, nbytes):
+        """Account for nbytes written to the buffer and return new frames."""
+        self._end += nbytes
+        return self._frames()
+
+    def _frames(self):
+        buffer, view = self._buffer, self._view
+        start, end = self._start, self._end
+        frames = []
+        if not self._synced:
+            start = self._skip_junk(start, end)
+        while self._synced and start < end:
+            length = buffer[start]
+            if length < 3:
+                # Not a valid frame start, resynchronise on the next byte.
+                start += 1
+                continue
+            if end - start < length:
+                break
+            command = buffer[start + 1]
+            stop = start + length
+            if command == CMD_ISEC_PROGRAM:
+                valid = (length >= 4 and crc16(view[start:stop - 2])
+                         == int.from_bytes(view[stop - 2:stop], "big"))
+                payload = view[start + 2:stop - 2]
+            else:
+                valid = checksum(view[start:stop]) == 0
+                payload = view[start + 2:stop - 1]
+            start = stop
+            if not valid:
+                self.checksum_errors += 1
+                continue
+            frames.append((command, payload))
+        self._start = start
+        return frames
+
+    def _skip_junk(self, start, end):
+        """Return where the first valid frame starts, or may start.
+
+        Sets ``_synced`` once a frame is trusted.  Inside a frame that did
+        not verify, another may verify by chance, one time in 256, so past
+        one it is only trusted once the frame after it verifies too.
+        """
+        buffer = self._buffer
+        while start < end:
+            length = buffer[start]
+            if length < 3 or length == ACK:
+                start += 1
+                continue
+            stop = start + length
+            if stop > end:
+                break
+            if self._verifies(start, stop):
+                if not self._misaligned:
+                    self._synced = True
+                    break
+                following = buffer[stop] if stop < end else 0
+                after = stop + following
+                if stop == end or (following >= 3 and after > end):
+                    # Wait for the next frame to decide.
+                    break
+                if following >= 3 and self._verifies(stop, after):
+                    self._synced = True
+                    break
+            start += 1
+            self._misaligned = True
+        return start
+
+    def _verifies(self, start, stop):
+        view = self._view
+        if self._buffer[start + 1] == CMD_ISEC_PROGRAM:
+            return stop - start >= 4 and crc16(view[start:stop - 2]) == int.from_bytes(
+                view[stop - 2:stop], "big")
+        return checksum(view[start:stop]) == 0
+
+    def feed(self, data):
+        """Copy received bytes in and return the list of (command, payload) frames."""
+        frames = []
+        data = memoryview(data)
+        while data:
+            target = self.get_buffer(len(data))
+            count = min(len(target), len(data))
+            target[:count] = data[:count]
+            data = data[count:]
+            frames += [(command, bytes(payload)) for command, payload in self.buffer_updated(count)]
+        return frames
+
+
+@dataclass(frozen=True)
+class ExtendedConnect:
+    """Panel identity announced in the 0x95 frame."""
+
+    mac: bytes
+    model_code: int
+    firmware: bytes
+
+    @property
+    def model(self):
+        """Return the model name for the announced model code."""
+        return MODELS.get(self.model_code, f"AMT 0x{self.model_code:02x}")
+
+
+def parse_extended_connect(payload):
+    """Parse the payload of a 0x95 frame."""
+    if len(payload) < 7:
+        raise ValueError("extended connect frame too short")
+    return ExtendedConnect(bytes(payload[:6]), payload[6], bytes(payload[7:]))
+
+
+def parse_mac(value):
+    """Parse a MAC address written as hex, with or without separators."""
+    digits = "".join(c for c in str(value) if c not in ":-. ").lower()
+    mac = bytes.fromhex(digits)
+    if len(mac) != 6:
+        raise ValueError("MAC address must have 6 bytes")
+    return mac
+
+
+@dataclass(frozen=True)
+class PanelStatus:
+    """Bitmaps decoded from an ISEC Mobile status reply."""
+
+    open_zones: int
+    triggered_zones: int
+    bypassed_zones: int
+    armed_partitions: int
+    triggered_partitions: int
+
+
+def decode_status(payload):
+    """Decode the payload of an ISEC Mobile status reply (see DESIGN.md)."""
+    return PanelStatus(
+        open_zones=int.from_bytes(payload[1:7], "little"),
+        triggered_zones=int.from_bytes(payload[9:15], "little"),
+        bypassed_zones=int.from_bytes(payload[17:23], "little"),
+        armed_partitions=payload[28] & ((1 << MAX_PARTITIONS) - 1),
+        triggered_partitions=payload[29] & ((1 << MAX_PARTITIONS) - 1),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ContactIdEvent:
+    """A Contact ID event reported with 0xB0, 0xB4 or 0xB5."""
+
+    account: int
+    qualifier: int
+    code: int
+    partition: int
+    zone: int
+    timestamp: datetime | None = None
+
+    @property
+    def restore(self):
+        """Return whether this is a restore/closing event."""
+        return self.qualifier == QUALIFIER_RESTORE
+
+    @property
+    def description(self):
+        """Return a readable description of the event code."""
+        event, restore = CONTACT_ID_CODES.get(self.code, (None, None))
+        text = restore if self.restore else event
+        return text or f"Event {self.code:03d}"
+
+
+def _digits(data):
+    digits = []
+    for byte in data:
+        if byte == 0x0A:
+            byte = 0
+        elif byte > 9:
+            raise ValueError(f"invalid Contact ID digit 0x{byte:02x}")
+        digits.append(byte)
+    return digits
+
+
+def _number(digits):
+    value = 0
+    for digit in digits:
+        value = value * 10 + digit
+    return value
+
+
+def _bcd(byte):
+    return (byte >> 4) * 10 + (byte & 0x0F)
+
+
+def datetime_bcd(when):
+    """Encode when as YY MM DD HH MM SS in BCD, the 0xB4 timestamp layout.
+
+    Also the payload of the reply to a 0x80 date/time request.
+    """
+    return bytes(
+        ((value // 10) << 4) | (value % 10)
+        for value in (when.year % 100, when.month, when.day,
+                      when.hour, when.minute, when.second)
+    )
+
+
+def parse_contact_id(command, payload):
+    """Parse the payload of a 0xB0, 0xB4 or 0xB5 frame into a ContactIdEvent.
+
+    0xB4 prepends the panel's date and time as YY MM DD HH MM SS in BCD;
+    0xB5 appends photo data after the event, which is ignored here.
+    """
+    timestamp = None
+    if command == CMD_CONTACT_ID_DATETIME:
+        if len(payload) < 6:
+            raise ValueError("Contact ID timestamp too short")
+        year, month, day, hour, minute, second = (_bcd(b) for b in payload[:6])
+        timestamp = datetime(2000 + year, month, day, hour, minute, second)
+        payload = payload[6:]
+    if len(payload) < CONTACT_ID_LENGTH:
+        raise ValueError("Contact ID event too short")
+    digits = _digits(payload[:CONTACT_ID_LENGTH])
+    # ACCT(4) MT(2) Q(1) XYZ(3) GG(2) CCC(3)
+    return ContactIdEvent(
+        account=_number(digits[0:4]),
+        qualifier=digits[6],
+        code=_number(digits[7:10]),
+        partition=_number(digits[10:12]),
+        zone=_number(digits[12:15]),
+        timestamp=timestamp,
+    )
@@ -0,0 +1,113 @@
+"""IsecNet V2 protocol primitives used by the AMT 8000 series.
+
+Pure functions and parsers, shared with ``isecnet`` where the two
+versions agree (CRC-16, status bitmaps); no I/O here.
+
+The frame layout and command codes are those listed in DESIGN.md.  The
+payload layouts of the commands below are not documented there and are
+assumptions, kept in this module so they can be corrected in one place:
+
+- ``0xF0F0`` auth: password as ASCII digits; the reply's first byte is
+  0 on success, otherwise an error code.
+- ``0x401E`` arm/disarm: ``[partition, mode]`` with partition 0 = all
+  and 1-16, mode 1 = arm and 0 = disarm.
+- ``0x401F`` bypass: the 64-zone bypass bitmap, 8 bytes little endian.
+- ``0x401A`` panic: one byte, the ISEC Mobile panic type.
+- Command replies echo the command with a status byte, 0 on success.
+- ``0x0B4A`` status reply: model, then open, triggered and bypassed
+  zones (8 bytes each) and armed and triggered partitions (2 bytes
+  each), all little endian.
+"""
+from .isecnet import FrameParser, PanelStatus, crc16
+
+CMD_AUTH = 0xF0F0
+CMD_STATUS = 0x0B4A
+CMD_ARM_DISARM = 0x401E
+CMD_BYPASS = 0x401F
+CMD_PANIC = 0x401A
+
+PANEL_ADDRESS = 0x0000
+CLIENT_ADDRESS = 0x8FFF
+
+MODE_DISARM = 0x00
+MODE_ARM = 0x01
+ALL_PARTITIONS = 0x00
+
+MAX_ZONES = 64
+MAX_PARTITIONS = 16
+ZONE_BITMAP_LENGTH = 8
+PARTITION_BITMAP_LENGTH = 2
+STATUS_LENGTH = 1 + 3 * ZONE_BITMAP_LENGTH + 2 * PARTITION_BITMAP_LENGTH
+
+# Length, addresses and command ahead of the data; CRC-16 after it.
+HEADER_LENGTH = 8
+MIN_FRAME_LENGTH = HEADER_LENGTH + 2
+MAX_FRAME_LENGTH = 1024
+
+
+def build_frame(command, data=b"", dst=PANEL_ADDRESS, src=CLIENT_ADDRESS):
+    """Build a [NumBytes][DST][SRC][Command][Data][CRC-16] frame.
+
+    NumBytes is the total frame length, CRC included, as in V1.
+    """
+    frame = bytearray((len(data) + MIN_FRAME_LENGTH).to_bytes(2, "big"))
+    frame += dst.to_bytes(2, "big")
+    frame += src.to_bytes(2, "big")
+    frame += command.to_bytes(2, "big")
+    frame += data
+    frame += crc16(frame).to_bytes(2, "big")
+    return bytes(frame)
+
+
+class FrameParserV2(FrameParser):
+    """Split a TCP byte stream into verified IsecNet V2 frames.
+
+    Same buffer handling as the V1 ``FrameParser``; frames carry a 2-byte
+    length and command and are verified with the CRC-16.  Frames longer
+    than ``MAX_FRAME_LENGTH`` are treated as garbage.
+    """
+
+    MIN_FREE = MAX_FRAME_LENGTH
+
+    def _frames(self):
+        buffer, view = self._buffer, self._view
+        start, end = self._start, self._end
+        frames = []
+        while end - start >= 2:
+            length = (buffer[start] << 8) | buffer[start + 1]
+            if not MIN_FRAME_LENGTH <= length <= MAX_FRAME_LENGTH:
+                # Not a valid frame start, resynchronise on the next byte.
+                start += 1
+                continue
+            if end - start < length:
+                break
+            stop = start + length
+            valid = crc16(view[start:stop - 2]) == int.from_bytes(view[stop - 2:stop], "big")
+            command = (buffer[start + 6] << 8) | buffer[start + 7]
+            payload = view[start + HEADER_LENGTH:stop - 2]
+            start = stop
+            if not valid:
+                self.checksum_errors += 1
+                continue
+            frames.append((command, payload))
+        self._start = start
+        return frames
+
+
+def _little(payload, offset, length):
+    return int.from_bytes(payload[offset:offset + length], "little")
+
+
+def decode_status(payload):
+    """Decode the payload of a 0x0B4A status reply into a ``PanelStatus``."""
+    zones = 1
+    partitions = zones + 3 * ZONE_BITMAP_LENGTH
+    return PanelStatus(
+        open_zones=_little(payload, zones, ZONE_BITMAP_LENGTH),
+        triggered_zones=_little(payload, zones + ZONE_BITMAP_LENGTH, ZONE_BITMAP_LENGTH),
+        bypassed_zones=_little(payload, zones + 2 * ZONE_BITMAP_LENGTH, ZONE_BITMAP_LENGTH),
+        armed_partitions=_little(payload, partitions, PARTITION_BITMAP_LENGTH),
+        triggered_partitions=_little(
+            payload, partitions + PARTITION_BITMAP_LENGTH, PARTITION_BITMAP_LENGTH
+        ),
+    )
@@ -0,0 +1,263 @@
+"""Shared TCP listener serving many AMT panels on one port.
+
+Panels dial in, announce themselves with the 0x94/0x95 handshake and are
+routed by MAC address to the ``IsecNetPanel`` of the matching config
+entry.  One listener exists per port and lives as long as at least one
+panel is registered with it.
+"""
+import asyncio
+from dataclasses import dataclass
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_PROBE_TIMEOUT, DOMAIN, LOGGER
+from .isecnet import (
+    ACK,
+    CMD_CONNECT,
+    CMD_EXTENDED_CONNECT,
+    FrameParser,
+    parse_extended_connect,
+)
+from .panel import IsecNetPanel
+
+HANDSHAKE_TIMEOUT = 30
+DATA_LISTENERS = "listeners"
+
+
+@dataclass
+class PanelRoute:
+    """Connection state of one panel registered with a listener."""
+
+    panel: IsecNetPanel
+    connection: "PanelConnection | None" = None
+    peer: tuple | None = None
+    connected_since: float | None = None
+
+
+class PanelConnection(asyncio.BufferedProtocol):
+    """One accepted socket, unidentified until its 0x95 frame arrives.
+
+    The transport reads straight into the ``FrameParser`` buffer; frame
+    payloads handed to the panel are views into it, valid for the call.
+    """
+
+    def __init__(self, listener: "PanelListener") -> None:
+        """Initialize."""
+        self.listener = listener
+        self.transport = None
+        self.route = None
+        self.peer = None
+        self._parser = FrameParser()
+        self._handshake_timer = None
+
+    def connection_made(self, transport):
+        """Start waiting for the panel handshake."""
+        self.transport = transport
+        self.peer = transport.get_extra_info("peername")
+        self._handshake_timer = asyncio.get_running_loop().call_later(
+            HANDSHAKE_TIMEOUT, self._handshake_timeout
+        )
+
+    def _handshake_timeout(self):
+        LOGGER.warning("no panel identification from %s, closing", self.peer)
+        self.close()
+
+    def get_buffer(self, sizehint):
+        """Return the parser buffer for the transport to receive into."""
+        return self._parser.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes):
+        """Split the received bytes into frames and dispatch them."""
+        errors = self._parser.checksum_errors
+        frames = self._parser.buffer_updated(nbytes)
+        if self.route is not None:
+            stats = self.route.panel.stats
+            stats.bytes_in += nbytes
+            stats.checksum_errors += self._parser.checksum_errors - errors
+        for command, payload in frames:
+            if self.route is not None:
+                self.route.panel.frame_received(command, payload)
+            elif command == CMD_CONNECT:
+                self.write(bytes((ACK,)))
+            elif command == CMD_EXTENDED_CONNECT:
+                self._identify(payload)
+            else:
+                LOGGER.debug("frame 0x%02x from %s before identification",
+                             command, self.peer)
+            if self.transport is None:
+                break
+
+    def _identify(self, payload):
+        try:
+            identity = parse_extended_connect(payload)
+        except ValueError:
+            LOGGER.warning("invalid identification from %s", self.peer)
+            self.close()
+            return
+        self.write(bytes((ACK,)))
+        self._handshake_timer.cancel()
+        self.listener.attach(self, identity)
+
+    def connection_lost(self, exc):
+        """Detach from the panel it was routed to."""
+        if self._handshake_timer is not None:
+            self._handshake_timer.cancel()
+        self.transport = None
+        if self.route is not None:
+            self.listener.detach(self)
+
+    def write(self, data):
+        """Send data to the panel."""
+        if self.transport is not None:
+            if self.route is not None:
+                self.route.panel.stats.bytes_out += len(data)
+            self.transport.write(data)
+
+    def close(self):
+        """Close the socket."""
+        if self.transport is not None:
+            self.transport.close()
+
+
+class PanelListener:
+    """TCP server accepting any number of panels on one port."""
+
+    def __init__(self, hass: HomeAssistant, port: int) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.port = port
+        self.routes: dict[bytes, PanelRoute] = {}
+        self._server = None
+
+    async def async_start(self):
+        """Bind the port."""
+        self._server = await self.hass.loop.create_server(
+            lambda: PanelConnection(self), port=self.port
+        )
+
+    def register(self, panel: IsecNetPanel):
+        """Route connections announcing the panel's MAC to it."""
+        self.routes[panel.mac_address] = PanelRoute(panel)
+
+    def unregister(self, panel: IsecNetPanel):
+        """Stop routing to the panel; stop listening once no panel is left."""
+        route = self.routes.pop(panel.mac_address, None)
+        if route is not None and route.connection is not None:
+            route.connection.close()
+        if not self.routes:
+            self.close()
+
+    def attach(self, connection: PanelConnection, identity):
+        """Hand an identified connection over to its panel."""
+        route = self.routes.get(identity.mac)
+        if route is None:
+            LOGGER.warning("panel %s (%s) from %s is not configured, closing",
+                           identity.mac.hex(), identity.model, connection.peer)
+            connection.close()
+            return
+        if route.connection is not None and route.connection is not connection:
+            route.connection.route = None
+            route.connection.close()
+        connection.route = route
+        route.connection = connection
+        route.peer = connection.peer
+        route.connected_since = time.time()
+        route.panel.connection_made(connection, identity)
+
+    def detach(self, connection: PanelConnection):
+        """Forget a connection that went away."""
+        route = connection.route
+        connection.route = None
+        if route.connection is connection:
+            route.connection = None
+            route.connected_since = None
+        route.panel.connection_lost(connection)
+
+    def close(self):
+        """Stop listening and drop every connection."""
+        for route in self.routes.values():
+            if route.connection is not None:
+                route.connection.close()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        listeners = self.hass.data.get(DOMAIN, {}).get(DATA_LISTENERS, {})
+        if listeners.get(self.port) is self:
+            del listeners[self.port]
+
+
+async def async_get_listener(hass: HomeAssistant, port: int) -> PanelListener:
+    """Return the listener for port, starting it if needed."""
+    listeners = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_LISTENERS, {})
+    listener = listeners.get(port)
+    if listener is None:
+        # Publish before binding so entries set up concurrently share it.
+        listener = listeners[port] = PanelListener(hass, port)
+        try:
+            await listener.async_start()
+        except OSError:
+            del listeners[port]
+            raise
+    return listener
+
+
+class ProbeConnection(PanelConnection):
+    """The single connection accepted by ``async_probe_panel``."""
+
+    def connection_lost(self, exc):
+        """Fail the probe if the panel goes away before identifying."""
+        super().connection_lost(exc)
+        self.listener.connection_lost(self)
+
+
+class PanelProbe:
+    """Stand-in listener that only identifies the first panel to dial in."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.identity = hass.loop.create_future()
+        self._server = None
+
+    def connection_factory(self):
+        """Accept one connection and stop listening."""
+        # The server may only be closed once the transport is attached.
+        self.hass.loop.call_soon(self._server.close)
+        return ProbeConnection(self)
+
+    def attach(self, connection: PanelConnection, identity):
+        """Record the identity announced in the 0x95 frame and hang up."""
+        if not self.identity.done():
+            self.identity.set_result(identity)
+        connection.close()
+
+    def connection_lost(self, connection: PanelConnection):
+        """Fail if the connection closed before the panel identified itself."""
+        if not self.identity.done():
+            self.identity.set_exception(
+                ConnectionError(f"{connection.peer} closed before identifying")
+            )
+
+    async def async_probe(self, port: int, timeout: float):
+        """Bind port, wait for one panel handshake and return its identity."""
+        self._server = await self.hass.loop.create_server(
+            self.connection_factory, port=port
+        )
+        try:
+            return await asyncio.wait_for(self.identity, timeout)
+        finally:
+            self._server.close()
+
+
+async def async_probe_panel(hass: HomeAssistant, port: int,
+                            timeout: float = DEFAULT_PROBE_TIMEOUT):
+    """Wait for a panel to dial in on port and return its ``ExtendedConnect``.
+
+    Only the 0x94/0x95 handshake is performed: no panel client, poller or
+    listener is started, and the connection is closed as soon as the panel
+    has identified itself, so it redials the runtime listener afterwards.
+    Raises ``asyncio.TimeoutError`` if no panel identifies itself in time
+    and ``OSError`` if the port cannot be bound.
+    """
+    return await PanelProbe(hass).async_probe(port, timeout)
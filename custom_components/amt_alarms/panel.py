@@ -0,0 +1,375 @@
+"""AMT panel client for connections accepted by the integration itself.
+
+``IsecNetPanel`` exposes the subset of the ``AMTAlarm`` interface used by
+``AlarmHub`` so the hub and the entities work the same whichever side
+owns the socket.  The connection is handed over by a ``PanelListener``
+once the panel has identified itself, or by a ``ReceptorLink`` for panels
+reached through a Receptor IP.
+"""
+import asyncio
+from collections import deque
+
+from .const import LOGGER
+from .isecnet import (
+    ACK,
+    BYPASS_BITMAP_LENGTH,
+    CMD_CONNECT,
+    CMD_CONTACT_ID,
+    CMD_CONTACT_ID_DATETIME,
+    CMD_CONTACT_ID_PHOTO,
+    CMD_DATETIME_REQUEST,
+    CMD_HEARTBEAT,
+    CMD_ISEC_MOBILE,
+    CMD_PARTITION_NAMES,
+    CMD_ZONE_NAMES,
+    ISEC_ARM,
+    ISEC_BYPASS,
+    ISEC_DISARM,
+    ISEC_PANIC,
+    ISEC_PGM,
+    ISEC_STATUS,
+    MAX_PARTITIONS,
+    MAX_PGMS,
+    MAX_ZONES,
+    PANIC_AUDIBLE,
+    PANIC_FIRE,
+    PANIC_MEDICAL,
+    PANIC_SILENT,
+    STATUS_MIN_LENGTH,
+    IsecNetError,
+    build_frame,
+    build_isec_mobile,
+    datetime_bcd,
+    decode_status,
+    parse_contact_id,
+    parse_names,
+    partition_byte,
+    pgm_data,
+)
+from .stats import HubStats
+
+RESPONSE_TIMEOUT = 10
+
+
+class IsecNetPanel:
+    """One AMT panel reached over an IsecNet V1 connection."""
+
+    max_sensors = MAX_ZONES
+    max_partitions = MAX_PARTITIONS
+    max_pgms = MAX_PGMS
+    names_supported = True
+    pgm_supported = True
+    # Seconds to wait for a reply once the request is written.
+    reply_timeout = RESPONSE_TIMEOUT
+
+    def __init__(self, mac: bytes, default_password=None, logger=LOGGER,
+                 stats: HubStats | None = None) -> None:
+        """Initialize."""
+        self.mac_address = mac
+        self.stats = stats if stats is not None else HubStats()
+        self.default_password = default_password
+        self.system_password = None
+        self.general_status = None
+        self.model = "AMT"
+        self.firmware = None
+        self.logger = logger
+
+        # Bitmap of the zones in use, from the entry: zone programming is
+        # only readable over isecprogram, which this client does not speak.
+        self.configured_zone_mask = 0
+        self.status = None
+        self._listeners = []
+        self._connection = None
+        self._connected = asyncio.Event()
+        self._pending: deque = deque()
+        self._queries: dict[int, deque] = {}
+
+    # State, in the shape AMTAlarm exposes it.
+
+    def _bits(self, mask, width):
+        if mask is None:
+            return [None] * width
+        return [bool((mask >> i) & 1) for i in range(width)]
+
+    @property
+    def open_sensors(self):
+        """Return open zones as a list of booleans."""
+        return self._bits(self.status and self.status.open_zones, self.max_sensors)
+
+    @property
+    def bypassed_sensors(self):
+        """Return bypassed zones as a list of booleans."""
+        return self._bits(self.status and self.status.bypassed_zones, self.max_sensors)
+
+    @property
+    def partitions(self):
+        """Return armed partitions as a list of booleans."""
+        return self._bits(self.status and self.status.armed_partitions, self.max_partitions)
+
+    @property
+    def triggered_partitions(self):
+        """Return triggered partitions as a list of booleans."""
+        return self._bits(self.status and self.status.triggered_partitions, self.max_partitions)
+
+    def is_sensor_configured(self, index):
+        """Check if the numbered sensor is one of the configured zones."""
+        return index < self.max_sensors and bool((self.configured_zone_mask >> index) & 1)
+
+    def is_partition_configured(self, index):
+        """Check if the numbered partition is configured."""
+        return index < self.max_partitions
+
+    def listen_event(self, listener):
+        """Add object as listener."""
+        self._listeners.append(listener)
+
+    def remove_listen_event(self, listener):
+        """Remove object as listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, method="alarm_update", *args):
+        for listener in list(self._listeners):
+            handler = getattr(listener, method, None)
+            if handler is not None:
+                handler(*args)
+
+    # Connection handling, driven by the listener.
+
+    @property
+    def connected(self):
+        """Return whether the panel currently has a connection."""
+        return self._connection is not None
+
+    def connection_made(self, connection, identity=None):
+        """Attach the connection of a panel that announced itself.
+
+        Requests written to a connection it replaces fail, as on a
+        disconnect: their replies will not come over the new one.
+        """
+        if self._connection is not None and self._connection is not connection:
+            self._connection.close()
+            self._fail_waiters()
+        self._connection = connection
+        self.stats.connects += 1
+        if identity is not None:
+            self.model = identity.model
+            self.firmware = identity.firmware
+        self._connected.set()
+        self.logger.debug("panel %s connected", self.mac_address.hex())
+
+    def connection_lost(self, connection):
+        """Detach a connection that went away."""
+        if connection is not self._connection:
+            return
+        self._connection = None
+        self.stats.disconnects += 1
+        self._connected.clear()
+        self._fail_waiters()
+        self.status = None
+        self._notify()
+
+    def _fail_waiters(self):
+        """Fail every request waiting for a reply."""
+        for waiters in (self._pending, *self._queries.values()):
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError("panel disconnected"))
+
+    def frame_received(self, command, payload):
+        """Handle a frame from the panel.
+
+        payload may be a view into the receive buffer, valid for this call.
+        """
+        self.stats.frame(command)
+        if command == CMD_ISEC_MOBILE:
+            self._isec_mobile_received(payload)
+        elif command == CMD_HEARTBEAT:
+            self._connection.write(bytes((ACK,)))
+            self._notify("alarm_heartbeat")
+        elif command in (CMD_CONTACT_ID, CMD_CONTACT_ID_DATETIME, CMD_CONTACT_ID_PHOTO):
+            # Acknowledge first: the panel retransmits unacknowledged events.
+            self._connection.write(bytes((ACK,)))
+            self._contact_id_received(command, payload)
+        elif command == CMD_CONNECT:
+            self._connection.write(bytes((ACK,)))
+        elif command == CMD_DATETIME_REQUEST:
+            # Answered by the hub, from Home Assistant's clock.
+            self._notify("alarm_datetime_request")
+        elif self._queries.get(command):
+            waiters = self._queries[command]
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_result(bytes(payload))
+                    break
+        else:
+            self.logger.debug("ignoring frame 0x%02x from %s", command,
+                              self.mac_address.hex())
+
+    def _contact_id_received(self, command, payload):
+        try:
+            event = parse_contact_id(command, payload)
+        except ValueError as err:
+            self.logger.warning("invalid Contact ID frame from %s: %s",
+                                self.mac_address.hex(), err)
+            return
+        self._notify("alarm_event", event)
+
+    def _isec_mobile_received(self, payload):
+        if len(payload) >= STATUS_MIN_LENGTH:
+            self.status = decode_status(payload)
+            self._notify()
+        # Replies come back in the order the commands were written.
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_result(bytes(payload))
+                break
+
+    async def wait_connection(self):
+        """Wait until the panel connects."""
+        await self._connected.wait()
+        return True
+
+    async def wait_connection_and_update(self):
+        """Wait until the panel connects and answers a status request."""
+        await self.wait_connection()
+        await self.send_request_zones()
+        return True
+
+    def close(self):
+        """Drop the connection, if any."""
+        if self._connection is not None:
+            self._connection.close()
+            self.connection_lost(self._connection)
+
+    # Device queries.
+
+    async def _query(self, command, data=b""):
+        if self._connection is None:
+            raise ConnectionError("panel not connected")
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._queries.setdefault(command, deque())
+        waiters.append(future)
+        self._connection.write(build_frame(command, data))
+        return await self._wait_reply(future, waiters)
+
+    async def _wait_reply(self, future, waiters):
+        """Wait for the reply future queued in waiters.
+
+        A request given up on, by timeout or cancellation, leaves the
+        queue: otherwise the next reply would resolve it and every later
+        reply would go to the request before its own.
+        """
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.reply_timeout)
+        finally:
+            if not future.done():
+                future.cancel()
+            if future in waiters:
+                waiters.remove(future)
+
+    async def _read_names(self, command, count):
+        names = {}
+        index = 0
+        while index < count:
+            first, chunk = parse_names(await self._query(command, bytes((index,))))
+            if first != index or not chunk:
+                raise ValueError(f"names reply for {first} answering a request for {index}")
+            for offset, name in enumerate(chunk):
+                if name is not None and first + offset < count:
+                    names[first + offset] = name
+            index += len(chunk)
+        return names
+
+    async def async_read_names(self, zones, partitions):
+        """Read the names of the first zones and partitions in bulk.
+
+        Each 0xD1/0xD3 reply carries as many names as fit in a frame, so
+        48 zones take a handful of round trips.  Returns two dicts mapping
+        0-based index to name, leaving out blank names.
+        """
+        return (
+            await self._read_names(CMD_ZONE_NAMES, zones),
+            await self._read_names(CMD_PARTITION_NAMES, partitions),
+        )
+
+    def send_datetime(self, when):
+        """Answer a 0x80 date/time request with when, a local datetime."""
+        if self._connection is not None:
+            self._connection.write(build_frame(CMD_DATETIME_REQUEST, datetime_bcd(when)))
+
+    # ISEC Mobile commands.
+
+    async def _send(self, command, data=b"", password=None):
+        if self._connection is None:
+            raise ConnectionError("panel not connected")
+        if password is None:
+            password = self.default_password
+        future = self._write_request(build_isec_mobile(password, command, data))
+        reply = await self._wait_reply(future, self._pending)
+        if len(reply) < STATUS_MIN_LENGTH and reply[:1] != bytes((ACK,)):
+            raise IsecNetError(reply[0] if reply else 0)
+        return reply
+
+    def _write_request(self, frame):
+        """Write an ISEC Mobile request; return the future its reply resolves."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        self._connection.write(frame)
+        return future
+
+    async def send_request_zones(self):
+        """Request the status of zones and partitions."""
+        await self._send(ISEC_STATUS)
+
+    async def send_arm(self, code=None):
+        """Arm every partition."""
+        await self._send(ISEC_ARM, password=code)
+
+    async def send_arm_partition(self, index, code=None):
+        """Arm one partition."""
+        await self._send(ISEC_ARM, bytes((partition_byte(index),)), code)
+
+    async def send_disarm(self, code=None):
+        """Disarm every partition."""
+        await self._send(ISEC_DISARM, password=code)
+
+    async def send_disarm_partition(self, index, code=None):
+        """Disarm one partition."""
+        await self._send(ISEC_DISARM, bytes((partition_byte(index),)), code)
+
+    async def send_bypass(self, zones, code=None):
+        """Bypass the given 0-based zones."""
+        mask = 0
+        for zone in zones:
+            mask |= 1 << int(zone)
+        await self.send_bypass_bitmap(mask, code)
+
+    async def send_bypass_bitmap(self, mask, code=None):
+        """Bypass the zones of a bitmap (bit i = zone i), clearing the others."""
+        await self._send(
+            ISEC_BYPASS, mask.to_bytes(BYPASS_BITMAP_LENGTH, "little"), code
+        )
+
+    async def send_pgm(self, index, on, code=None):
+        """Switch one 0-based PGM output on or off."""
+        await self._send(ISEC_PGM, pgm_data(index, on), code)
+
+    async def send_silent_trigger(self, code=None):
+        """Trigger a silent panic."""
+        await self._send(ISEC_PANIC, bytes((PANIC_SILENT,)), code)
+
+    async def send_audible_trigger(self, code=None):
+        """Trigger an audible panic."""
+        await self._send(ISEC_PANIC, bytes((PANIC_AUDIBLE,)), code)
+
+    async def send_medical_trigger(self, code=None):
+        """Trigger a medical emergency."""
+        await self._send(ISEC_PANIC, bytes((PANIC_MEDICAL,)), code)
+
+    async def send_fire_trigger(self, code=None):
+        """Trigger a fire alarm."""
+        await self._send(ISEC_PANIC, bytes((PANIC_FIRE,)), code)
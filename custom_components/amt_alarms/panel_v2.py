@@ -0,0 +1,285 @@
+"""AMT 8000 client speaking IsecNet V2 over one authenticated session.
+
+The AMT 8000 does not dial in: the integration connects to it, as the
+mobile app does, authenticates once with 0xF0F0 and keeps the session
+open, reconnecting with a backoff when it drops.  Requests are
+pipelined: each is written as soon as it is sent and its reply is
+matched by command code, first come first served within a command, so
+a status poll and a burst of partition commands can be in flight
+together.
+"""
+import asyncio
+from collections import deque
+import hashlib
+
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_PROBE_TIMEOUT, DOMAIN, LOGGER
+from .isecnet import (
+    PANIC_AUDIBLE,
+    PANIC_FIRE,
+    PANIC_MEDICAL,
+    PANIC_SILENT,
+    IsecNetError,
+)
+from .isecnet_v2 import (
+    ALL_PARTITIONS,
+    CMD_ARM_DISARM,
+    CMD_AUTH,
+    CMD_BYPASS,
+    CMD_PANIC,
+    CMD_STATUS,
+    MAX_PARTITIONS,
+    MAX_ZONES,
+    MODE_ARM,
+    MODE_DISARM,
+    STATUS_LENGTH,
+    ZONE_BITMAP_LENGTH,
+    FrameParserV2,
+    build_frame,
+    decode_status,
+)
+from .panel import IsecNetPanel
+from .stats import HubStats
+
+RECONNECT_MIN_DELAY = 5
+RECONNECT_MAX_DELAY = 60
+# ISEC Mobile error code reported for a code other than the session's.
+WRONG_PASSWORD = 0xE1
+
+
+class V2Connection(asyncio.BufferedProtocol):
+    """The socket to an AMT 8000."""
+
+    def __init__(self, panel: "IsecNetV2Panel") -> None:
+        """Initialize."""
+        self.panel = panel
+        self.transport = None
+        self.closed = asyncio.get_running_loop().create_future()
+        self._parser = FrameParserV2()
+
+    def connection_made(self, transport):
+        """Remember the transport."""
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        """Return the parser buffer for the transport to receive into."""
+        return self._parser.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes):
+        """Split the received bytes into frames and dispatch them."""
+        stats = self.panel.stats
+        errors = self._parser.checksum_errors
+        frames = self._parser.buffer_updated(nbytes)
+        stats.bytes_in += nbytes
+        stats.checksum_errors += self._parser.checksum_errors - errors
+        for command, payload in frames:
+            self.panel.frame_received(command, payload)
+
+    def connection_lost(self, exc):
+        """Tell the panel, and whoever waits for the session to end."""
+        self.transport = None
+        self.panel.connection_lost(self)
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+    def write(self, data):
+        """Send data to the panel."""
+        if self.transport is not None:
+            self.panel.stats.bytes_out += len(data)
+            self.transport.write(data)
+
+    def close(self):
+        """Close the socket."""
+        if self.transport is not None:
+            self.transport.close()
+
+
+class IsecNetV2Panel(IsecNetPanel):
+    """One AMT 8000 reached over an IsecNet V2 session.
+
+    Experimental: the payload layouts are unverified (see ``isecnet_v2``).
+    The V2 app protocol does not announce a MAC address, so a stable id is
+    derived from the configured host and port to stand in for it.  Nor is
+    the zone and partition count read from the panel: they come from the
+    entry, capped at what the status reply can carry.
+    """
+
+    names_supported = False
+    pgm_supported = False
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int, default_password=None,
+                 logger=LOGGER, stats: HubStats | None = None, zone_count=1,
+                 partition_count=1) -> None:
+        """Initialize."""
+        mac = hashlib.blake2s(f"{host}:{port}".encode(), digest_size=6).digest()
+        super().__init__(mac, default_password=default_password, logger=logger, stats=stats)
+        self.max_sensors = max(1, min(zone_count, MAX_ZONES))
+        self.max_partitions = max(1, min(partition_count, MAX_PARTITIONS))
+        self.hass = hass
+        self.host = host
+        self.port = port
+        self.model = "AMT 8000"
+        self._waiters: dict[int, deque] = {}
+        self._task = None
+
+    # Session handling.
+
+    def start(self):
+        """Connect, and reconnect, in the background."""
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} v2 {self.host}:{self.port}"
+        )
+
+    async def _async_run(self):
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                connection = await self.async_open()
+                delay = RECONNECT_MIN_DELAY
+                await connection.closed
+            except (OSError, asyncio.TimeoutError, IsecNetError) as err:
+                self.logger.warning("AMT 8000 %s:%s session failed: %s",
+                                    self.host, self.port, err)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def async_open(self):
+        """Connect, authenticate and return the connection."""
+        _, connection = await self.hass.loop.create_connection(
+            lambda: V2Connection(self), self.host, self.port
+        )
+        try:
+            await self._request(connection, CMD_AUTH,
+                                str(self.default_password or "").encode("ascii"))
+        except BaseException:
+            connection.close()
+            raise
+        self.connection_made(connection)
+        return connection
+
+    def _fail_waiters(self):
+        """Fail every request in flight, matched by command code."""
+        for waiters in self._waiters.values():
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError("panel disconnected"))
+        super()._fail_waiters()
+
+    def connection_lost(self, connection):
+        """Fail the requests of a connection that went away.
+
+        A session lost while authenticating is not attached yet; its auth
+        request is the only one in flight.
+        """
+        if self._connection is None:
+            self._fail_waiters()
+        super().connection_lost(connection)
+
+    def frame_received(self, command, payload):
+        """Handle a frame from the panel, matching it to the oldest request.
+
+        payload may be a view into the receive buffer, valid for this call.
+        """
+        self.stats.frame(command)
+        if command == CMD_STATUS and len(payload) >= STATUS_LENGTH:
+            self.status = decode_status(payload)
+            self._notify()
+        waiters = self._waiters.get(command)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(bytes(payload))
+                return
+        if command != CMD_STATUS:
+            self.logger.debug("ignoring frame 0x%04x from %s", command, self.host)
+
+    def close(self):
+        """Stop reconnecting and drop the session."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        super().close()
+
+    # Requests.
+
+    async def _request(self, connection, command, data=b""):
+        """Write a request and wait for the reply carrying the same command."""
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(command, deque())
+        waiters.append(future)
+        connection.write(build_frame(command, data))
+        reply = await self._wait_reply(future, waiters)
+        if command != CMD_STATUS and reply[:1] != b"\x00":
+            raise IsecNetError(reply[0] if reply else 0)
+        return reply
+
+    async def _send(self, command, data=b"", password=None):
+        if self._connection is None:
+            raise ConnectionError("panel not connected")
+        if password is not None and str(password) != str(self.default_password):
+            # The session is authenticated with the configured password;
+            # another code would need a session of its own.
+            raise IsecNetError(WRONG_PASSWORD)
+        return await self._request(self._connection, command, data)
+
+    async def send_request_zones(self):
+        """Request the status of zones and partitions."""
+        await self._send(CMD_STATUS)
+
+    async def send_arm(self, code=None):
+        """Arm every partition."""
+        await self._send(CMD_ARM_DISARM, bytes((ALL_PARTITIONS, MODE_ARM)), code)
+
+    async def send_arm_partition(self, index, code=None):
+        """Arm one partition."""
+        await self._send(CMD_ARM_DISARM, bytes((index + 1, MODE_ARM)), code)
+
+    async def send_disarm(self, code=None):
+        """Disarm every partition."""
+        await self._send(CMD_ARM_DISARM, bytes((ALL_PARTITIONS, MODE_DISARM)), code)
+
+    async def send_disarm_partition(self, index, code=None):
+        """Disarm one partition."""
+        await self._send(CMD_ARM_DISARM, bytes((index + 1, MODE_DISARM)), code)
+
+    async def send_bypass(self, zones, code=None):
+        """Bypass the given 0-based zones."""
+        mask = 0
+        for zone in zones:
+            mask |= 1 << int(zone)
+        await self.send_bypass_bitmap(mask, code)
+
+    async def send_bypass_bitmap(self, mask, code=None):
+        """Bypass the zones of a bitmap (bit i = zone i), clearing the others."""
+        await self._send(CMD_BYPASS, mask.to_bytes(ZONE_BITMAP_LENGTH, "little"), code)
+
+    async def send_silent_trigger(self, code=None):
+        """Trigger a silent panic."""
+        await self._send(CMD_PANIC, bytes((PANIC_SILENT,)), code)
+
+    async def send_audible_trigger(self, code=None):
+        """Trigger an audible panic."""
+        await self._send(CMD_PANIC, bytes((PANIC_AUDIBLE,)), code)
+
+    async def send_medical_trigger(self, code=None):
+        """Trigger a medical emergency."""
+        await self._send(CMD_PANIC, bytes((PANIC_MEDICAL,)), code)
+
+    async def send_fire_trigger(self, code=None):
+        """Trigger a fire alarm."""
+        await self._send(CMD_PANIC, bytes((PANIC_FIRE,)), code)
+
+
+async def async_probe_v2_panel(hass: HomeAssistant, host: str, port: int, password,
+                               timeout: float = DEFAULT_PROBE_TIMEOUT):
+    """Connect to an AMT 8000, authenticate and hang up.
+
+    Raises ``asyncio.TimeoutError`` if the panel does not answer in time,
+    ``OSError`` if it cannot be reached and ``IsecNetError`` if it refuses
+    the password.
+    """
+    panel = IsecNetV2Panel(hass, host, port, default_password=password)
+    connection = await asyncio.wait_for(panel.async_open(), timeout)
+    connection.close()
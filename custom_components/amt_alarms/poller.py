@@ -0,0 +1,107 @@
+"""Adaptive status polling for AMT panels.
+
+No Home Assistant imports: the poll timer runs on ``hass.loop`` and each
+poll runs as a background task of ``hass``.
+"""
+import time
+
+from .const import DOMAIN, LOGGER
+
+
+class AdaptivePoller:
+    """Schedule ISEC Mobile status requests (0x5B) for one panel.
+
+    Right after a user command or a Contact ID event the panel is polled
+    every ``fast_interval`` seconds for ``fast_window`` seconds.  Outside
+    that window the interval doubles after every quiet poll, up to
+    ``max_interval``, as long as the panel keeps proving it is alive with
+    heartbeats or status replies.  A change of zones, partitions or
+    bypasses, or a poll that goes unanswered, drops the interval back to
+    ``fast_interval``.
+    """
+
+    def __init__(self, hass, poll, fast_interval, fast_window, max_interval) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._poll = poll
+        self.interval = fast_interval
+        self.configure(fast_interval, fast_window, max_interval)
+        self._fast_until = 0.0
+        self._alive = False
+        self._timer = None
+        self._running = False
+
+    @property
+    def running(self):
+        """Return whether the poller is started."""
+        return self._running
+
+    def configure(self, fast_interval, fast_window, max_interval):
+        """Set the intervals; the next poll is scheduled with them."""
+        self.fast_interval = fast_interval
+        self.fast_window = fast_window
+        self.max_interval = max(max_interval, fast_interval)
+        self.interval = min(max(self.interval, fast_interval), self.max_interval)
+
+    def start(self):
+        """Start polling, beginning with a fast window."""
+        self._running = True
+        self.kick()
+
+    def stop(self):
+        """Stop polling."""
+        self._running = False
+        self._cancel()
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule(self, delay):
+        self._timer = self.hass.loop.call_later(delay, self._fire)
+
+    def _fire(self):
+        self._timer = None
+        self.hass.async_create_background_task(self._async_poll(), f"{DOMAIN} status poll")
+
+    def kick(self):
+        """Poll now and keep polling fast for the configured window."""
+        self._fast_until = time.monotonic() + self.fast_window
+        self.interval = self.fast_interval
+        if self._running:
+            self._cancel()
+            self._schedule(0)
+
+    def note_alive(self):
+        """Record a heartbeat or status reply; the backoff keeps growing."""
+        self._alive = True
+
+    def note_changed(self):
+        """Record a state change; the backoff starts over.
+
+        A poll already scheduled after a long quiet spell is brought
+        forward to ``fast_interval`` from now.
+        """
+        self._alive = True
+        self.interval = self.fast_interval
+        if self._running and self._timer is not None:
+            self._cancel()
+            self._schedule(self.interval)
+
+    async def _async_poll(self):
+        if time.monotonic() < self._fast_until:
+            self.interval = self.fast_interval
+        elif self._alive:
+            self.interval = min(self.interval * 2, self.max_interval)
+        else:
+            self.interval = self.fast_interval
+        self._alive = False
+
+        try:
+            await self._poll()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.debug("status poll failed", exc_info=True)
+
+        if self._running and self._timer is None:
+            self._schedule(self.interval)
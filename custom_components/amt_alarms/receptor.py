@@ -0,0 +1,387 @@
+"""Panels reached through an Intelbras Receptor IP over one outbound link.
+
+The integration connects to the receptor once, initialises the link with
+0xE0 and then, for each request, selects the panel account with 0xE3 and
+0xE4 before relaying the ISEC Mobile (0xE9) frame.  Only one account can
+be linked at a time, so requests wait in one queue per account and a
+single worker serves the accounts round-robin, one request per turn: a
+panel that is slow to answer costs the others at most one request
+timeout per round instead of holding the link.
+
+Each queued request carries the future its reply resolves.  Only the
+time on the wire is timed by the link; a request whose caller gave up
+while it was still queued is dropped unsent, so its reply can never be
+taken for the answer to a later request.
+
+The receptor is assumed to answer 0xE0, 0xE3 and 0xE4 with a frame
+echoing the command whose first payload byte is 0 on success.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING
+
+from .const import DOMAIN, LOGGER
+from .isecnet import (
+    ACK,
+    CMD_CONTACT_ID,
+    CMD_CONTACT_ID_DATETIME,
+    CMD_CONTACT_ID_PHOTO,
+    CMD_HEARTBEAT,
+    CMD_ISEC_MOBILE,
+    CMD_ISEC_PROGRAM,
+    CMD_RECEPTOR_ACCOUNT,
+    CMD_RECEPTOR_INIT,
+    CMD_RECEPTOR_LINK,
+    FrameParser,
+    account_digits,
+    build_frame,
+    parse_contact_id,
+)
+from .panel import IsecNetPanel
+from .stats import HubStats
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+REQUEST_TIMEOUT = 5
+RECONNECT_MIN_DELAY = 5
+RECONNECT_MAX_DELAY = 60
+DATA_RECEPTORS = "receptors"
+
+
+class ReceptorError(Exception):
+    """The receptor refused a link command."""
+
+    def __init__(self, command, status):
+        """Initialize."""
+        super().__init__(f"receptor refused 0x{command:02x} with status 0x{status:02x}")
+        self.command = command
+        self.status = status
+
+
+class ReceptorPanel(IsecNetPanel):
+    """A panel account served through a ``ReceptorLink``.
+
+    The account number stands in for the MAC address, which the receptor
+    does not relay.  Only ISEC Mobile frames are relayed, so names cannot
+    be read.
+    """
+
+    names_supported = False
+    # The link times each request on the wire; time spent queued behind
+    # other accounts is bounded by the caller.
+    reply_timeout = None
+
+    def __init__(self, account: int, default_password=None, logger=LOGGER,
+                 stats: HubStats | None = None) -> None:
+        """Initialize."""
+        super().__init__(account.to_bytes(6, "big"), default_password=default_password,
+                         logger=logger, stats=stats)
+        self.account = account
+
+    def _write_request(self, frame):
+        future = asyncio.get_running_loop().create_future()
+        self._connection.request(frame, future)
+        return future
+
+    def link_down(self):
+        """Disconnect after the receptor link went away."""
+        if self._connection is not None:
+            self.connection_lost(self._connection)
+
+
+class AccountChannel:
+    """The connection handed to a ``ReceptorPanel``, one per account.
+
+    Acknowledgements go straight out on the link; requests are queued
+    until the account's turn.
+    """
+
+    def __init__(self, link: "ReceptorLink", account: int) -> None:
+        """Initialize."""
+        self.link = link
+        self.account = account
+
+    def write(self, data):
+        """Queue a frame for the account, or send an acknowledgement."""
+        if data == bytes((ACK,)):
+            self.link.write(data)
+        else:
+            self.link.enqueue(self.account, data)
+
+    def request(self, data, future):
+        """Queue a request whose reply resolves future."""
+        self.link.enqueue(self.account, data, future)
+
+    def close(self):
+        """Drop the requests still queued for the account."""
+        self.link.drop_queue(self.account)
+
+
+class ReceptorConnection(asyncio.BufferedProtocol):
+    """The socket to the receptor."""
+
+    def __init__(self, link: "ReceptorLink") -> None:
+        """Initialize."""
+        self.link = link
+        self.transport = None
+        self.parser = FrameParser()
+
+    def connection_made(self, transport):
+        """Remember the transport."""
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        """Return the parser buffer for the transport to receive into."""
+        return self.parser.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes):
+        """Split the received bytes into frames and dispatch them."""
+        for command, payload in self.parser.buffer_updated(nbytes):
+            self.link.frame_received(command, payload)
+
+    def connection_lost(self, exc):
+        """Tell the link."""
+        self.transport = None
+        self.link.connection_lost(exc)
+
+
+class ReceptorLink:
+    """One connection to a Receptor IP shared by every account behind it."""
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.host = host
+        self.port = port
+        self.panels: dict[int, ReceptorPanel] = {}
+        self._queues: dict[int, deque] = {}
+        self._ready: deque = deque()
+        self._wakeup = asyncio.Event()
+        self._protocol = None
+        self._up = False
+        self._reply = None
+        self._linked = None
+        self._task = None
+
+    @property
+    def connected(self):
+        """Return whether the link to the receptor is initialised."""
+        return self._up
+
+    def start(self):
+        """Start connecting, and reconnecting, in the background."""
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} receptor {self.host}:{self.port}"
+        )
+
+    def register(self, panel: ReceptorPanel):
+        """Serve the panel's account over the link."""
+        self.panels[panel.account] = panel
+        if self.connected:
+            panel.connection_made(AccountChannel(self, panel.account))
+
+    def unregister(self, panel: ReceptorPanel):
+        """Stop serving the panel; close the link once no panel is left."""
+        if self.panels.get(panel.account) is panel:
+            del self.panels[panel.account]
+        self.drop_queue(panel.account)
+        if not self.panels:
+            self.close()
+
+    # Request scheduling.
+
+    def enqueue(self, account, data, future=None):
+        """Queue a frame for account, to be sent on the account's turn.
+
+        future, if given, is resolved with the reply's payload or failed;
+        once it is done the frame is dropped instead of sent.
+        """
+        queue = self._queues.setdefault(account, deque())
+        if not queue:
+            self._ready.append(account)
+        queue.append((data, future))
+        self._wakeup.set()
+
+    def drop_queue(self, account):
+        """Fail the requests queued for account."""
+        _fail_queue(self._queues.pop(account, ()))
+        if account in self._ready:
+            self._ready.remove(account)
+
+    async def _async_serve(self):
+        """Send queued requests, one per account in turn, until the link fails."""
+        while True:
+            if self._protocol.transport is None:
+                raise ConnectionError("receptor connection lost")
+            if not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            account = self._ready.popleft()
+            queue = self._queues.get(account)
+            panel = self.panels.get(account)
+            if not queue or panel is None:
+                continue
+            data, future = queue.popleft()
+            if queue:
+                self._ready.append(account)
+            else:
+                del self._queues[account]
+            if future is not None and future.done():
+                # The caller gave up while the request was queued.
+                continue
+            try:
+                if self._linked != account:
+                    self._linked = None
+                    digits = account_digits(account)
+                    await self._async_request(CMD_RECEPTOR_ACCOUNT, build_frame(
+                        CMD_RECEPTOR_ACCOUNT, digits))
+                    await self._async_request(CMD_RECEPTOR_LINK, build_frame(
+                        CMD_RECEPTOR_LINK, digits))
+                    self._linked = account
+                if future is not None and future.done():
+                    continue
+                command, payload = await self._async_request(CMD_ISEC_MOBILE, data)
+            except asyncio.TimeoutError:
+                # Relink before the next request so a late reply is not
+                # taken for the answer to another account's request.
+                self._linked = None
+                _fail(future, TimeoutError(f"account {account:04d} did not answer"))
+                continue
+            except ReceptorError as err:
+                _fail(future, ConnectionError(str(err)))
+                continue
+            except BaseException:
+                _fail(future, ConnectionError("receptor connection lost"))
+                raise
+            panel.frame_received(command, payload)
+            if future is not None and not future.done():
+                future.set_result(bytes(payload))
+
+    async def _async_request(self, command, frame):
+        """Write frame and return the (command, payload) answering it."""
+        self._reply = (command, asyncio.get_running_loop().create_future())
+        self.write(frame)
+        try:
+            reply = await asyncio.wait_for(self._reply[1], REQUEST_TIMEOUT)
+        finally:
+            self._reply = None
+        if command != CMD_ISEC_MOBILE and reply[1][:1] not in (b"", b"\x00"):
+            raise ReceptorError(command, reply[1][0])
+        return reply
+
+    # Connection handling.
+
+    async def _async_run(self):
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                await self._async_open()
+                delay = RECONNECT_MIN_DELAY
+                await self._async_serve()
+            except (OSError, asyncio.TimeoutError, ReceptorError) as err:
+                LOGGER.warning("receptor %s:%s link failed: %s", self.host, self.port, err)
+            self._drop()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _async_open(self):
+        _, self._protocol = await self.hass.loop.create_connection(
+            lambda: ReceptorConnection(self), self.host, self.port
+        )
+        await self._async_request(CMD_RECEPTOR_INIT, build_frame(CMD_RECEPTOR_INIT))
+        self._up = True
+        LOGGER.debug("receptor %s:%s linked, serving %d accounts",
+                     self.host, self.port, len(self.panels))
+        for account, panel in self.panels.items():
+            panel.connection_made(AccountChannel(self, account))
+
+    def _drop(self):
+        """Close the socket and disconnect every panel."""
+        protocol, self._protocol = self._protocol, None
+        self._up = False
+        self._linked = None
+        for queue in self._queues.values():
+            _fail_queue(queue)
+        self._queues.clear()
+        self._ready.clear()
+        if protocol is not None and protocol.transport is not None:
+            protocol.transport.close()
+        for panel in self.panels.values():
+            panel.link_down()
+
+    def write(self, data):
+        """Send data to the receptor."""
+        if self._protocol is not None and self._protocol.transport is not None:
+            self._protocol.transport.write(data)
+
+    def frame_received(self, command, payload):
+        """Handle a frame from the receptor.
+
+        payload is a view into the receive buffer, valid for this call.
+        """
+        if self._reply is not None and self._reply[0] == command:
+            future = self._reply[1]
+            if not future.done():
+                future.set_result((command, bytes(payload)))
+        elif command in (CMD_CONTACT_ID, CMD_CONTACT_ID_DATETIME, CMD_CONTACT_ID_PHOTO):
+            self._event_received(command, payload)
+        elif command == CMD_HEARTBEAT:
+            self.write(bytes((ACK,)))
+        elif command in (CMD_ISEC_MOBILE, CMD_ISEC_PROGRAM):
+            LOGGER.debug("dropping late 0x%02x reply from receptor %s", command, self.host)
+        else:
+            LOGGER.debug("ignoring frame 0x%02x from receptor %s", command, self.host)
+
+    def _event_received(self, command, payload):
+        """Route a relayed Contact ID event to its account's panel."""
+        try:
+            account = parse_contact_id(command, payload).account
+        except ValueError:
+            account = None
+        panel = self.panels.get(account)
+        if panel is None or not panel.connected:
+            # Acknowledge anyway so the receptor does not resend it forever.
+            LOGGER.debug("event for unknown account %s from receptor %s", account, self.host)
+            self.write(bytes((ACK,)))
+            return
+        panel.frame_received(command, payload)
+
+    def connection_lost(self, exc):
+        """Fail the request in flight; the run loop reconnects."""
+        if self._reply is not None and not self._reply[1].done():
+            self._reply[1].set_exception(ConnectionError("receptor connection lost"))
+        self._wakeup.set()
+
+    def close(self):
+        """Stop the link and disconnect every panel."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._drop()
+        receptors = self.hass.data.get(DOMAIN, {}).get(DATA_RECEPTORS, {})
+        if receptors.get((self.host, self.port)) is self:
+            del receptors[(self.host, self.port)]
+
+
+def _fail(future, error):
+    if future is not None and not future.done():
+        future.set_exception(error)
+
+
+def _fail_queue(queue):
+    for _, future in queue:
+        _fail(future, ConnectionError("receptor link down"))
+
+
+def async_get_receptor(hass: HomeAssistant, host: str, port: int) -> ReceptorLink:
+    """Return the link to the receptor at host:port, starting it if needed."""
+    receptors = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_RECEPTORS, {})
+    link = receptors.get((host, port))
+    if link is None:
+        link = receptors[(host, port)] = ReceptorLink(hass, host, port)
+        link.start()
+    return link
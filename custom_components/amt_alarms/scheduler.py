@@ -0,0 +1,137 @@
+"""Priority scheduling of the commands a hub sends to its panel.
+
+Every command, poll and maintenance read of a hub goes through one
+``CommandScheduler``, which decides when it may be written to the panel:
+
+- Waiting commands start in priority order, first come first served
+  within a priority.
+- Up to ``max_in_flight`` commands may await their replies at once, so a
+  burst of per-partition commands is still pipelined.
+- Status polls and maintenance reads only start when nothing else is in
+  flight, so at most one of them is ever ahead of a user's command.
+
+Each attempt has a timeout per priority.  An attempt that times out or
+finds the panel disconnected is queued again, at its original place,
+until its priority's retries run out; a command the panel rejected is
+not retried.  Urgent commands get no retries: a timed out frame may
+still have reached the panel, and a panic must not fire twice.  No Home
+Assistant imports.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+
+from .const import LOGGER
+
+PRIORITY_URGENT = 0  # panic triggers, disarm
+PRIORITY_COMMAND = 1  # arm, bypass, PGM
+PRIORITY_POLL = 2  # status polls
+PRIORITY_MAINTENANCE = 3  # name reads
+PRIORITY_NAMES = ("urgent", "command", "poll", "maintenance")
+
+# Per priority: seconds per attempt, and attempts after the first.
+TIMEOUTS = (15, 15, 15, 120)
+RETRIES = (0, 1, 0, 0)
+RETRY_DELAY = 0.5
+MAX_IN_FLIGHT = 4
+
+
+class CommandScheduler:
+    """Order one hub's commands by priority on the panel connection."""
+
+    def __init__(self, stats, max_in_flight=MAX_IN_FLIGHT):
+        """Initialize with nothing queued."""
+        self.stats = stats
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        # Heap of [priority, sequence, future]; the future is resolved
+        # when the command may start.
+        self._queue: list = []
+        self._sequence = itertools.count()
+        self._closed = False
+
+    @property
+    def depth(self):
+        """Return the number of commands waiting for their turn."""
+        return len(self._queue)
+
+    async def run(self, priority, send, *args):
+        """Await send(*args) when its turn comes and return its result."""
+        sequence = next(self._sequence)
+        attempts = RETRIES[priority] + 1
+        for attempt in range(attempts):
+            await self._acquire(priority, sequence)
+            try:
+                return await asyncio.wait_for(send(*args), TIMEOUTS[priority])
+            except (asyncio.TimeoutError, ConnectionError) as err:
+                if isinstance(err, asyncio.TimeoutError):
+                    self.stats.command_timeouts += 1
+                if attempt == attempts - 1 or self._closed:
+                    raise
+                self.stats.command_retries += 1
+                LOGGER.debug("retrying %s command after %r",
+                             PRIORITY_NAMES[priority], err)
+            finally:
+                self._release()
+            await asyncio.sleep(RETRY_DELAY)
+
+    def close(self):
+        """Fail every waiting command."""
+        self._closed = True
+        queue, self._queue = self._queue, []
+        for _, _, future in queue:
+            if not future.done():
+                future.set_exception(ConnectionError("hub closed"))
+        self.stats.queue_depth = 0
+
+    def _may_start(self, priority):
+        if self.in_flight >= self.max_in_flight:
+            return False
+        return priority < PRIORITY_POLL or self.in_flight == 0
+
+    async def _acquire(self, priority, sequence):
+        if self._closed:
+            raise ConnectionError("hub closed")
+        if not self._queue and self._may_start(priority):
+            self.in_flight += 1
+            self.stats.command_wait.record(0)
+            return
+        enqueued = time.perf_counter()
+        entry = [priority, sequence, asyncio.get_running_loop().create_future()]
+        heapq.heappush(self._queue, entry)
+        self.stats.queue_depth_max = max(self.stats.queue_depth_max, len(self._queue))
+        # An urgent command may start at once past waiting housekeeping.
+        self._dispatch()
+        try:
+            await entry[2]
+        except asyncio.CancelledError:
+            future = entry[2]
+            if future.done() and not future.cancelled():
+                # Given a slot, then cancelled before it could use it.
+                self._release()
+            elif entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self.stats.queue_depth = len(self._queue)
+            raise
+        self.stats.command_wait.record(time.perf_counter() - enqueued)
+
+    def _release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._queue and self._may_start(self._queue[0][0]):
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+        self.stats.queue_depth = len(self._queue)
+
+    def as_dict(self):
+        """Return a JSON-serialisable summary."""
+        waiting = dict.fromkeys(PRIORITY_NAMES, 0)
+        for priority, _, _ in self._queue:
+            waiting[PRIORITY_NAMES[priority]] += 1
+        return {"in_flight": self.in_flight, "waiting": waiting}
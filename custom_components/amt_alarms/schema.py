@@ -3,27 +3,47 @@ import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    CONF_ACCOUNT,
     CONF_AWAY_MODE_ENABLED,
     CONF_AWAY_PARTITION_1,
     CONF_AWAY_PARTITION_2,
     CONF_AWAY_PARTITION_3,
     CONF_AWAY_PARTITION_4,
+    CONF_BYPASS_PRESETS,
+    CONF_CONFIGURED_ZONES,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_FAST_POLL_WINDOW,
     CONF_HOME_MODE_ENABLED,
     CONF_HOME_PARTITION_1,
     CONF_HOME_PARTITION_2,
     CONF_HOME_PARTITION_3,
     CONF_HOME_PARTITION_4,
     CONF_ISECPROGRAM_POLL_INTERVAL,
+    CONF_MAC_ADDRESS,
+    CONF_MAX_POLL_INTERVAL,
     CONF_NIGHT_PARTITION_1,
     CONF_NIGHT_PARTITION_2,
     CONF_NIGHT_PARTITION_3,
     CONF_NIGHT_PARTITION_4,
     CONF_PASSWORD,
+    CONF_PGM_COUNT,
     CONF_PORT,
+    CONF_PROBE_TIMEOUT,
+    CONF_RECEPTOR_HOST,
+    CONF_SHARED_LISTENER,
     CONF_SYSTEM_PASSWORD,
+    CONF_WRITE_BATCH_WINDOW,
+    CONF_ZONE_PROFILES,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_FAST_POLL_WINDOW,
     DEFAULT_ISECPROGRAM_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_PGM_COUNT,
+    DEFAULT_PROBE_TIMEOUT,
+    DEFAULT_WRITE_BATCH_WINDOW,
     DOMAIN,  # PARTITION_LIST,; pylint:disable=unused-import
 )
+from .isecnet import MAX_PGMS
 
 partition_on = "Active"
 partition_off = "Not active"
@@ -36,6 +56,24 @@ user_schema = {
     vol.Optional(CONF_SYSTEM_PASSWORD): int,
     vol.Optional(CONF_ISECPROGRAM_POLL_INTERVAL,
                  default=DEFAULT_ISECPROGRAM_POLL_INTERVAL): cv.positive_int,
+    vol.Optional(CONF_FAST_POLL_INTERVAL,
+                 default=DEFAULT_FAST_POLL_INTERVAL): cv.positive_int,
+    vol.Optional(CONF_FAST_POLL_WINDOW,
+                 default=DEFAULT_FAST_POLL_WINDOW): cv.positive_int,
+    vol.Optional(CONF_MAX_POLL_INTERVAL,
+                 default=DEFAULT_MAX_POLL_INTERVAL): cv.positive_int,
+    vol.Optional(CONF_SHARED_LISTENER, default=False): bool,
+    vol.Optional(CONF_MAC_ADDRESS): str,
+    vol.Optional(CONF_PROBE_TIMEOUT, default=DEFAULT_PROBE_TIMEOUT): cv.positive_int,
+    vol.Optional(CONF_WRITE_BATCH_WINDOW,
+                 default=DEFAULT_WRITE_BATCH_WINDOW): vol.All(int, vol.Range(min=0, max=1000)),
+    vol.Optional(CONF_RECEPTOR_HOST): str,
+    vol.Optional(CONF_ACCOUNT): vol.All(int, vol.Range(min=1, max=9999)),
+    vol.Optional(CONF_ZONE_PROFILES): str,
+    vol.Optional(CONF_PGM_COUNT,
+                 default=DEFAULT_PGM_COUNT): vol.All(int, vol.Range(min=0, max=MAX_PGMS)),
+    vol.Optional(CONF_BYPASS_PRESETS): str,
+    vol.Optional(CONF_CONFIGURED_ZONES): str,
 }
 night_partition_schema = {
     vol.Required(CONF_NIGHT_PARTITION_1, default=partition_on): partition_vol,
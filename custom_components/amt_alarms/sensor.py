@@ -1,4 +1,5 @@
-"""Voltage sensors for AMT Intelbras Alarms (mains and battery)."""
+"""Voltage and diagnostic sensors for AMT Intelbras Alarms."""
+from datetime import timedelta
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -6,26 +7,68 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfElectricPotential
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfElectricPotential,
+    UnitOfInformation,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 
+from . import KEY_STATUS
 from .const import DOMAIN, LOGGER
+from .panel import IsecNetPanel
+
+# Only the diagnostic sensors poll; they read the hub's counters.
+SCAN_INTERVAL = timedelta(seconds=60)
+
+# key, name, unit, state class, enabled by default, value from HubStats.
+# Kept by the hub, so meaningful with every backend:
+STATS_SENSORS = (
+    ("status_age", "Status age", UnitOfTime.SECONDS, SensorStateClass.MEASUREMENT, True,
+     lambda stats: stats.status_age),
+    ("dispatch_time", "Dispatch time", UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, True, lambda stats: stats.dispatch.mean),
+    ("command_wait", "Command wait", UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, False, lambda stats: stats.command_wait.mean),
+    ("queue_depth", "Command queue depth", None, SensorStateClass.MEASUREMENT, False,
+     lambda stats: stats.queue_depth),
+)
+
+# Kept by the integration's own transports; ``amtalarm`` leaves them at 0.
+TRANSPORT_STATS_SENSORS = (
+    ("status_rtt", "Status round trip", UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, True, lambda stats: stats.status_rtt.mean),
+    ("reconnects", "Reconnects", None, SensorStateClass.TOTAL_INCREASING, True,
+     lambda stats: stats.reconnects),
+    ("frames", "Frames received", None, SensorStateClass.TOTAL_INCREASING, False,
+     lambda stats: stats.frames_total),
+    ("checksum_errors", "Checksum errors", None, SensorStateClass.TOTAL_INCREASING, False,
+     lambda stats: stats.checksum_errors),
+    ("bytes_in", "Bytes received", UnitOfInformation.BYTES,
+     SensorStateClass.TOTAL_INCREASING, False, lambda stats: stats.bytes_in),
+    ("bytes_out", "Bytes sent", UnitOfInformation.BYTES,
+     SensorStateClass.TOTAL_INCREASING, False, lambda stats: stats.bytes_out),
+)
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
-    """Set up AMT voltage sensors from a config entry."""
+    """Set up AMT voltage and diagnostic sensors from a config entry."""
     hub = entry.runtime_data
-    if hub.alarm.system_password is None:
-        return True
-
-    sensors = [
-        AlarmVoltageSensor(hub, "source"),
-        AlarmVoltageSensor(hub, "battery"),
-    ]
-    for sensor in sensors:
-        sensor.update_state()
+    sensors = []
+    if hub.alarm.system_password is not None:
+        sensors += [
+            AlarmVoltageSensor(hub, "source"),
+            AlarmVoltageSensor(hub, "battery"),
+        ]
+        for sensor in sensors:
+            sensor.update_state()
+    descriptions = STATS_SENSORS
+    if isinstance(hub.alarm, IsecNetPanel):
+        descriptions += TRANSPORT_STATS_SENSORS
+    sensors += [AlarmStatsSensor(hub, *description) for description in descriptions]
     async_add_entities(sensors)
     return True
 
@@ -42,33 +85,19 @@ class AlarmVoltageSensor(SensorEntity):
         self.hub = hub
         self._kind = kind
         label = "Tensão da fonte" if kind == "source" else "Tensão da bateria"
-        self._name = self.hub.alarm.model + " " + label
-        self._unique_id = (self.hub.alarm.model + "_"
-                           + self.hub.alarm._mac_address.hex() + "_voltage_" + kind)
-        self._value = None
-
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def unique_id(self):
-        return self._unique_id
-
-    @property
-    def panel_unique_id(self):
-        return self.hub.alarm.model + "_" + self.hub.alarm._mac_address.hex() + "_alarm_panel"
-
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self.unique_id)},
-            "name": self.name,
+        identity = hub.identity
+        self.panel_unique_id = identity.panel_unique_id
+        self._attr_name = identity.model + " " + label
+        self._attr_unique_id = identity.unique_id("voltage_" + kind)
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._attr_unique_id)},
+            "name": self._attr_name,
             "via_device": (DOMAIN, self.panel_unique_id),
         }
+        self._value = None
 
     async def async_added_to_hass(self):
-        self.hub.listen_event(self)
+        self.hub.listen_event(self, KEY_STATUS)
 
     async def async_will_remove_from_hass(self):
         self.hub.remove_listen_event(self)
@@ -79,16 +108,50 @@ class AlarmVoltageSensor(SensorEntity):
 
     def update_state(self):
         old = self._value
-        gs = self.hub.alarm.general_status
-        if gs is None:
-            self._value = None
-        elif self._kind == "source":
-            self._value = round(gs.source_voltage, 2)
+        if self._kind == "source":
+            voltage = self.hub.source_voltage
         else:
-            self._value = round(gs.battery_voltage, 2)
+            voltage = self.hub.battery_voltage
+        self._value = None if voltage is None else round(voltage, 2)
         return self._value != old
 
     @callback
     def alarm_update(self):
         if self.update_state():
             self.async_write_ha_state()
+
+
+class AlarmStatsSensor(SensorEntity):
+    """Hub counter or latency, refreshed every SCAN_INTERVAL."""
+
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, hub, key, label, unit, state_class, enabled, value):
+        self.hub = hub
+        self._value_fn = value
+        identity = hub.identity
+        self.panel_unique_id = identity.panel_unique_id
+        self._attr_name = identity.model + " " + label
+        self._attr_unique_id = identity.unique_id("stats_" + key)
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_entity_registry_enabled_default = enabled
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self.panel_unique_id)},
+        }
+        self._histogram = {
+            "status_rtt": hub.stats.status_rtt,
+            "dispatch_time": hub.stats.dispatch,
+        }.get(key)
+
+    async def async_update(self):
+        value = self._value_fn(self.hub.stats)
+        self._attr_native_value = None if value is None else round(value, 3)
+        if self._histogram is not None:
+            self._attr_extra_state_attributes = {
+                "samples": self._histogram.count,
+                "p50": self._histogram.percentile(0.5),
+                "p95": self._histogram.percentile(0.95),
+                "max": round(self._histogram.max, 3),
+            }
@@ -0,0 +1,156 @@
+"""Cheap hot-path counters and latency histograms for one hub.
+
+Everything here is plain integer arithmetic on preallocated structures so
+recording costs a few attribute updates per frame.  Values are read by the
+diagnostic sensors and the diagnostics download, never on the hot path.
+"""
+from bisect import bisect_left
+import time
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (
+    0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        """Initialize."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Add one sample, given in seconds."""
+        ms = seconds * 1000
+        self.counts[bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def mean(self):
+        """Return the mean in milliseconds, or None without samples."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, fraction):
+        """Return the upper bound (ms) of the bucket holding the percentile."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self):
+        """Return a JSON-serialisable summary."""
+        buckets = {f"<={bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": self.mean,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.max,
+            "buckets": buckets,
+        }
+
+
+class HubStats:
+    """Counters and histograms kept by a hub and its panel transport.
+
+    Frame, byte, checksum and connection counters are only fed by the
+    integration's own IsecNet transport; with the ``amtalarm`` backend the
+    socket is not visible and they stay at zero.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self.frames: dict[int, int] = {}
+        self.checksum_errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.connects = 0
+        self.disconnects = 0
+        self.status_updates = 0
+        self.last_status = None
+        # Zone changes in the status frames, and the ones that got past
+        # debounce and flap suppression to the entities.
+        self.zone_toggles = 0
+        self.zone_changes = 0
+        # PGM commands sent, and requests absorbed by the coalescing queue.
+        self.pgm_commands = 0
+        self.pgm_coalesced = 0
+        # Command scheduler: commands waiting now and at most, time spent
+        # waiting for a turn, and attempts that timed out or were retried.
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+        self.command_timeouts = 0
+        self.command_retries = 0
+        self.command_wait = Histogram()
+        self.status_rtt = Histogram()
+        self.decode = Histogram()
+        self.dispatch = Histogram()
+
+    def frame(self, command):
+        """Count a verified frame."""
+        self.frames[command] = self.frames.get(command, 0) + 1
+
+    @property
+    def frames_total(self):
+        """Return the number of verified frames received."""
+        return sum(self.frames.values())
+
+    @property
+    def reconnects(self):
+        """Return how often the panel connected again after the first time."""
+        return max(self.connects - 1, 0)
+
+    def status_received(self):
+        """Record that a status update was applied."""
+        self.status_updates += 1
+        self.last_status = time.monotonic()
+
+    @property
+    def status_age(self):
+        """Return seconds since the last status update, or None."""
+        if self.last_status is None:
+            return None
+        return time.monotonic() - self.last_status
+
+    def as_dict(self):
+        """Return a JSON-serialisable snapshot of every counter."""
+        return {
+            "frames": {f"0x{command:02x}": count for command, count in sorted(self.frames.items())},
+            "frames_total": self.frames_total,
+            "checksum_errors": self.checksum_errors,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "disconnects": self.disconnects,
+            "status_updates": self.status_updates,
+            "status_age_s": self.status_age,
+            "zone_toggles": self.zone_toggles,
+            "zone_changes": self.zone_changes,
+            "pgm_commands": self.pgm_commands,
+            "pgm_coalesced": self.pgm_coalesced,
+            "queue_depth": self.queue_depth,
+            "queue_depth_max": self.queue_depth_max,
+            "command_timeouts": self.command_timeouts,
+            "command_retries": self.command_retries,
+            "command_wait": self.command_wait.as_dict(),
+            "status_rtt": self.status_rtt.as_dict(),
+            "decode": self.decode.as_dict(),
+            "dispatch": self.dispatch.as_dict(),
+        }
@@ -0,0 +1,95 @@
+"""Link supervision for one panel."""
+from homeassistant.core import HomeAssistant, callback
+
+from .const import LOGGER
+
+LINK_GRACE_SECONDS = 30
+
+
+class LinkSupervisor:
+    """Decide, for every entity of a hub at once, when the panel link is down.
+
+    The link is up from the first heartbeat or status reply.  It goes down
+    when the panel's status has been unknown for ``grace`` seconds (a
+    disconnection that was not followed by a reconnection), or when
+    nothing at all was heard for ``stale_after`` seconds.  ``on_down`` is
+    called once on that transition; until then the hub keeps showing the
+    last known state, so a brief TCP blip writes nothing.
+
+    One timer serves both deadlines.  It is not moved on every frame: when
+    it fires early it is simply set again from the last sign of life.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, on_down, stale_after, grace=LINK_GRACE_SECONDS
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._on_down = on_down
+        self.stale_after = max(stale_after, grace)
+        self.grace = grace
+        self.up = False
+        self._last_alive = 0.0
+        self._lost_at = None
+        self._timer = None
+
+    @callback
+    def alive(self):
+        """Record a heartbeat or a status reply."""
+        self._last_alive = self.hass.loop.time()
+        self._lost_at = None
+        if not self.up:
+            LOGGER.debug("panel link up")
+            self.up = True
+        if self._timer is None:
+            self._schedule()
+
+    @callback
+    def lost(self):
+        """Record that the status became unknown.
+
+        Returns True while the link is still considered up, in which case
+        the last known state should be kept.
+        """
+        if not self.up:
+            return False
+        if self._lost_at is None:
+            self._lost_at = self.hass.loop.time()
+            self._schedule()
+        return True
+
+    def stop(self):
+        """Cancel the timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _deadline(self):
+        if self._lost_at is not None:
+            return self._lost_at + self.grace
+        return self._last_alive + self.stale_after
+
+    def _schedule(self):
+        deadline = self._deadline()
+        if self._timer is not None:
+            if self._timer.when() <= deadline:
+                # Fires early and sets itself again from there.
+                return
+            self._timer.cancel()
+        self._timer = self.hass.loop.call_at(deadline, self._expired)
+
+    @callback
+    def _expired(self):
+        self._timer = None
+        if not self.up:
+            return
+        if self.hass.loop.time() < self._deadline():
+            self._schedule()
+            return
+        if self._lost_at is None:
+            LOGGER.warning("nothing heard from the panel for %d s", self.stale_after)
+        else:
+            LOGGER.debug("panel link down for %d s", self.grace)
+        self.up = False
+        self._lost_at = None
+        self._on_down()
@@ -0,0 +1,75 @@
+"""PGM output switches for AMT Intelbras Alarms."""
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from . import KEY_PGM
+from .const import DOMAIN, LOGGER
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
+):
+    """Set up one switch per configured PGM output."""
+    hub = entry.runtime_data
+    switches = [PgmSwitch(hub, i) for i in range(hub.pgm_count)]
+    LOGGER.debug("adding %d PGM switches", len(switches))
+    for switch in switches:
+        switch.update_state()
+    async_add_entities(switches)
+    return True
+
+
+class PgmSwitch(SwitchEntity):
+    """One PGM output, switched through the hub's command queue.
+
+    The panel's status does not report PGM outputs, so the state is
+    assumed: the last one commanded or reported by a PGM event, unknown
+    after the link went down.  A command the panel took is no
+    confirmation that the output switched.
+    """
+
+    _attr_should_poll = False
+    _attr_assumed_state = True
+
+    def __init__(self, hub, index):
+        self.hub = hub
+        self._index = index
+        identity = hub.identity
+        self.panel_unique_id = identity.panel_unique_id
+        self._attr_name = f"{identity.model} PGM {index + 1}"
+        self._attr_unique_id = identity.unique_id(f"pgm_{index + 1}")
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._attr_unique_id)},
+            "name": self._attr_name,
+            "via_device": (DOMAIN, self.panel_unique_id),
+        }
+        self._attr_is_on = None
+
+    async def async_added_to_hass(self):
+        self.hub.listen_event(self, (KEY_PGM, self._index))
+
+    async def async_will_remove_from_hass(self):
+        self.hub.remove_listen_event(self)
+
+    async def async_turn_on(self, **kwargs):
+        await self._async_switch(True)
+
+    async def async_turn_off(self, **kwargs):
+        await self._async_switch(False)
+
+    async def _async_switch(self, on):
+        error = await self.hub.async_set_pgm(self._index, on)
+        if error is not None:
+            raise HomeAssistantError(f"Failed to switch PGM {self._index + 1} ({error})")
+
+    def update_state(self):
+        old = self._attr_is_on
+        self._attr_is_on = self.hub.pgm_state(self._index)
+        return self._attr_is_on != old
+
+    @callback
+    def alarm_update(self):
+        if self.update_state():
+            self.async_write_ha_state()
@@ -0,0 +1,124 @@
+"""Debounce and flap suppression for zone state.
+
+The filter sits between the open-zones bitmap the panel reports (raw)
+and the one entities see (reported).  Zones without a debounce or flap
+setting pass straight through with one mask operation per frame.
+
+- A debounced zone's change is held until the new state has been seen
+  for ``debounce`` seconds and/or ``frames`` consecutive status frames.
+  A change that reverts while held is never reported.
+- A zone that toggles ``flap`` times within ``FLAP_WINDOW`` seconds is
+  flapping.  Its reported state is frozen until the toggles age out, and
+  then it snaps to the raw state.
+
+Times come from the caller's monotonic clock, so the hub can drive every
+zone from one timer set to ``next_deadline()``.  No Home Assistant
+imports.
+"""
+from collections import deque
+
+from .bitmap import iter_bits
+
+FLAP_WINDOW = 60
+
+
+class ZoneFilter:
+    """Debounce and flap state for every zone of one panel."""
+
+    def __init__(self):
+        """Initialize with every zone passing straight through."""
+        self.raw = None
+        self.reported = None
+        self.flapping = 0
+        self._debounce: list = []
+        self._frames: list = []
+        self._flap: list = []
+        self._held_mask = 0
+        self._flap_mask = 0
+        # zone -> [time the pending state was first seen, frames seen]
+        self._pending: dict[int, list] = {}
+        # zone -> times of its last `flap` toggles
+        self._toggles: dict[int, deque] = {}
+
+    def configure(self, debounce, frames, flap):
+        """Set per-zone debounce (ms), frame counts and flap thresholds.
+
+        Anything held or flapping is released to the raw state.
+        """
+        self._debounce = [ms / 1000 for ms in debounce]
+        self._frames = list(frames)
+        self._flap = list(flap)
+        self._held_mask = sum(
+            1 << zone for zone, (ms, count) in enumerate(zip(debounce, frames)) if ms or count
+        )
+        self._flap_mask = sum(1 << zone for zone, count in enumerate(flap) if count)
+        self._pending.clear()
+        self._toggles.clear()
+        self.flapping = 0
+        self.reported = self.raw
+
+    def update(self, raw, now):
+        """Apply the open-zones bitmap of one status frame."""
+        if raw is None or self.raw is None:
+            # Unknown, or known again after a disconnection: nothing to
+            # debounce against.
+            self.raw = self.reported = raw
+            self._pending.clear()
+            return
+        toggled = raw ^ self.raw
+        self.raw = raw
+        if toggled & self._flap_mask:
+            self._count_toggles(toggled & self._flap_mask, now)
+        diff = (raw ^ self.reported) & ~self.flapping
+        self.reported ^= diff & ~self._held_mask
+        held = diff & self._held_mask
+        for zone in [zone for zone in self._pending if not (held >> zone) & 1]:
+            # Back to the reported state before the change was released.
+            del self._pending[zone]
+        for zone in iter_bits(held):
+            pending = self._pending.get(zone)
+            if pending is None:
+                pending = self._pending[zone] = [now, 0]
+            pending[1] += 1
+            self._release_if_stable(zone, pending, now)
+
+    def expire(self, now):
+        """Release held changes and flapping zones whose time has come."""
+        for zone, pending in list(self._pending.items()):
+            self._release_if_stable(zone, pending, now)
+        for zone in iter_bits(self.flapping):
+            times = self._toggles[zone]
+            while times and times[0] <= now - FLAP_WINDOW:
+                times.popleft()
+            if len(times) < self._flap[zone]:
+                bit = 1 << zone
+                self.flapping &= ~bit
+                self.reported = (self.reported & ~bit) | (self.raw & bit)
+
+    def next_deadline(self):
+        """Return when ``expire`` next has something to do, or None."""
+        deadlines = [
+            since + self._debounce[zone]
+            for zone, (since, frames) in self._pending.items()
+            if frames >= self._frames[zone]
+        ]
+        deadlines += [
+            self._toggles[zone][0] + FLAP_WINDOW for zone in iter_bits(self.flapping)
+        ]
+        return min(deadlines, default=None)
+
+    def _count_toggles(self, toggled, now):
+        for zone in iter_bits(toggled):
+            times = self._toggles.get(zone)
+            if times is None:
+                times = self._toggles[zone] = deque(maxlen=self._flap[zone])
+            times.append(now)
+            if len(times) == times.maxlen and times[0] > now - FLAP_WINDOW:
+                self.flapping |= 1 << zone
+                self._pending.pop(zone, None)
+
+    def _release_if_stable(self, zone, pending, now):
+        since, frames = pending
+        if frames >= self._frames[zone] and now - since >= self._debounce[zone]:
+            self.reported ^= 1 << zone
+            del self._pending[zone]
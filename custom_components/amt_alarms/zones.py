@@ -0,0 +1,200 @@
+"""Zone profiles: how each zone is presented as a binary sensor.
+
+A profile option is a text table, one entry per line or separated by
+``;``::
+
+    1-4: door
+    5, 7: window inverted
+    9: smoke debounce=500
+    12: motion frames=3 flap=10
+
+Each entry maps zones (1-based numbers and ranges) to a binary sensor
+device class.  Options: ``inverted`` (closed reports on),
+``debounce=<ms>`` and ``frames=<n>`` (hold a change until it has lasted
+that long, see ``zonefilter``) and ``flap=<n>`` (freeze a zone toggling
+n times a minute).  Zones not listed keep the default, a plain motion
+sensor.
+
+Bypass presets use the same layout, a name instead of a device class
+on the right: ``away: 1-4, 7; garage: 12``.  They are compiled into
+zone bitmaps, and ``resolve_zones`` turns a bypass request into one.
+Pure functions, no Home Assistant imports.
+"""
+from dataclasses import dataclass
+
+# The largest zone count of any supported panel (AMT 8000).
+MAX_ZONES = 64
+MAX_DEBOUNCE = 60000
+MAX_FRAMES = 100
+MIN_FLAP, MAX_FLAP = 2, 1000
+DEFAULT_DEVICE_CLASS = "motion"
+# Inclusive ranges of the numeric options.
+OPTION_RANGES = {
+    "debounce": (0, MAX_DEBOUNCE),
+    "frames": (0, MAX_FRAMES),
+    "flap": (MIN_FLAP, MAX_FLAP),
+}
+# BinarySensorDeviceClass values a zone may take.
+DEVICE_CLASSES = frozenset((
+    "carbon_monoxide", "door", "garage_door", "gas", "heat", "moisture",
+    "motion", "moving", "occupancy", "opening", "presence", "problem",
+    "safety", "smoke", "sound", "tamper", "vibration", "window",
+))
+
+
+@dataclass(frozen=True)
+class ZoneProfile:
+    """How one zone is presented."""
+
+    device_class: str = DEFAULT_DEVICE_CLASS
+    inverted: bool = False
+    debounce: int = 0
+    frames: int = 0
+    flap: int = 0
+
+
+@dataclass
+class ZoneTables:
+    """Zone profiles compiled into lookup tables indexed by 0-based zone."""
+
+    device_classes: list
+    inverted_mask: int
+    debounce: list
+    frames: list
+    flap: list
+
+
+def parse_zones(text, max_zones=MAX_ZONES):
+    """Return the 0-based zones in a list such as ``"1-4, 7"``.
+
+    Raises ``ValueError`` on a malformed list or a zone out of range.
+    """
+    zones = []
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        try:
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise ValueError(f"invalid zones {part.strip()!r}") from None
+        if not 1 <= first <= last <= max_zones:
+            raise ValueError(f"zones {part.strip()!r} out of range 1-{max_zones}")
+        zones.extend(range(first - 1, last))
+    return zones
+
+
+def _entries(text):
+    for entry in (text or "").replace("\n", ";").split(";"):
+        entry = entry.strip()
+        if entry:
+            yield entry
+
+
+def parse_zone_profiles(text, max_zones=MAX_ZONES):
+    """Parse a profile table into a dict of 0-based zone -> ``ZoneProfile``.
+
+    Later entries override earlier ones.  Raises ``ValueError`` naming the
+    offending entry.
+    """
+    profiles = {}
+    for entry in _entries(text):
+        try:
+            zones, colon, spec = entry.partition(":")
+            if not colon:
+                raise ValueError("expected '<zones>: <device class>'")
+            words = spec.split()
+            if not words or words[0] not in DEVICE_CLASSES:
+                raise ValueError("unknown device class")
+            options = {"inverted": False, "debounce": 0, "frames": 0, "flap": 0}
+            for word in words[1:]:
+                name, equals, value = word.partition("=")
+                if word == "inverted":
+                    options["inverted"] = True
+                elif equals and name in OPTION_RANGES:
+                    low, high = OPTION_RANGES[name]
+                    options[name] = int(value)
+                    if not low <= options[name] <= high:
+                        raise ValueError(f"{name} out of range {low}-{high}")
+                else:
+                    raise ValueError(f"unknown option {word!r}")
+            profile = ZoneProfile(words[0], **options)
+            for zone in parse_zones(zones, max_zones):
+                profiles[zone] = profile
+        except ValueError as err:
+            raise ValueError(f"zone profile {entry!r}: {err}") from err
+    return profiles
+
+
+def compile_zone_profiles(profiles, max_zones=MAX_ZONES):
+    """Compile profiles into a ``ZoneTables`` covering max_zones zones."""
+    tables = ZoneTables(
+        device_classes=[DEFAULT_DEVICE_CLASS] * max_zones,
+        inverted_mask=0,
+        debounce=[0] * max_zones,
+        frames=[0] * max_zones,
+        flap=[0] * max_zones,
+    )
+    for zone, profile in profiles.items():
+        tables.device_classes[zone] = profile.device_class
+        tables.debounce[zone] = profile.debounce
+        tables.frames[zone] = profile.frames
+        tables.flap[zone] = profile.flap
+        if profile.inverted:
+            tables.inverted_mask |= 1 << zone
+    return tables
+
+
+def parse_bypass_presets(text, max_zones=MAX_ZONES):
+    """Parse a preset table into a dict of casefolded name -> zone bitmap.
+
+    Raises ``ValueError`` naming the offending entry.
+    """
+    presets = {}
+    for entry in _entries(text):
+        name, colon, zones = entry.rpartition(":")
+        try:
+            if not colon or not name.strip():
+                raise ValueError("expected '<name>: <zones>'")
+            presets[name.strip().casefold()] = sum(
+                1 << zone for zone in set(parse_zones(zones, max_zones))
+            )
+        except ValueError as err:
+            raise ValueError(f"bypass preset {entry!r}: {err}") from err
+    return presets
+
+
+def resolve_zones(entries, names, presets, max_zones=MAX_ZONES):
+    """Resolve bypass request entries into a zone bitmap.
+
+    An int is a 0-based zone index, the numbering of the entity's
+    ``bypassed_zones`` attribute, so a list read from it can be sent back
+    as is.  A string holds comma separated preset names, zone names
+    (names maps casefolded name -> index) or 1-based zone numbers and
+    ranges, as in zone profiles.  Raises ``ValueError`` listing what could
+    not be resolved.
+    """
+    mask = 0
+    unknown = []
+    for entry in entries:
+        if isinstance(entry, int) and not isinstance(entry, bool):
+            if not 0 <= entry < max_zones:
+                raise ValueError(f"zone index {entry} out of range 0-{max_zones - 1}")
+            mask |= 1 << entry
+            continue
+        for part in str(entry).split(","):
+            part = part.strip()
+            key = part.casefold()
+            if not part:
+                continue
+            if key in presets:
+                mask |= presets[key]
+            elif key in names:
+                mask |= 1 << names[key]
+            elif part[0].isdigit():
+                for zone in parse_zones(part, max_zones):
+                    mask |= 1 << zone
+            else:
+                unknown.append(part)
+    if unknown:
+        raise ValueError("unknown zones or presets: " + ", ".join(unknown))
+    return mask
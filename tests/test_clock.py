@@ -0,0 +1,79 @@
+"""Tests for panel clock tracking in ``clock.py``.
+
+``clock.py`` has no Home Assistant dependency, so these run without
+Home Assistant installed.
+"""
+import pytest
+
+from conftest import load_integration_module
+
+clock = load_integration_module("clock")
+
+HOUR = clock.BUCKET_SECONDS
+START = 1_700_000_000.0
+
+
+def test_nothing_is_learned_before_a_sync():
+    panel_clock = clock.PanelClock()
+    assert not panel_clock.observe(START - 100, START)
+    assert panel_clock.offset is None
+    assert panel_clock.offset_at(START) == 0.0
+
+
+def test_offset_is_the_smallest_lag_of_the_hour():
+    panel_clock = clock.PanelClock()
+    panel_clock.synced(START)
+    # The panel is 5 s ahead; events take 3 s, then 1 s, to arrive.
+    assert panel_clock.observe(START + HOUR + 5, START + HOUR + 3)
+    assert panel_clock.offset == 2.0
+    assert not panel_clock.observe(START + HOUR + 65, START + HOUR + 61)
+    assert panel_clock.offset == 4.0
+    assert panel_clock.to_local(START + HOUR + 65, START + HOUR + 61) == pytest.approx(
+        START + HOUR + 61, abs=0.1)
+
+
+def test_first_hour_after_a_sync_starts_at_zero():
+    panel_clock = clock.PanelClock()
+    panel_clock.synced(START)
+    panel_clock.observe(START + 60, START + 61)
+    assert panel_clock.offset == 0.0
+
+
+def test_backlog_does_not_open_an_hour():
+    panel_clock = clock.PanelClock()
+    panel_clock.synced(START)
+    # Held back by the panel for ten minutes, reported an hour on.
+    assert not panel_clock.observe(START + HOUR, START + HOUR + 600)
+    assert panel_clock.as_dict()["hours_observed"] == 1
+    assert panel_clock.is_backlog(START + HOUR, START + HOUR + 600)
+    assert not panel_clock.is_backlog(START + HOUR, START + HOUR + 2)
+
+
+def test_drift_is_the_slope_of_the_hourly_offsets():
+    panel_clock = clock.PanelClock()
+    panel_clock.synced(START)
+    # The panel gains 1 s an hour, and events arrive promptly.
+    for hour in range(1, 4):
+        assert panel_clock.observe(START + hour * HOUR + hour, START + hour * HOUR)
+    assert panel_clock.offset == 3.0
+    assert panel_clock.drift == pytest.approx(24.0)
+    assert panel_clock.offset_at(START + 3.5 * HOUR) == pytest.approx(3.5)
+
+
+def test_state_round_trips():
+    panel_clock = clock.PanelClock()
+    panel_clock.synced(START)
+    panel_clock.observe(START + HOUR + 7, START + HOUR + 1)
+    restored = clock.PanelClock()
+    restored.restore(panel_clock.as_state())
+    assert restored.as_dict() == panel_clock.as_dict()
+    # A restored estimate keeps learning without a new sync.
+    assert restored.observe(START + 2 * HOUR + 7, START + 2 * HOUR + 1)
+
+
+def test_restore_ignores_an_empty_state():
+    panel_clock = clock.PanelClock()
+    panel_clock.restore(None)
+    panel_clock.restore({"synced_at": None, "buckets": []})
+    assert panel_clock.synced_at is None
+    assert panel_clock.offset is None
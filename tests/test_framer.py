@@ -0,0 +1,157 @@
+"""Property tests for the IsecNet V1 ``FrameParser``.
+
+On randomly generated streams, the parser must return exactly the frames
+that were sent however the stream is split or coalesced, drop and count
+corrupted frames and skip garbage, and the folded checksum must match a
+byte-by-byte XOR.
+
+``isecnet.py`` has no Home Assistant dependency, so these run without
+Home Assistant installed.
+"""
+import random
+
+import pytest
+
+from conftest import load_integration_module
+
+isecnet = load_integration_module("isecnet")
+
+SEEDS = range(5)
+ROUNDS = 20
+
+
+def naive_checksum(data):
+    """Reference checksum, one byte at a time."""
+    xor = 0
+    for byte in data:
+        xor ^= byte
+    return xor ^ 0xFF
+
+
+def isec_program_frame(data):
+    """Build a 0xE7 frame, which carries a CRC-16 instead of the checksum."""
+    raw = bytes((len(data) + 4, isecnet.CMD_ISEC_PROGRAM)) + data
+    return raw + isecnet.crc16(raw).to_bytes(2, "big")
+
+
+def random_frame(rng):
+    """Return (command, payload, encoded frame)."""
+    if rng.random() < 0.1:
+        payload = rng.randbytes(rng.randrange(0, 250))
+        return isecnet.CMD_ISEC_PROGRAM, payload, isec_program_frame(payload)
+    command = rng.choice((0xE9, 0xF7, 0xB0, 0xB4, 0x94, 0x95, rng.randrange(256)))
+    if command == isecnet.CMD_ISEC_PROGRAM:
+        command = 0xE9
+    payload = rng.randbytes(rng.randrange(0, 252))
+    return command, payload, isecnet.build_frame(command, payload)
+
+
+def random_stream(rng):
+    """Return the frames sent and their concatenation."""
+    sent = [random_frame(rng) for _ in range(rng.randrange(1, 200))]
+    return sent, b"".join(frame for _, _, frame in sent)
+
+
+def receive(parser, stream, chunks):
+    """Deliver stream like a transport, at most chunks() bytes per read."""
+    frames = []
+    position = 0
+    while position < len(stream):
+        buffer = parser.get_buffer(-1)
+        count = min(len(buffer), chunks(), len(stream) - position)
+        buffer[:count] = stream[position:position + count]
+        position += count
+        frames += [(command, bytes(payload)) for command, payload in parser.buffer_updated(count)]
+    return frames
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_checksum_matches_plain_xor(seed):
+    rng = random.Random(seed)
+    for size in range(0, 1100):
+        data = rng.randbytes(size)
+        assert isecnet.checksum(data) == naive_checksum(data), size
+        assert isecnet.checksum(memoryview(data)) == naive_checksum(data), size
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_any_split_yields_the_frames_sent(seed):
+    rng = random.Random(seed)
+    for _ in range(ROUNDS):
+        sent, stream = random_stream(rng)
+        expected = [(command, payload) for command, payload, _ in sent]
+        # From single bytes to reads larger than the buffer.
+        for chunks in (lambda: 1, lambda: rng.randrange(1, 64),
+                       lambda: rng.randrange(1, 8192), lambda: len(stream)):
+            parser = isecnet.FrameParser()
+            assert receive(parser, stream, chunks) == expected
+            assert parser.checksum_errors == 0
+        assert isecnet.FrameParser().feed(stream) == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_corrupted_frames_are_dropped_and_counted(seed):
+    rng = random.Random(seed)
+    for _ in range(ROUNDS):
+        sent, _ = random_stream(rng)
+        corrupted = []
+        kept = []
+        for i, (command, payload, frame) in enumerate(sent):
+            # Before the first valid frame, a bad frame is leading junk,
+            # skipped uncounted: see test_leading_junk_is_skipped.
+            if i and payload and rng.random() < 0.2:
+                frame = bytearray(frame)
+                frame[2 + rng.randrange(len(payload))] ^= 1 << rng.randrange(8)
+                corrupted.append(bytes(frame))
+            else:
+                kept.append((command, payload))
+                corrupted.append(frame)
+        parser = isecnet.FrameParser()
+        assert receive(parser, b"".join(corrupted), lambda: rng.randrange(1, 300)) == kept
+        assert parser.checksum_errors == len(sent) - len(kept)
+
+
+def junk(rng):
+    """Return what may precede the first frame of a connection."""
+    pieces = []
+    for _ in range(rng.randrange(1, 6)):
+        kind = rng.randrange(4)
+        if kind == 0:
+            # Bytes that cannot start a frame.
+            pieces.append(bytes(rng.randrange(3) for _ in range(rng.randrange(1, 5))))
+        elif kind == 1:
+            # Stray ACKs, which read as the length of a 254-byte frame.
+            pieces.append(bytes((isecnet.ACK,)) * rng.randrange(1, 4))
+        else:
+            # The tail or head of a frame, cut by a reconnection: its first
+            # byte is a bad length.
+            _, _, frame = random_frame(rng)
+            cut = rng.randrange(1, len(frame))
+            pieces.append(frame[cut:] if kind == 2 else frame[:cut])
+    return b"".join(pieces)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_leading_junk_is_skipped(seed):
+    rng = random.Random(seed)
+    heartbeat = isecnet.build_frame(isecnet.CMD_HEARTBEAT)
+    for _ in range(ROUNDS):
+        sent, stream = random_stream(rng)
+        if stream[0] == isecnet.ACK:
+            # A 254-byte first frame cannot be told from a stray ACK.
+            continue
+        expected = [(command, payload) for command, payload, _ in sent]
+        # A frame found past a bad one is trusted once the next verifies,
+        # at the latest the panel's next heartbeat.
+        expected.append((isecnet.CMD_HEARTBEAT, b""))
+        parser = isecnet.FrameParser()
+        assert receive(parser, junk(rng) + stream + heartbeat,
+                       lambda: rng.randrange(1, 300)) == expected
+        assert parser.checksum_errors == 0
+
+
+def test_stray_ack_does_not_hold_back_the_first_frame():
+    frame = isecnet.build_frame(isecnet.CMD_CONNECT, b"\x01\x02")
+    assert isecnet.FrameParser().feed(bytes((isecnet.ACK,)) + frame) == [
+        (isecnet.CMD_CONNECT, b"\x01\x02")
+    ]
@@ -0,0 +1,47 @@
+"""Tests for ``isecnet.parse_names``, the 0xD1/0xD3 names reply parser.
+
+``isecnet.py`` has no Home Assistant dependency, so these run without
+Home Assistant installed.
+"""
+import pytest
+
+from conftest import load_integration_module
+
+isecnet = load_integration_module("isecnet")
+
+parse_names = isecnet.parse_names
+
+
+def name(text):
+    return text.encode("ascii").ljust(isecnet.NAME_LENGTH, b" ")
+
+
+def test_names_are_parsed_and_blank_ones_are_none():
+    assert parse_names(bytes((3,)) + name("Sala") + name("") + name("Porta 2")) == (
+        3, ["Sala", None, "Porta 2"]
+    )
+
+
+def test_nul_padding_is_stripped():
+    assert parse_names(bytes((0,)) + b"Garagem".ljust(isecnet.NAME_LENGTH, b"\x00")) == (
+        0, ["Garagem"]
+    )
+
+
+@pytest.mark.parametrize("payload", [
+    b"",
+    bytes((0,)) + name("Sala")[:-1],
+    bytes((0,)) + name("Sala") + b"\x20",
+])
+def test_partial_names_are_rejected(payload):
+    with pytest.raises(ValueError):
+        parse_names(payload)
+
+
+@pytest.mark.parametrize("raw", [
+    b"Sala\x07".ljust(isecnet.NAME_LENGTH, b" "),
+    b"\xff" * isecnet.NAME_LENGTH,
+    b"Sa\x00la".ljust(isecnet.NAME_LENGTH, b" "),
+])
+def test_names_with_impossible_bytes_are_none(raw):
+    assert parse_names(bytes((5,)) + raw + name("Quarto")) == (5, [None, "Quarto"])
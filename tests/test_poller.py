@@ -0,0 +1,121 @@
+"""Tests for the status poll backoff in ``poller.py``.
+
+``poller.py`` has no Home Assistant dependency: it is driven here by a
+``FakeHass`` that records its timers, so these run without Home
+Assistant installed.
+"""
+import asyncio
+
+from conftest import FakeHass, load_integration_module
+
+poller = load_integration_module("poller")
+
+FAST = 5
+MAX = 40
+
+
+class Panel:
+    """A poll callback that proves the panel alive, or not, or fails."""
+
+    def __init__(self):
+        self.polls = 0
+        self.poller = None
+        self.answers = True
+        self.error = None
+
+    async def poll(self):
+        self.polls += 1
+        if self.error:
+            raise self.error
+        if self.answers:
+            self.poller.note_alive()
+
+
+def make_poller(fast_window=0):
+    hass = FakeHass()
+    panel = Panel()
+    panel.poller = poller.AdaptivePoller(hass, panel.poll, FAST, fast_window, MAX)
+    return hass, panel, panel.poller
+
+
+def delays(hass, panel, polls):
+    """Run that many polls and return the delay each one scheduled next."""
+    scheduled = []
+
+    async def run():
+        for _ in range(polls):
+            await hass.run_timer()
+            (timer,) = hass.pending
+            scheduled.append(timer.delay)
+
+    asyncio.run(run())
+    return scheduled
+
+
+def test_start_polls_at_once():
+    hass, panel, adaptive = make_poller()
+    adaptive.start()
+    assert [timer.delay for timer in hass.pending] == [0]
+    assert adaptive.running
+
+
+def test_interval_doubles_while_the_panel_answers():
+    hass, panel, adaptive = make_poller()
+    adaptive.start()
+    # The first poll sees nothing proven alive yet.
+    assert delays(hass, panel, 6) == [FAST, 10, 20, 40, 40, 40]
+    assert panel.polls == 6
+
+
+def test_unanswered_poll_drops_back_to_fast():
+    hass, panel, adaptive = make_poller()
+    adaptive.start()
+    assert delays(hass, panel, 4) == [FAST, 10, 20, 40]
+    panel.answers = False
+    # The answer to the previous poll still counts for the next one.
+    assert delays(hass, panel, 2) == [MAX, FAST]
+
+
+def test_fast_window_keeps_polling_fast():
+    hass, panel, adaptive = make_poller(fast_window=3600)
+    adaptive.start()
+    assert delays(hass, panel, 4) == [FAST] * 4
+
+
+def test_change_brings_a_long_wait_forward():
+    hass, panel, adaptive = make_poller()
+    adaptive.start()
+    delays(hass, panel, 5)
+    (waiting,) = hass.pending
+    assert waiting.delay == MAX
+    adaptive.note_changed()
+    assert waiting.cancelled
+    assert [timer.delay for timer in hass.pending] == [FAST]
+
+
+def test_kick_polls_now():
+    hass, panel, adaptive = make_poller()
+    adaptive.start()
+    delays(hass, panel, 3)
+    adaptive.kick()
+    assert [timer.delay for timer in hass.pending] == [0]
+
+
+def test_stop_cancels_the_next_poll():
+    hass, panel, adaptive = make_poller()
+    adaptive.start()
+    delays(hass, panel, 1)
+    adaptive.stop()
+    assert not hass.pending
+    assert not adaptive.running
+    # Changes and kicks while stopped schedule nothing.
+    adaptive.note_changed()
+    adaptive.kick()
+    assert not hass.pending
+
+
+def test_failed_poll_is_rescheduled():
+    hass, panel, adaptive = make_poller()
+    panel.error = ConnectionError()
+    adaptive.start()
+    assert delays(hass, panel, 2) == [FAST, FAST]
@@ -0,0 +1,185 @@
+"""Tests for request scheduling over a ``ReceptorLink``.
+
+``receptor.py`` only needs ``hass`` for its event loop and background
+tasks: it is driven here by a fake receptor that answers each frame
+written to it, so these run without Home Assistant installed.
+"""
+import asyncio
+
+import pytest
+
+from conftest import load_integration_module
+
+isecnet = load_integration_module("isecnet")
+receptor = load_integration_module("receptor")
+
+ACK = bytes((isecnet.ACK,))
+
+
+class FakeReceptor:
+    """A Receptor IP: logs the frames written to it and answers them.
+
+    Link commands succeed and ISEC Mobile requests are echoed back,
+    except those of the accounts in ``silent``.
+    """
+
+    def __init__(self):
+        self.written = []
+        self.silent = set()
+        self.linked = None
+        self.closed = False
+        self.link = None
+
+    def write(self, data):
+        if data == ACK:
+            self.written.append(data)
+            return
+        command, payload = data[1], bytes(data[2:-1])
+        self.written.append((command, payload))
+        if command == isecnet.CMD_RECEPTOR_ACCOUNT:
+            self.linked = payload
+            reply = b"\x00"
+        elif command == isecnet.CMD_ISEC_MOBILE:
+            if self.linked in self.silent:
+                return
+            reply = payload
+        else:
+            reply = b"\x00"
+        asyncio.get_running_loop().call_soon(self.link.frame_received, command, reply)
+
+    def close(self):
+        self.closed = True
+
+    def requests(self):
+        """Return the frames written after the link was initialised."""
+        return [
+            (command, payload) for command, payload in self.written[1:]
+            if command != isecnet.CMD_RECEPTOR_LINK
+        ]
+
+
+class FakeHass:
+    """The parts of ``hass`` a receptor link uses, on the running loop."""
+
+    def __init__(self, fake_receptor):
+        self.loop = self
+        self.data = {}
+        self.receptor = fake_receptor
+
+    async def create_connection(self, factory, host, port):
+        protocol = factory()
+        self.receptor.link = protocol.link
+        protocol.connection_made(self.receptor)
+        return self.receptor, protocol
+
+    def async_create_background_task(self, coro, name):
+        return asyncio.get_running_loop().create_task(coro)
+
+
+async def open_link(*accounts):
+    """Return a fake receptor and a link serving accounts through it."""
+    fake_receptor = FakeReceptor()
+    link = receptor.ReceptorLink(FakeHass(fake_receptor), "receptor", 9009)
+    for account in accounts:
+        link.register(receptor.ReceptorPanel(account))
+    link.start()
+    while not link.connected:
+        await asyncio.sleep(0)
+    assert fake_receptor.written == [(isecnet.CMD_RECEPTOR_INIT, b"")]
+    return fake_receptor, link
+
+
+def request(link, account, data):
+    future = asyncio.get_running_loop().create_future()
+    link.enqueue(account, isecnet.build_frame(isecnet.CMD_ISEC_MOBILE, data), future)
+    return future
+
+
+def select(account):
+    return (isecnet.CMD_RECEPTOR_ACCOUNT, isecnet.account_digits(account))
+
+
+def relay(data):
+    return (isecnet.CMD_ISEC_MOBILE, data)
+
+
+def test_accounts_are_served_in_turn():
+    async def run():
+        fake_receptor, link = await open_link(1, 2)
+        futures = [
+            request(link, 1, b"a1"), request(link, 1, b"a2"), request(link, 2, b"b1")
+        ]
+        assert await asyncio.gather(*futures) == [b"a1", b"a2", b"b1"]
+        # The account is only selected again when it changes.
+        assert await request(link, 1, b"a3") == b"a3"
+        assert await request(link, 1, b"a4") == b"a4"
+        assert fake_receptor.requests() == [
+            select(1), relay(b"a1"), select(2), relay(b"b1"),
+            select(1), relay(b"a2"), relay(b"a3"), relay(b"a4"),
+        ]
+        link.close()
+        assert fake_receptor.closed
+
+    asyncio.run(run())
+
+
+def test_request_abandoned_while_queued_is_not_sent():
+    async def run():
+        fake_receptor, link = await open_link(1)
+        abandoned = request(link, 1, b"old")
+        abandoned.cancel()
+        assert await request(link, 1, b"new") == b"new"
+        assert fake_receptor.requests() == [select(1), relay(b"new")]
+        link.close()
+
+    asyncio.run(run())
+
+
+def test_dropped_queue_fails_its_requests():
+    async def run():
+        fake_receptor, link = await open_link(1, 2)
+        dropped = request(link, 1, b"a1")
+        kept = request(link, 2, b"b1")
+        link.drop_queue(1)
+        with pytest.raises(ConnectionError):
+            await dropped
+        assert await kept == b"b1"
+        assert fake_receptor.requests() == [select(2), relay(b"b1")]
+        link.close()
+
+    asyncio.run(run())
+
+
+def test_silent_account_times_out_and_is_selected_again(monkeypatch):
+    monkeypatch.setattr(receptor, "REQUEST_TIMEOUT", 0.01)
+
+    async def run():
+        fake_receptor, link = await open_link(1, 2)
+        fake_receptor.silent.add(isecnet.account_digits(1))
+        lost = request(link, 1, b"a1")
+        answered = request(link, 2, b"b1")
+        with pytest.raises(TimeoutError):
+            await lost
+        assert await answered == b"b1"
+        fake_receptor.silent.clear()
+        assert await request(link, 2, b"b2") == b"b2"
+        # A late reply to a1 could still come: 1 is selected again first.
+        assert await request(link, 1, b"a2") == b"a2"
+        assert fake_receptor.requests() == [
+            select(1), relay(b"a1"), select(2), relay(b"b1"), relay(b"b2"),
+            select(1), relay(b"a2"),
+        ]
+        link.close()
+
+    asyncio.run(run())
+
+
+def test_heartbeat_and_unknown_events_are_acknowledged():
+    async def run():
+        fake_receptor, link = await open_link(1)
+        link.frame_received(isecnet.CMD_HEARTBEAT, b"")
+        link.frame_received(isecnet.CMD_CONTACT_ID, b"\x00")
+        assert fake_receptor.written[1:] == [ACK, ACK]
+        link.close()
+
+    asyncio.run(run())
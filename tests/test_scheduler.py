@@ -0,0 +1,174 @@
+"""Tests for command ordering and retries in ``scheduler.py``.
+
+``scheduler.py`` has no Home Assistant dependency, so these run without
+Home Assistant installed.
+"""
+import asyncio
+
+import pytest
+
+from conftest import load_integration_module
+
+scheduler = load_integration_module("scheduler")
+stats = load_integration_module("stats")
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(scheduler, "RETRY_DELAY", 0)
+
+
+class Panel:
+    """Commands that block until the test answers them, in send order."""
+
+    def __init__(self):
+        self.sent = []
+        self.replies = {}
+
+    async def send(self, name):
+        self.sent.append(name)
+        reply = self.replies[name] = asyncio.get_running_loop().create_future()
+        return await reply
+
+    def answer(self, name, result=None):
+        self.replies.pop(name).set_result(result or name)
+
+    def fail(self, name, error):
+        self.replies.pop(name).set_exception(error)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_waiting_commands_start_by_priority_then_arrival():
+    async def run():
+        commands = scheduler.CommandScheduler(stats.HubStats(), max_in_flight=1)
+        panel = Panel()
+        first = asyncio.create_task(commands.run(scheduler.PRIORITY_COMMAND, panel.send, "first"))
+        await settle()
+        tasks = [
+            asyncio.create_task(commands.run(priority, panel.send, name))
+            for priority, name in (
+                (scheduler.PRIORITY_MAINTENANCE, "names"),
+                (scheduler.PRIORITY_COMMAND, "arm"),
+                (scheduler.PRIORITY_POLL, "poll"),
+                (scheduler.PRIORITY_URGENT, "panic"),
+                (scheduler.PRIORITY_COMMAND, "bypass"),
+            )
+        ]
+        await settle()
+        assert commands.depth == 5
+        for name in ("first", "panic", "arm", "bypass", "poll", "names"):
+            assert panel.sent[-1] == name
+            panel.answer(name)
+            await settle()
+        assert await first == "first"
+        assert [await task for task in tasks] == ["names", "arm", "poll", "panic", "bypass"]
+        assert commands.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_polls_wait_for_everything_in_flight():
+    async def run():
+        commands = scheduler.CommandScheduler(stats.HubStats())
+        panel = Panel()
+        arm = asyncio.create_task(commands.run(scheduler.PRIORITY_COMMAND, panel.send, "arm"))
+        await settle()
+        poll = asyncio.create_task(commands.run(scheduler.PRIORITY_POLL, panel.send, "poll"))
+        bypass = asyncio.create_task(
+            commands.run(scheduler.PRIORITY_COMMAND, panel.send, "bypass"))
+        await settle()
+        # Commands are pipelined; the poll waits for both to finish.
+        assert panel.sent == ["arm", "bypass"]
+        panel.answer("arm")
+        await settle()
+        assert panel.sent == ["arm", "bypass"]
+        panel.answer("bypass")
+        await settle()
+        assert panel.sent == ["arm", "bypass", "poll"]
+        panel.answer("poll")
+        await asyncio.gather(arm, poll, bypass)
+
+    asyncio.run(run())
+
+
+def test_command_is_retried_once_after_a_disconnection():
+    async def run():
+        hub_stats = stats.HubStats()
+        commands = scheduler.CommandScheduler(hub_stats)
+        panel = Panel()
+        arm = asyncio.create_task(commands.run(scheduler.PRIORITY_COMMAND, panel.send, "arm"))
+        await settle()
+        panel.fail("arm", ConnectionError())
+        await settle()
+        assert panel.sent == ["arm", "arm"]
+        panel.fail("arm", ConnectionError())
+        with pytest.raises(ConnectionError):
+            await arm
+        assert hub_stats.command_retries == 1
+        assert commands.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_urgent_command_is_never_retried():
+    async def run():
+        hub_stats = stats.HubStats()
+        commands = scheduler.CommandScheduler(hub_stats)
+        panel = Panel()
+        panic = asyncio.create_task(
+            commands.run(scheduler.PRIORITY_URGENT, panel.send, "panic"))
+        await settle()
+        panel.fail("panic", ConnectionError())
+        with pytest.raises(ConnectionError):
+            await panic
+        assert panel.sent == ["panic"]
+        assert hub_stats.command_retries == 0
+
+    asyncio.run(run())
+
+
+def test_close_fails_waiting_commands():
+    async def run():
+        hub_stats = stats.HubStats()
+        commands = scheduler.CommandScheduler(hub_stats, max_in_flight=1)
+        panel = Panel()
+        asyncio.create_task(commands.run(scheduler.PRIORITY_COMMAND, panel.send, "arm"))
+        await settle()
+        waiting = asyncio.create_task(
+            commands.run(scheduler.PRIORITY_COMMAND, panel.send, "bypass"))
+        await settle()
+        commands.close()
+        with pytest.raises(ConnectionError):
+            await waiting
+        assert panel.sent == ["arm"]
+        assert hub_stats.queue_depth == 0
+        with pytest.raises(ConnectionError):
+            await commands.run(scheduler.PRIORITY_POLL, panel.send, "poll")
+        panel.answer("arm")
+        await settle()
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiting_command_leaves_the_queue():
+    async def run():
+        commands = scheduler.CommandScheduler(stats.HubStats(), max_in_flight=1)
+        panel = Panel()
+        arm = asyncio.create_task(commands.run(scheduler.PRIORITY_COMMAND, panel.send, "arm"))
+        await settle()
+        bypass = asyncio.create_task(
+            commands.run(scheduler.PRIORITY_COMMAND, panel.send, "bypass"))
+        await settle()
+        bypass.cancel()
+        await settle()
+        assert commands.depth == 0
+        panel.answer("arm")
+        await arm
+        assert panel.sent == ["arm"]
+        assert commands.in_flight == 0
+
+    asyncio.run(run())
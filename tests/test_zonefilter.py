@@ -0,0 +1,90 @@
+"""Tests for debounce and flap suppression in ``zonefilter.py``.
+
+``zonefilter.py`` has no Home Assistant dependency, so these run without
+Home Assistant installed.
+"""
+from conftest import load_integration_module
+
+zonefilter = load_integration_module("zonefilter")
+
+ZONES = 4
+
+
+def make_filter(debounce=(), frames=(), flap=()):
+    """Return a filter of ZONES zones, the given settings zone by zone."""
+    def pad(values):
+        return list(values) + [0] * (ZONES - len(values))
+
+    zone_filter = zonefilter.ZoneFilter()
+    zone_filter.configure(pad(debounce), pad(frames), pad(flap))
+    zone_filter.update(0, 0.0)
+    return zone_filter
+
+
+def test_zones_without_settings_pass_through():
+    zone_filter = make_filter(debounce=(0, 500))
+    zone_filter.update(0b1101, 1.0)
+    assert zone_filter.reported == 0b1101
+    assert zone_filter.next_deadline() is None
+
+
+def test_unknown_state_is_not_debounced():
+    zone_filter = make_filter(debounce=(500,))
+    zone_filter.update(None, 1.0)
+    assert zone_filter.reported is None
+    zone_filter.update(0b1, 2.0)
+    assert zone_filter.reported == 0b1
+
+
+def test_debounced_change_is_held_until_stable():
+    zone_filter = make_filter(debounce=(500,))
+    zone_filter.update(0b1, 1.0)
+    assert zone_filter.reported == 0
+    assert zone_filter.next_deadline() == 1.5
+    zone_filter.expire(1.4)
+    assert zone_filter.reported == 0
+    zone_filter.expire(1.5)
+    assert zone_filter.reported == 0b1
+    assert zone_filter.next_deadline() is None
+
+
+def test_change_that_reverts_while_held_is_never_reported():
+    zone_filter = make_filter(debounce=(500,))
+    zone_filter.update(0b1, 1.0)
+    zone_filter.update(0, 1.2)
+    zone_filter.expire(2.0)
+    assert zone_filter.reported == 0
+    assert zone_filter.next_deadline() is None
+
+
+def test_frame_count_is_required():
+    zone_filter = make_filter(frames=(0, 3))
+    for count in range(3):
+        assert zone_filter.reported == 0
+        zone_filter.update(0b10, 1.0 + count)
+    assert zone_filter.reported == 0b10
+
+
+def test_flapping_zone_is_frozen_until_its_toggles_age_out():
+    zone_filter = make_filter(flap=(4,))
+    for count in range(3):
+        zone_filter.update((count + 1) % 2, 1.0 + count)
+    assert zone_filter.reported == 0b1 and not zone_filter.flapping
+    zone_filter.update(0, 4.0)
+    assert zone_filter.flapping == 0b1
+    # Frozen at the state reported before the fourth toggle.
+    zone_filter.update(0b1, 5.0)
+    zone_filter.update(0, 6.0)
+    assert zone_filter.reported == 0b1
+    deadline = zone_filter.next_deadline()
+    assert deadline > 6.0
+    zone_filter.expire(deadline)
+    assert not zone_filter.flapping
+    assert zone_filter.reported == 0
+
+
+def test_configure_releases_held_changes():
+    zone_filter = make_filter(debounce=(500,))
+    zone_filter.update(0b1, 1.0)
+    zone_filter.configure([0] * ZONES, [0] * ZONES, [0] * ZONES)
+    assert zone_filter.reported == 0b1
@@ -0,0 +1,73 @@
+"""Tests for bypass zone resolution in ``zones.py``.
+
+``zones.py`` has no Home Assistant dependency, so these run without
+Home Assistant installed.
+"""
+import pytest
+
+from conftest import load_integration_module
+
+zones = load_integration_module("zones")
+
+NAMES = {"front door": 0, "garage": 11}
+PRESETS = zones.parse_bypass_presets("away: 1-4, 7; Night: 9")
+
+
+def resolve(*entries, max_zones=zones.MAX_ZONES):
+    return zones.resolve_zones(entries, NAMES, PRESETS, max_zones)
+
+
+def test_int_is_index_and_string_is_number():
+    for index in (0, 5, 47, 63):
+        assert resolve(index) == resolve(str(index + 1)) == 1 << index
+
+
+def test_ints_are_0_based_like_the_attribute():
+    # [5] in an existing automation is still zone 6.
+    assert resolve(5) == 1 << 5
+    assert resolve(0, 1, 9) == 0b10_0000_0011
+
+
+def test_attribute_list_round_trips():
+    bypassed = [0, 3, 11]
+    assert resolve(*bypassed) == sum(1 << i for i in bypassed)
+
+
+@pytest.mark.parametrize("entry", [-1, 64])
+def test_int_out_of_range(entry):
+    with pytest.raises(ValueError, match="out of range"):
+        resolve(entry)
+
+
+def test_int_limited_to_panel_zones():
+    assert resolve(47, max_zones=48) == 1 << 47
+    with pytest.raises(ValueError):
+        resolve(48, max_zones=48)
+
+
+@pytest.mark.parametrize("entry", ["0", "65", "3-70"])
+def test_string_out_of_range(entry):
+    with pytest.raises(ValueError):
+        resolve(entry)
+
+
+def test_ranges_names_and_presets():
+    assert resolve("9-12") == 0b1111 << 8
+    assert resolve("Front Door, garage") == 1 | 1 << 11
+    assert resolve("AWAY") == 0b100_1111
+    assert resolve("night", 0, "12") == 1 << 8 | 1 | 1 << 11
+
+
+def test_empty_request_clears():
+    assert resolve() == 0
+    assert resolve("", " , ") == 0
+
+
+def test_unknown_entries_are_listed():
+    with pytest.raises(ValueError, match="cellar, attic"):
+        resolve("cellar", 1, "attic")
+
+
+def test_bool_is_not_a_zone():
+    with pytest.raises(ValueError, match="unknown"):
+        resolve(True)